@@ -1,16 +1,20 @@
 """
 운동복/수건 대여 시스템 - Flask 애플리케이션
 """
+import logging
 import os
-import queue
+import threading
 from flask import Flask, jsonify
 from flask_socketio import SocketIO
+from app.services.nfc_events import NFCEventBus
+
+logger = logging.getLogger(__name__)
 
 # SocketIO 인스턴스 (전역)
 socketio = SocketIO()
 
-# NFC 이벤트 큐 (전역)
-nfc_queue = queue.Queue(maxsize=10)
+# NFC 이벤트 (Socket.IO 푸시 + 롱폴링, 전역)
+nfc_events = NFCEventBus(socketio)
 
 # 전역 서비스 인스턴스
 mqtt_service = None
@@ -20,11 +24,62 @@ sync_scheduler = None
 event_logger = None
 nfc_reader = None
 locker_api_client = None
+device_state = None
+startup = None
+
+# 종료 훅 (시작 순서대로 등록, 종료 시 역순 실행)
+_shutdown_hooks = []
+_shutdown_lock = threading.Lock()
+_shutting_down = False
+
+
+def on_shutdown(name, func):
+    """
+    서비스 종료 함수 등록
+    
+    나중에 시작한 서비스가 먼저 멈추도록 shutdown_services()에서 역순으로 호출
+    (NFC/MQTT 입력 중지 → 스케줄러 중지 → 이벤트 기록 → DB 닫기)
+    
+    종료가 이미 시작된 뒤 등록되면 (백그라운드 시작 작업이 늦게 끝난 경우) 바로 실행
+    """
+    with _shutdown_lock:
+        if not _shutting_down:
+            _shutdown_hooks.append((name, func))
+            return
+    
+    _run_shutdown_hook(name, func)
+
+
+def shutdown_services():
+    """등록된 서비스 종료 (역순, 여러 번 호출해도 한 번만 실행)"""
+    global _shutting_down
+    
+    with _shutdown_lock:
+        _shutting_down = True
+        hooks = list(reversed(_shutdown_hooks))
+        _shutdown_hooks.clear()
+    
+    for name, func in hooks:
+        _run_shutdown_hook(name, func)
+
+
+def _run_shutdown_hook(name, func):
+    """종료 함수 하나 실행 (실패해도 나머지는 계속)"""
+    try:
+        func()
+        logger.info(f"[App] 종료: {name}")
+    except Exception as e:
+        logger.warning(f"[App] 종료 실패 ({name}): {e}")
 
 
 def create_app(config_name='default'):
     """Flask 애플리케이션 팩토리"""
-    global mqtt_service, local_cache, sheets_sync, sync_scheduler, event_logger, nfc_reader, locker_api_client
+    global mqtt_service, local_cache, event_logger, device_state
+    global startup
+    
+    # 로깅 (LOG_LEVEL=DEBUG로 메시지별 로그 확인)
+    from app.services.logging_service import setup_logging
+    setup_logging()
     
     app = Flask(__name__)
     
@@ -48,29 +103,66 @@ def create_app(config_name='default'):
     # SocketIO 초기화 (threading 모드 - paho-mqtt와 호환)
     socketio.init_app(app, cors_allowed_origins="*", async_mode='threading')
     
-    # NFC 큐를 app에 등록
-    app.nfc_queue = nfc_queue
+    # NFC 이벤트 전달을 app에 등록
+    app.nfc_events = nfc_events
     
-    # LocalCache 초기화
+    # 요청 지표 (라우트별 응답 시간/상태 코드 → GET /metrics)
+    from app.services.metrics import RequestMetrics
+    RequestMetrics().init_app(app)
+    
+    # 서브시스템 시작 상태 (GET /api/health)
+    from app.services.startup import StartupOrchestrator, READY, FAILED
+    startup = StartupOrchestrator()
+    app.startup = startup
+    
+    # LocalCache 초기화 (디스크만 사용 - 화면 제공에 필요하므로 먼저 동기 처리)
     try:
         from app.services.local_cache import LocalCache
         local_cache = LocalCache()
         app.local_cache = local_cache
-        print("[App] LocalCache 초기화 완료")
+        on_shutdown('LocalCache', local_cache.close)
+        startup.mark('local_cache', READY)
+        logger.info("[App] LocalCache 초기화 완료")
+        
+        # LocalCache.lock 호출 위치별 점유/대기 시간 (LOCK_PROFILE=1 또는 POST /metrics/locks로 켜기)
+        from app.services.lock_profiler import LockProfiler
+        lock_profiler = LockProfiler(local_cache.lock,
+                                     interval=float(os.getenv('LOCK_PROFILE_INTERVAL', '60')),
+                                     top_n=int(os.getenv('LOCK_PROFILE_TOP', '10')))
+        app.lock_profiler = lock_profiler
+        if os.getenv('LOCK_PROFILE') == '1':
+            lock_profiler.enable()
+        on_shutdown('락 프로파일러', lock_profiler.disable)
     except Exception as e:
-        print(f"[App] LocalCache 초기화 실패: {e}")
+        startup.mark('local_cache', FAILED, str(e))
+        logger.warning(f"[App] LocalCache 초기화 실패: {e}")
     
     # EventLogger 초기화
     try:
         from app.services.event_logger import EventLogger
         if local_cache:
-            event_logger = EventLogger(local_cache)
+            event_logger = EventLogger(local_cache,
+                                       buffer_size=int(os.getenv('EVENT_LOG_BUFFER_SIZE', '1000')),
+                                       overflow=os.getenv('EVENT_LOG_OVERFLOW', EventLogger.OVERFLOW_DROP))
             app.event_logger = event_logger
-            print("[App] EventLogger 초기화 완료")
+            on_shutdown('EventLogger', event_logger.close)
+            logger.info("[App] EventLogger 초기화 완료")
+    except Exception as e:
+        logger.warning(f"[App] EventLogger 초기화 실패: {e}")
+    
+    # 기기 상태 실시간 푸시 (Socket.IO 'inventory_delta')
+    try:
+        from app.services.device_state import DeviceStatePublisher
+        if local_cache:
+            device_state = DeviceStatePublisher(local_cache, socketio)
+            device_state.start()
+            app.device_state = device_state
+            on_shutdown('기기 상태 푸시', device_state.stop)
     except Exception as e:
-        print(f"[App] EventLogger 초기화 실패: {e}")
+        logger.warning(f"[App] 기기 상태 푸시 초기화 실패: {e}")
     
-    # MQTT 서비스 초기화 (백그라운드)
+    # MQTT 서비스 생성 + 핸들러 등록 (연결은 백그라운드)
+    # 핸들러를 연결 전에 등록해 시작 직후 수신 메시지도 처리, Sheets는 준비된 뒤부터 사용
     try:
         from app.services.mqtt_service import MQTTService, register_default_handlers
         mqtt_service = MQTTService(
@@ -81,198 +173,198 @@ def create_app(config_name='default'):
         # LocalCache 연결
         if local_cache:
             mqtt_service.set_local_cache(local_cache)
+            register_default_handlers(mqtt_service, local_cache, get_sheets_sync, event_logger, device_state)
+            logger.info("[App] MQTT 핸들러 등록 완료 (EventLogger 연동, Sheets는 연결 후)")
         
-        # 핸들러는 Sheets 초기화 후 한 번만 등록 (아래에서 처리)
+        app.mqtt_service = mqtt_service
+        on_shutdown('MQTT', mqtt_service.disconnect)
         
-        # MQTT 연결 (실패해도 앱은 계속 실행)
-        if mqtt_service.connect():
-            print("[App] MQTT 연결 성공")
-        else:
-            print("[App] MQTT 연결 실패 - 나중에 재시도")
+        def start_mqtt():
+            """MQTT 연결 (실패해도 앱은 계속 실행)"""
+            if mqtt_service.connect():
+                logger.info("[App] MQTT 연결 성공")
+                return True
+            logger.warning("[App] MQTT 연결 실패 - 나중에 재시도")
+            return False
         
-        app.mqtt_service = mqtt_service
+        startup.add('mqtt', start_mqtt)
         
     except Exception as e:
-        print(f"[App] MQTT 초기화 실패: {e}")
+        logger.warning(f"[App] MQTT 초기화 실패: {e}")
     
-    # Google Sheets 동기화 초기화
-    try:
+    # Google Sheets 동기화 (백그라운드)
+    def start_sheets():
+        """Sheets 연결 → config/members 다운로드 → 동기화 스케줄러 시작"""
+        global sheets_sync, sync_scheduler
         from app.services.sheets_sync import SheetsSync
         from app.services.sync_scheduler import SyncScheduler
         
-        # credentials 경로 (라즈베리파이 또는 로컬)
-        creds_path = os.path.join(os.path.dirname(app.root_path), 'config', 'credentials.json')
+        # credentials 경로 (라즈베리파이 또는 로컬, SHEETS_CREDENTIALS=fake://... 로 가짜 백엔드 사용)
+        from app.services.sheets_backend import is_fake_url
+        creds_path = os.getenv(
+            'SHEETS_CREDENTIALS',
+            os.path.join(os.path.dirname(app.root_path), 'config', 'credentials.json')
+        )
         
-        if os.path.exists(creds_path) and local_cache:
-            sheets_sync = SheetsSync(credentials_path=creds_path)
-            
-            if sheets_sync.connect():
-                print("[App] Google Sheets 연결 성공")
-                
-                # config 다운로드
-                config = sheets_sync.download_config()
-                app.sheets_config = config
-                
-                # 시작 시 members 다운로드
-                sheets_sync.download_members(local_cache)
-                
-                # 동기화 스케줄러 시작 (config에서 주기 읽기)
-                sync_scheduler = SyncScheduler(
-                    sheets_sync, 
-                    local_cache,
-                    event_interval=config.get('sync_interval_upload', 300),
-                    device_interval=config.get('sync_interval_device', 60),
-                    member_interval=config.get('sync_interval_members', 300)
-                )
-                sync_scheduler.start()
-                
-                app.sheets_sync = sheets_sync
-                app.sync_scheduler = sync_scheduler
-                
-                # MQTT 핸들러 등록 (sheets_sync + event_logger 포함)
-                if mqtt_service:
-                    from app.services.mqtt_service import register_default_handlers
-                    register_default_handlers(mqtt_service, local_cache, sheets_sync, event_logger)
-                    print("[App] MQTT 핸들러 등록 완료 (Sheets + EventLogger 연동)")
-            else:
-                print("[App] Google Sheets 연결 실패")
-                # Sheets 없이 핸들러만 등록
-                if mqtt_service and local_cache:
-                    from app.services.mqtt_service import register_default_handlers
-                    register_default_handlers(mqtt_service, local_cache, None, event_logger)
-                    print("[App] MQTT 핸들러 등록 완료 (Sheets 없음, EventLogger 있음)")
-        else:
-            print(f"[App] Google Sheets 건너뜀 (credentials 없음: {creds_path})")
-            # Sheets 없이 핸들러만 등록
-            if mqtt_service and local_cache:
-                from app.services.mqtt_service import register_default_handlers
-                register_default_handlers(mqtt_service, local_cache, None, event_logger)
-                print("[App] MQTT 핸들러 등록 완료 (Sheets 없음, EventLogger 있음)")
-            
-    except Exception as e:
-        print(f"[App] Google Sheets 초기화 실패: {e}")
-        import traceback
-        traceback.print_exc()
+        if not (is_fake_url(creds_path) or os.path.exists(creds_path)) or not local_cache:
+            logger.warning(f"[App] Google Sheets 건너뜀 (credentials 없음: {creds_path})")
+            return False
+        
+        sync = SheetsSync(credentials_path=creds_path)
+        if not sync.connect():
+            logger.warning("[App] Google Sheets 연결 실패")
+            return False
+        logger.info("[App] Google Sheets 연결 성공")
+        
+        # config 다운로드
+        config = sync.download_config()
+        app.sheets_config = config
+        sync.device_volatile_interval = config.get('sync_interval_device_volatile', 300)
+        
+        # 시작 시 members 다운로드
+        sync.download_members(local_cache)
+        
+        # 동기화 스케줄러 시작 (config에서 주기 읽기)
+        scheduler = SyncScheduler(
+            sync, 
+            local_cache,
+            event_interval=config.get('sync_interval_upload', 300),
+            device_interval=config.get('sync_interval_device', 60),
+            member_interval=config.get('sync_interval_members', 300)
+        )
+        scheduler.start()
+        on_shutdown('동기화 스케줄러', scheduler.stop)
+        
+        sheets_sync, sync_scheduler = sync, scheduler
+        app.sheets_sync = sync
+        app.sync_scheduler = scheduler
+        return True
     
-    # NFC 리더 및 락카키 대여기 API 클라이언트 초기화
-    try:
-        from app.services.nfc_reader import NFCReaderService
+    startup.add('sheets', start_sheets)
+    
+    # 락카키 대여기 API 클라이언트 (백그라운드)
+    def start_locker_api():
+        """캐시된 주소로 클라이언트 생성 + 헬스 체크 (시트 주소 조회는 백그라운드에서 주기적으로)"""
+        global locker_api_client
         from app.services.locker_api_client import LockerAPIClient
         from app.services.integration_sync import IntegrationSync
         
-        # 락카키 대여기 API 주소 가져오기 (IntegrationSync 사용)
+        # 락카키 대여기 API 주소: 마지막으로 받은 캐시로 바로 시작 (구글 인증/시트 조회를 기다리지 않음)
+        integration_sync = IntegrationSync()
         try:
-            print("[App] 락카키 대여기 IP 다운로드 시도 (System_Integration 시트)...")
-            integration_sync = IntegrationSync()
-            locker_api_info = integration_sync.download_locker_api_info()
+            locker_api_info = integration_sync.get_cached_locker_api_info()
             locker_api_url = locker_api_info['url']
-            print(f"[App] ✓ 락카키 대여기 IP 다운로드 성공: {locker_api_url}")
-            print(f"     - 마지막 업데이트: {locker_api_info.get('last_updated', 'N/A')}")
-            print(f"     - 상태: {locker_api_info.get('status', 'unknown')}")
+            logger.info(f"[App] 락카키 대여기 주소 (캐시): {locker_api_url} "
+                        f"(마지막 업데이트: {locker_api_info.get('last_updated', 'N/A')}, "
+                        f"상태: {locker_api_info.get('status', 'unknown')})")
         except Exception as e:
             # 실패 시 환경변수 또는 기본값 사용
             locker_api_url = os.getenv('LOCKER_API_URL', 'http://192.168.0.23:5000')
-            print(f"[App] ⚠️ 락카키 대여기 IP 다운로드 실패: {e}")
-            print(f"[App] 기본값 사용: {locker_api_url}")
-            import traceback
-            traceback.print_exc()
+            logger.warning(f"[App] ⚠️ 락카키 대여기 주소 캐시 읽기 실패: {e}")
+            logger.warning(f"[App] 기본값 사용: {locker_api_url}")
         
-        # 락카키 대여기 API 클라이언트
-        locker_api_client = LockerAPIClient(base_url=locker_api_url)
-        app.locker_api_client = locker_api_client
+        client = LockerAPIClient(base_url=locker_api_url)
+        locker_api_client = client
+        app.locker_api_client = client
+        on_shutdown('락카키 대여기 API', client.close)
+        
+        # 시트에서 주소 갱신 (바뀌면 실행 중인 클라이언트에 바로 적용)
+        integration_sync.start_auto_refresh(
+            lambda info: client.set_base_url(info['url']),
+            interval=float(os.getenv('LOCKER_API_REFRESH_SECONDS', '300'))
+        )
+        app.integration_sync = integration_sync
+        on_shutdown('락카키 대여기 주소 갱신', integration_sync.stop_auto_refresh)
+        
+        # 락카 배정 복제 (NFC 로그인은 복제본에서 먼저 조회, 없을 때만 HTTP)
+        if local_cache:
+            from app.services.locker_replication import LockerReplicator
+            client.set_local_lookup(local_cache.get_replicated_member)
+            replicator = LockerReplicator(client, local_cache)
+            replicator.start()
+            app.locker_replicator = replicator
+            on_shutdown('락카 배정 복제', replicator.stop)
         
         # 헬스 체크
-        if locker_api_client.health_check():
-            print(f"[App] 락카키 대여기 API 연결 성공: {locker_api_url}")
-        else:
-            print(f"[App] 락카키 대여기 API 연결 실패: {locker_api_url}")
+        if client.health_check():
+            logger.info(f"[App] 락카키 대여기 API 연결 성공: {locker_api_url}")
+            return True
+        logger.warning(f"[App] 락카키 대여기 API 연결 실패: {locker_api_url}")
+        return False
+    
+    startup.add('locker_api', start_locker_api)
+    
+    # NFC 리더 (백그라운드, 시리얼 포트 열기)
+    def handle_nfc_tag(nfc_uid: str):
+        """NFC 태그 감지 시 실행 - 락카키 대여기 API 호출 후 키오스크에 푸시"""
+        logger.debug("[App] NFC 태그 감지: %s", nfc_uid)
         
-        # NFC 리더 초기화
-        nfc_port = os.getenv('NFC_PORT', '/dev/ttyUSB0')
-        nfc_reader = NFCReaderService(port=nfc_port)
-        app.nfc_reader = nfc_reader
+        if locker_api_client is None:
+            nfc_events.publish_error(nfc_uid, '락카키 대여기 연결 준비 중입니다')
+            logger.warning(f"[App] ✗ 락카키 대여기 API 준비 전 태그: NFC {nfc_uid}")
+            return
         
-        # NFC 태그 감지 시 처리 함수
-        def handle_nfc_tag(nfc_uid: str):
-            """NFC 태그 감지 시 실행 - 락카키 대여기 API 호출 후 큐에 저장"""
-            print(f"[App] NFC 태그 감지: {nfc_uid}")
+        # 락카키 대여기 API 호출하여 member_id 가져오기
+        member = locker_api_client.get_member_by_nfc(nfc_uid)
+        
+        if member and member.get('member_id'):
+            member_id = member['member_id']
+            name = member.get('name', '')
+            locker_number = member.get('locker_number', '')
             
-            # 락카키 대여기 API 호출하여 member_id 가져오기
-            member = locker_api_client.get_member_by_nfc(nfc_uid)
+            logger.info(f"[App] ✓ 회원 조회 성공: {name} ({member_id}), 락카: {locker_number}")
             
-            if member and member.get('member_id'):
-                member_id = member['member_id']
-                name = member.get('name', '')
-                locker_number = member.get('locker_number', '')
-                
-                print(f"[App] ✓ 회원 조회 성공: {name} ({member_id}), 락카: {locker_number}")
-                
-                # NFC 이벤트를 큐에 저장 (폴링 방식)
-                try:
-                    nfc_queue.put_nowait({
-                        'nfc_uid': nfc_uid,
-                        'member_id': member_id,
-                        'name': name,
-                        'locker_number': locker_number,
-                        'success': True
-                    })
-                    print(f"[App] NFC 이벤트 큐에 추가: {member_id}")
-                except queue.Full:
-                    # 큐가 꽉 찼으면 기존 데이터 제거 후 재시도
-                    try:
-                        nfc_queue.get_nowait()
-                        nfc_queue.put_nowait({
-                            'nfc_uid': nfc_uid,
-                            'member_id': member_id,
-                            'name': name,
-                            'locker_number': locker_number,
-                            'success': True
-                        })
-                        print(f"[App] NFC 이벤트 큐에 추가 (기존 데이터 덮어씀): {member_id}")
-                    except:
-                        print(f"[App] ✗ NFC 이벤트 큐 추가 실패")
-            else:
-                # 오류 이벤트를 큐에 저장
-                try:
-                    nfc_queue.put_nowait({
-                        'nfc_uid': nfc_uid,
-                        'success': False,
-                        'message': '락카가 배정되어 있지 않습니다'
-                    })
-                    print(f"[App] NFC 오류 이벤트 큐에 추가: {nfc_uid}")
-                except queue.Full:
-                    try:
-                        nfc_queue.get_nowait()
-                        nfc_queue.put_nowait({
-                            'nfc_uid': nfc_uid,
-                            'success': False,
-                            'message': '락카가 배정되어 있지 않습니다'
-                        })
-                    except:
-                        print(f"[App] ✗ NFC 오류 이벤트 큐 추가 실패")
-                print(f"[App] ✗ 회원 정보 없음: NFC {nfc_uid}")
-        
-        # 콜백 등록
-        nfc_reader.set_callback(handle_nfc_tag)
+            # 키오스크로 즉시 전달 (Socket.IO + 대기 중인 롱폴링)
+            nfc_events.publish_member(nfc_uid, member)
+        elif locker_api_client.breaker.is_open:
+            # 대여기 다운 + 캐시/복제본에도 없음 → 미배정으로 오해하지 않도록 안내
+            nfc_events.publish_error(nfc_uid, '락카키 대여기 연결 끊김 - 전화번호로 로그인해 주세요')
+            logger.warning(f"[App] ✗ 락카키 대여기 차단 중, 캐시에 없는 태그: NFC {nfc_uid}")
+        else:
+            nfc_events.publish_error(nfc_uid, '락카가 배정되어 있지 않습니다')
+            logger.warning(f"[App] ✗ 회원 정보 없음: NFC {nfc_uid}")
+    
+    def start_nfc():
+        """NFC 리더 시리얼 연결 + 수신 스레드 시작"""
+        global nfc_reader
+        try:
+            from app.services.nfc_reader import NFCReaderService
+        except ImportError as e:
+            logger.warning(f"[App] NFC 리더 모듈 임포트 실패: {e}")
+            logger.warning("[App] pyserial 설치 필요: pip install pyserial")
+            raise
         
-        # NFC 리더 시작
-        nfc_reader.start()
+        nfc_port = os.getenv('NFC_PORT', '/dev/ttyUSB0')
+        reader = NFCReaderService(port=nfc_port,
+                                  debounce_seconds=float(os.getenv('NFC_DEBOUNCE_SECONDS', '1.5')))
+        nfc_reader = reader
+        app.nfc_reader = reader
         
-        print("[App] NFC 리더 서비스 시작")
+        # 콜백 등록 후 시작
+        reader.set_callback(handle_nfc_tag)
+        reader.start()
+        on_shutdown('NFC 리더', reader.stop)
         
-    except ImportError as e:
-        print(f"[App] NFC 리더 모듈 임포트 실패: {e}")
-        print("[App] pyserial 설치 필요: pip install pyserial")
-    except Exception as e:
-        print(f"[App] NFC 리더 초기화 실패: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.info("[App] NFC 리더 서비스 시작")
+        # 포트가 없어도 수신 스레드는 재연결을 계속 시도 (시작 상태는 부팅 시 연결 여부로 보고)
+        return bool(reader.serial_conn and reader.serial_conn.is_open)
+    
+    startup.add('nfc', start_nfc)
+    
+    # 외부 연결은 기다리지 않고 앱 반환 (화면은 LocalCache로 바로 제공)
+    startup.start()
     
     # 블루프린트 등록
-    from app.routes import main_bp, api_locker_bp, api_device_bp
+    from app.routes import main_bp, api_locker_bp, api_device_bp, api_sync_bp, api_stats_bp, metrics_bp
     app.register_blueprint(main_bp)
     app.register_blueprint(api_locker_bp)
+    if local_cache:
+        from app.routes.api_locker import init_api_locker
+        init_api_locker(local_cache)
     app.register_blueprint(api_device_bp)
+    app.register_blueprint(api_sync_bp)
+    app.register_blueprint(api_stats_bp)
+    app.register_blueprint(metrics_bp)
     
     # 에러 핸들러 (JSON 응답)
     @app.errorhandler(404)
@@ -316,6 +408,21 @@ def get_nfc_reader():
     return nfc_reader
 
 
+def get_nfc_events():
+    """NFC 이벤트 전달 인스턴스 반환"""
+    return nfc_events
+
+
+def get_device_state():
+    """기기 상태 푸시 인스턴스 반환"""
+    return device_state
+
+
+def get_startup():
+    """서브시스템 시작 상태 인스턴스 반환"""
+    return startup
+
+
 def get_locker_api_client():
     """락카키 대여기 API 클라이언트 반환"""
     return locker_api_client
@@ -5,6 +5,9 @@
 from .main import main_bp
 from .api_locker import api_locker_bp
 from .api_device import api_device_bp
+from .api_sync import api_sync_bp
+from .api_stats import api_stats_bp
+from .metrics import metrics_bp
 
-__all__ = ['main_bp', 'api_locker_bp', 'api_device_bp']
+__all__ = ['main_bp', 'api_locker_bp', 'api_device_bp', 'api_sync_bp', 'api_stats_bp', 'metrics_bp']
 
@@ -85,28 +85,57 @@ def get_device(device_id: str):
 @api_device_bp.route('/<device_id>/events', methods=['GET'])
 def get_device_events(device_id: str):
     """
-    기기 이벤트 이력 조회
+    기기 이벤트 이력 조회 (최신순, 커서 기반 페이지)
     
     Query Parameters:
-        limit: 조회 개수 (기본 50)
+        source: mqtt (Raw MQTT, 기본) | business (비즈니스 이벤트)
+        start: 시작 시각 (포함, 예: 2025-01-01 또는 2025-01-01T09:00)
+        end: 종료 시각 (미포함)
+        type: 이벤트 타입 필터
+        severity: 심각도 필터 (business만)
+        limit: 페이지 크기 (기본 50, 최대 200)
+        cursor: 이전 응답의 next_cursor
+        payload: 0이면 payload/details 제외 (목록만 빠르게)
     
     Response:
         200 OK
         {
           "status": "ok",
-          "events": [...]
+          "events": [...],
+          "next_cursor": "WyIyMDI1LTAxLTAx...",   (마지막 페이지면 null)
+          "has_more": true
         }
     """
     cache = get_local_cache()
     if not cache:
         return jsonify({'status': 'error', 'message': 'LocalCache not available'}), 503
     
-    limit = request.args.get('limit', 50, type=int)
-    events = cache.get_recent_events(device_id, limit)
+    include_payload = request.args.get('payload', '1') not in ('0', 'false')
+    
+    try:
+        page = cache.query_events(
+            source=request.args.get('source', 'mqtt'),
+            device_id=device_id,
+            event_type=request.args.get('type'),
+            severity=request.args.get('severity'),
+            start=request.args.get('start'),
+            end=request.args.get('end'),
+            cursor=request.args.get('cursor'),
+            limit=request.args.get('limit', 50, type=int),
+            include_payload=include_payload
+        )
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+    
+    events = page['events']
+    if include_payload:
+        events = [cache.decode_event_payload(event) for event in events]
     
     return jsonify({
         'status': 'ok',
-        'events': events
+        'events': events,
+        'next_cursor': page['next_cursor'],
+        'has_more': page['next_cursor'] is not None
     }), 200
 
 
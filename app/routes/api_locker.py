@@ -6,9 +6,14 @@
 - 락카 배정/해제 내부 처리
 """
 
-from flask import Blueprint, request, jsonify
+import logging
+from flask import Blueprint, current_app, request, jsonify
 from datetime import datetime
 
+from app.services.catalog_cache import catalog_cache
+
+logger = logging.getLogger(__name__)
+
 # Blueprint 생성
 api_locker_bp = Blueprint('api_locker', __name__, url_prefix='/api')
 
@@ -91,7 +96,7 @@ def get_member_by_locker(locker_number):
         }), 200
         
     except Exception as e:
-        print(f"[API] 회원 조회 오류: {e}")
+        logger.error(f"[API] 회원 조회 오류: {e}")
         return jsonify({
             'status': 'error',
             'message': '서버 오류'
@@ -113,7 +118,8 @@ def assign_locker():
         POST /api/locker/assign
         {
           "locker": 105,
-          "member": "A001"
+          "member": "A001",
+          "nfc_uid": "5A41B914524189"   # 선택 - 운동복 대여기 NFC 로그인 복제용
         }
     
     Response:
@@ -136,6 +142,7 @@ def assign_locker():
         
         locker_number = int(data['locker'])
         member_id = str(data['member'])
+        nfc_uid = str(data.get('nfc_uid') or '').strip() or None
         
         # 회원 존재 확인
         member = _local_cache.get_member(member_id)
@@ -146,7 +153,7 @@ def assign_locker():
             }), 404
         
         # 락카 배정
-        _local_cache.assign_locker(locker_number, member_id)
+        _local_cache.assign_locker(locker_number, member_id, nfc_uid)
         
         return jsonify({
             'status': 'ok',
@@ -162,7 +169,7 @@ def assign_locker():
             'message': str(e)
         }), 400
     except Exception as e:
-        print(f"[API] 락카 배정 오류: {e}")
+        logger.error(f"[API] 락카 배정 오류: {e}")
         return jsonify({
             'status': 'error',
             'message': '서버 오류'
@@ -215,7 +222,7 @@ def release_locker():
             }), 404
             
     except Exception as e:
-        print(f"[API] 락카 해제 오류: {e}")
+        logger.error(f"[API] 락카 해제 오류: {e}")
         return jsonify({
             'status': 'error',
             'message': '서버 오류'
@@ -225,7 +232,7 @@ def release_locker():
 @api_locker_bp.route('/locker/list', methods=['GET'])
 def list_lockers():
     """
-    현재 배정된 락카 목록 조회 API
+    현재 배정된 락카 목록 조회 API (카탈로그 버전 기준 캐시 + ETag)
     
     Request:
         GET /api/locker/list
@@ -243,31 +250,75 @@ def list_lockers():
         }
     """
     try:
-        lockers = _local_cache.get_all_lockers()
-        
-        result = []
-        for locker_number, member_id in lockers.items():
-            member = _local_cache.get_member(member_id)
-            result.append({
-                'locker': locker_number,
-                'member_id': member_id,
-                'name': member.get('name', '') if member else ''
-            })
+        return catalog_cache.response('lockers', _local_cache.catalog_version, _build_locker_list)
         
+    except Exception as e:
+        logger.error(f"[API] 락카 목록 조회 오류: {e}")
         return jsonify({
-            'status': 'ok',
-            'count': len(result),
-            'lockers': sorted(result, key=lambda x: x['locker'])
-        }), 200
+            'status': 'error',
+            'message': '서버 오류'
+        }), 500
+
+
+@api_locker_bp.route('/locker/changes', methods=['GET'])
+def locker_changes():
+    """
+    락카 배정 변경분 조회 API (운동복 대여기 복제용)
+    
+    *** 운동복 대여기가 주기적으로 호출해 NFC UID → 회원 복제본 갱신 ***
+    
+    Request:
+        GET /api/locker/changes?since=120&limit=500
+    
+    Response:
+        200 OK
+        {
+          "status": "ok",
+          "changes": [
+            {"seq": 121, "action": "assign", "locker_number": 105, "member_id": "A001",
+             "nfc_uid": "5A41B914524189", "name": "홍길동", "changed_at": "..."},
+            {"seq": 122, "action": "release", "locker_number": 106, ...}
+          ],
+          "last_seq": 122,
+          "has_more": false,
+          "reset": false        # true면 현재 배정 전체 - 복제본을 비우고 적용
+        }
+    """
+    try:
+        since = request.args.get('since', 0, type=int)
+        limit = request.args.get('limit', 500, type=int)
+        
+        result = _local_cache.get_locker_changes(since, limit)
+        return jsonify({'status': 'ok', **result}), 200
         
     except Exception as e:
-        print(f"[API] 락카 목록 조회 오류: {e}")
+        logger.error(f"[API] 락카 변경분 조회 오류: {e}")
         return jsonify({
             'status': 'error',
             'message': '서버 오류'
         }), 500
 
 
+def _build_locker_list():
+    """/api/locker/list 응답 생성"""
+    lockers = _local_cache.get_all_lockers()
+    
+    result = []
+    for locker_number, member_id in lockers.items():
+        member = _local_cache.get_member(member_id)
+        result.append({
+            'locker': locker_number,
+            'member_id': member_id,
+            'name': member.get('name', '') if member else ''
+        })
+    
+    return {
+        'status': 'ok',
+        'count': len(result),
+        'lockers': sorted(result, key=lambda x: x['locker'])
+    }, None
+
+
 @api_locker_bp.route('/member/<member_id>', methods=['GET'])
 def get_member_info(member_id):
     """
@@ -301,7 +352,7 @@ def get_member_info(member_id):
             }), 404
             
     except Exception as e:
-        print(f"[API] 회원 조회 오류: {e}")
+        logger.error(f"[API] 회원 조회 오류: {e}")
         return jsonify({
             'status': 'error',
             'message': '서버 오류'
@@ -311,7 +362,7 @@ def get_member_info(member_id):
 @api_locker_bp.route('/health', methods=['GET'])
 def health_check():
     """
-    헬스 체크 API
+    헬스 체크 API (서브시스템별 시작 상태 포함)
     
     Request:
         GET /api/health
@@ -321,11 +372,24 @@ def health_check():
         {
           "status": "healthy",
           "service": "locker-api",
-          "timestamp": "2024-12-01T10:00:00"
+          "timestamp": "2024-12-01T10:00:00",
+          "startup": {
+            "status": "starting",   # starting / ready / degraded
+            "uptime_seconds": 1.2,
+            "subsystems": {
+              "local_cache": {"state": "ready", ...},
+              "mqtt": {"state": "ready", "seconds": 0.3, ...},
+              "sheets": {"state": "starting", ...},
+              "locker_api": {"state": "degraded", "detail": "연결 실패", ...},
+              "nfc": {"state": "ready", ...}
+            }
+          }
         }
     """
+    startup = getattr(current_app, 'startup', None)
     return jsonify({
         'status': 'healthy',
         'service': 'locker-api',
-        'timestamp': datetime.now().isoformat()
+        'timestamp': datetime.now().isoformat(),
+        'startup': startup.snapshot() if startup else None
     }), 200
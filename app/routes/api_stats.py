@@ -0,0 +1,109 @@
+"""
+통계 API
+시간별 집계 테이블(rental_hourly, event_hourly) 조회 엔드포인트
+"""
+
+from flask import Blueprint, jsonify, request
+
+api_stats_bp = Blueprint('api_stats', __name__, url_prefix='/api/stats')
+
+
+def get_local_cache():
+    """LocalCache 가져오기"""
+    from app import get_local_cache as _get_cache
+    return _get_cache()
+
+
+# =============================
+# 시간별 집계 조회
+# =============================
+
+@api_stats_bp.route('/rentals', methods=['GET'])
+def rental_stats():
+    """
+    대여 집계 조회
+    
+    Query:
+        start: 시작 시각 (포함, 예: 2025-01-01 또는 2025-01-01T09)
+        end: 종료 시각 (미포함)
+        group_by: hour, day, product_id, device_uuid, payment_type (쉼표 구분, 기본 hour)
+        product_id, device_uuid, payment_type: 필터
+    
+    Response:
+        200 OK
+        {
+          "status": "ok",
+          "group_by": ["hour", "product_id"],
+          "rows": [
+            {"hour": "2025-01-01T09", "product_id": "P-TOP-105",
+             "rentals": 12, "quantity": 14, "amount": 14000},
+            ...
+          ]
+        }
+    """
+    local_cache = get_local_cache()
+    if not local_cache:
+        return jsonify({'status': 'error', 'message': 'LocalCache 미초기화'}), 503
+    
+    group_by = request.args.get('group_by', 'hour')
+    try:
+        rows = local_cache.get_rental_rollup(
+            start=request.args.get('start'),
+            end=request.args.get('end'),
+            group_by=group_by,
+            product_id=request.args.get('product_id'),
+            device_uuid=request.args.get('device_uuid'),
+            payment_type=request.args.get('payment_type')
+        )
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+    
+    return jsonify({
+        'status': 'ok',
+        'group_by': [g.strip() for g in group_by.split(',') if g.strip()],
+        'rows': rows
+    }), 200
+
+
+@api_stats_bp.route('/events', methods=['GET'])
+def event_stats():
+    """
+    이벤트 집계 조회 (예: 오늘 기기별 에러 수)
+    
+    Query:
+        start: 시작 시각 (포함)
+        end: 종료 시각 (미포함)
+        group_by: hour, day, event_type, severity, device_uuid, product_id (쉼표 구분, 기본 hour)
+        event_type, severity, device_uuid, product_id: 필터
+    
+    Response:
+        200 OK
+        {
+          "status": "ok",
+          "group_by": ["device_uuid"],
+          "rows": [{"device_uuid": "FBOX-UPPER-105", "count": 3}, ...]
+        }
+    """
+    local_cache = get_local_cache()
+    if not local_cache:
+        return jsonify({'status': 'error', 'message': 'LocalCache 미초기화'}), 503
+    
+    group_by = request.args.get('group_by', 'hour')
+    try:
+        rows = local_cache.get_event_rollup(
+            start=request.args.get('start'),
+            end=request.args.get('end'),
+            group_by=group_by,
+            event_type=request.args.get('event_type'),
+            severity=request.args.get('severity'),
+            device_uuid=request.args.get('device_uuid'),
+            product_id=request.args.get('product_id')
+        )
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+    
+    return jsonify({
+        'status': 'ok',
+        'group_by': [g.strip() for g in group_by.split(',') if g.strip()],
+        'rows': rows
+    }), 200
@@ -0,0 +1,71 @@
+"""
+동기화 상태 API
+Google Sheets 업로드 지연/백로그 모니터링 엔드포인트
+"""
+
+from flask import Blueprint, jsonify
+
+api_sync_bp = Blueprint('api_sync', __name__, url_prefix='/api/sync')
+
+
+def get_sheets_sync():
+    """SheetsSync 가져오기"""
+    from app import get_sheets_sync as _get_sync
+    return _get_sync()
+
+
+def get_local_cache():
+    """LocalCache 가져오기"""
+    from app import get_local_cache as _get_cache
+    return _get_cache()
+
+
+# =============================
+# 동기화 지표 조회
+# =============================
+
+@api_sync_bp.route('/status', methods=['GET'])
+def sync_status():
+    """
+    테이블별 Sheets 동기화 지표 조회
+    
+    Response:
+        200 OK
+        {
+          "status": "ok",
+          "sheets_connected": true,
+          "max_lag_seconds": 42.0,
+          "unsynced_total": 12,
+          "tables": {
+            "rental_logs": {
+              "unsynced": 3,
+              "oldest_unsynced_at": "2025-01-01T10:00:00+09:00",
+              "oldest_unsynced_age_seconds": 42.0,
+              "last_success_at": "2025-01-01T10:00:30+09:00",
+              "last_cycle": {"rows": 500, "seconds": 1.2, "rows_per_second": 416.7,
+                             "api_calls": 2, "errors": 0, "bytes_sent": 51234},
+              ...
+            }
+          }
+        }
+    """
+    sheets_sync = get_sheets_sync()
+    local_cache = get_local_cache()
+    
+    if sheets_sync:
+        tables = sheets_sync.metrics.snapshot(local_cache)
+    else:
+        # Sheets 미연결이어도 쌓이는 백로그는 보여줌
+        from app.services.sync_metrics import SyncMetrics
+        tables = SyncMetrics().snapshot(local_cache)
+    
+    ages = [t['oldest_unsynced_age_seconds'] for t in tables.values()
+            if t.get('oldest_unsynced_age_seconds') is not None]
+    
+    return jsonify({
+        'status': 'ok',
+        'sheets_connected': bool(sheets_sync and sheets_sync.spreadsheet),
+        'max_lag_seconds': max(ages) if ages else 0,
+        'unsynced_total': sum(t.get('unsynced', 0) for t in tables.values()),
+        'tables': tables
+    }), 200
@@ -1,20 +1,26 @@
 """
 메인 라우트 및 API 엔드포인트 (금액권/구독권 기반)
 """
+import logging
 from flask import Blueprint, render_template, jsonify, request
-from datetime import datetime, timedelta
+from datetime import datetime
+
+from app.services.catalog_cache import catalog_cache
+from app.services.device_state import is_device_online, online_until
+
+logger = logging.getLogger(__name__)
 
 # 옵셔널 임포트
 try:
     from app.services.rental_service import RentalService
 except Exception as e:
-    print(f"[Routes] RentalService 임포트 실패: {e}")
+    logger.warning(f"[Routes] RentalService 임포트 실패: {e}")
     RentalService = None
 
 try:
     from app.services.local_cache import LocalCache
 except Exception as e:
-    print(f"[Routes] LocalCache 임포트 실패: {e}")
+    logger.warning(f"[Routes] LocalCache 임포트 실패: {e}")
     LocalCache = None
 
 main_bp = Blueprint('main', __name__)
@@ -25,13 +31,18 @@ _local_cache = None
 
 
 def get_local_cache():
-    """LocalCache 인스턴스 가져오기"""
+    """LocalCache 인스턴스 가져오기 (앱에서 만든 인스턴스 우선 - 카탈로그 버전 공유)"""
     global _local_cache
-    if _local_cache is None and LocalCache:
-        try:
-            _local_cache = LocalCache()
-        except Exception as e:
-            print(f"[Routes] LocalCache 초기화 실패: {e}")
+    if _local_cache is None:
+        from flask import current_app, has_app_context
+        shared = getattr(current_app, 'local_cache', None) if has_app_context() else None
+        if shared is not None:
+            _local_cache = shared
+        elif LocalCache:
+            try:
+                _local_cache = LocalCache()
+            except Exception as e:
+                logger.warning(f"[Routes] LocalCache 초기화 실패: {e}")
     return _local_cache
 
 
@@ -41,16 +52,15 @@ def get_rental_service():
     if _rental_service is None and RentalService:
         try:
             from flask import current_app
-            _rental_service = RentalService(get_local_cache())
+            from app import get_event_logger
+            _rental_service = RentalService(get_local_cache(), event_logger=get_event_logger())
             if hasattr(current_app, 'mqtt_service') and current_app.mqtt_service:
                 _rental_service.set_mqtt_service(current_app.mqtt_service)
-                print(f"[Routes] RentalService MQTT 연결됨")
+                logger.info(f"[Routes] RentalService MQTT 연결됨")
             else:
-                print(f"[Routes] RentalService MQTT 없음!")
+                logger.warning(f"[Routes] RentalService MQTT 없음!")
         except Exception as e:
-            import traceback
-            print(f"[Routes] RentalService 초기화 실패: {e}")
-            traceback.print_exc()
+            logger.warning(f"[Routes] RentalService 초기화 실패: {e}", exc_info=True)
     return _rental_service
 
 
@@ -251,6 +261,9 @@ def api_get_products():
     """
     상품 목록 조회 (기기 상태 + 가격 포함)
     
+    이후 변경분은 Socket.IO 'inventory_delta'로 푸시 (DeviceStatePublisher)
+    카탈로그 버전 기준 캐시 + ETag (If-None-Match 일치 시 304)
+    
     Response:
         {
             "products": [
@@ -263,7 +276,8 @@ def api_get_products():
                     "stock": 30,
                     "device_uuid": "FBOX-...",
                     "connected": true,
-                    "online": true
+                    "online": true,
+                    "locked": false
                 },
                 ...
             ]
@@ -274,27 +288,31 @@ def api_get_products():
     if not local_cache:
         return jsonify({'products': []})
     
+    return catalog_cache.response('products', local_cache.catalog_version,
+                                  lambda: _build_products(local_cache))
+
+
+def _build_products(local_cache):
+    """/api/products 응답 생성 (응답, 첫 온라인 기기가 오프라인으로 바뀌는 시각)"""
     products = local_cache.get_products()
     result = []
+    expires_at = None
     
     for product in products:
         device_uuid = product.get('device_uuid')
         connected = device_uuid is not None
         online = False
+        locked = False
         stock = product.get('stock', 0)
         
         if device_uuid:
             device = local_cache.get_device(device_uuid)
             if device:
-                last_heartbeat = device.get('last_heartbeat')
-                if last_heartbeat:
-                    try:
-                        hb_time = datetime.fromisoformat(last_heartbeat)
-                        if hb_time.tzinfo:
-                            hb_time = hb_time.replace(tzinfo=None)
-                        online = (datetime.now() - hb_time) < timedelta(minutes=2)
-                    except:
-                        pass
+                online = is_device_online(device.get('last_heartbeat'))
+                locked = bool(device.get('locked'))
+                if online:
+                    until = online_until(device.get('last_heartbeat'))
+                    expires_at = until if expires_at is None else min(expires_at, until)
                 
                 if device.get('stock') is not None:
                     stock = device['stock']
@@ -309,12 +327,13 @@ def api_get_products():
             'device_uuid': device_uuid or '',
             'connected': connected,
             'online': online,
+            'locked': locked,
             'display_order': product.get('display_order', 0),
         })
     
     result.sort(key=lambda x: x['display_order'])
     
-    return jsonify({'products': result})
+    return {'products': result}, expires_at
 
 
 # ========================================
@@ -461,17 +480,15 @@ def api_rental_with_subscription():
         return jsonify({'success': False, 'message': '시스템 초기화 중입니다.'}), 503
     
     try:
-        print(f"[API] 구독권 대여 요청: member={member_id}, subscription_id={subscription_id}, items={items}")
+        logger.info("[API] 구독권 대여 요청: member=%s, subscription_id=%s, items=%s", member_id, subscription_id, items)
         result = rental_service.process_rental_with_subscription(member_id, items, subscription_id)
-        print(f"[API] 구독권 대여 결과: {result}")
+        logger.debug("[API] 구독권 대여 결과: %s", result)
         return jsonify(result)
     except ValueError as e:
-        print(f"[API] 구독권 대여 ValueError: {e}")
+        logger.error(f"[API] 구독권 대여 ValueError: {e}")
         return jsonify({'success': False, 'message': str(e)}), 400
     except Exception as e:
-        import traceback
-        print(f"[API] 구독권 대여 오류: {e}")
-        traceback.print_exc()
+        logger.exception(f"[API] 구독권 대여 오류: {e}")
         return jsonify({'success': False, 'message': '대여 처리 중 오류가 발생했습니다.'}), 500
 
 
@@ -530,17 +547,15 @@ def api_rental_with_voucher():
         return jsonify({'success': False, 'message': '시스템 초기화 중입니다.'}), 503
     
     try:
-        print(f"[API] 금액권 대여 요청: member={member_id}, items={items}, vouchers={voucher_selections}")
+        logger.info("[API] 금액권 대여 요청: member=%s, items=%s, vouchers=%s", member_id, items, voucher_selections)
         result = rental_service.process_rental_with_vouchers(member_id, items, voucher_selections)
-        print(f"[API] 금액권 대여 결과: {result}")
+        logger.debug("[API] 금액권 대여 결과: %s", result)
         return jsonify(result)
     except ValueError as e:
-        print(f"[API] 금액권 대여 ValueError: {e}")
+        logger.error(f"[API] 금액권 대여 ValueError: {e}")
         return jsonify({'success': False, 'message': str(e)}), 400
     except Exception as e:
-        import traceback
-        print(f"[API] 금액권 대여 오류: {e}")
-        traceback.print_exc()
+        logger.exception(f"[API] 금액권 대여 오류: {e}")
         return jsonify({'success': False, 'message': '대여 처리 중 오류가 발생했습니다.'}), 500
 
 
@@ -550,63 +565,112 @@ def api_rental_with_voucher():
 
 @main_bp.route('/api/inventory', methods=['GET'])
 def api_get_inventory():
-    """재고 현황 조회"""
+    """재고 현황 조회 (카탈로그 버전 기준 캐시 + ETag)"""
     rental_service = get_rental_service()
     if not rental_service:
         return jsonify({'categories': {}, 'total': {'total': 0, 'available': 0}})
-    inventory = rental_service.get_inventory_status()
-    return jsonify(inventory)
+    return catalog_cache.response('inventory', rental_service.local_cache.catalog_version,
+                                  lambda: (rental_service.get_inventory_status(), None))
+
+
+# 롱폴링 최대 대기 시간 (프록시/브라우저 타임아웃보다 짧게)
+NFC_POLL_MAX_WAIT = 30.0
+
+
+def _nfc_event_response(event):
+    """NFC 이벤트 → 폴링 응답"""
+    if event.get('success'):
+        return jsonify({
+            'has_event': True,
+            'success': True,
+            'member_id': event.get('member_id'),
+            'name': event.get('name'),
+            'locker_number': event.get('locker_number'),
+            'nfc_uid': event.get('nfc_uid'),
+            'seq': event['seq']
+        })
+    return jsonify({
+        'has_event': True,
+        'success': False,
+        'message': event.get('message', '알 수 없는 오류'),
+        'nfc_uid': event.get('nfc_uid'),
+        'seq': event['seq']
+    })
 
 
 @main_bp.route('/api/nfc/poll', methods=['GET'])
 def api_nfc_poll():
-    """NFC 이벤트 폴링 (큐에서 가져오기)
+    """NFC 이벤트 롱폴링 (Socket.IO 미연결 시 대체 경로)
+    
+    Query:
+        after: 마지막으로 처리한 seq (음수면 대기 없이 현재 seq만 반환,
+               after와 subscriber를 모두 생략하면 기존 폴링 방식 - 공용 위치에서 한 번만 전달)
+        subscriber: 화면/탭 ID (서버가 구독자별 전달 위치를 기억 → 구독자마다 한 번만 전달)
+        wait: 이벤트가 없을 때 대기할 시간 (초, 기본 0, 최대 30)
     
     Response:
-        성공: {"has_event": true, "member_id": "...", "name": "...", ...}
-        없음: {"has_event": false}
+        성공: {"has_event": true, "member_id": "...", "name": "...", "seq": 123, ...}
+        없음: {"has_event": false, "seq": 122}
     """
     from flask import current_app
-    import queue
     
     try:
-        nfc_queue = getattr(current_app, 'nfc_queue', None)
-        
-        if nfc_queue:
-            try:
-                # 큐에서 데이터 가져오기 (non-blocking)
-                nfc_data = nfc_queue.get_nowait()
-                
-                if nfc_data.get('success'):
-                    return jsonify({
-                        'has_event': True,
-                        'success': True,
-                        'member_id': nfc_data.get('member_id'),
-                        'name': nfc_data.get('name'),
-                        'locker_number': nfc_data.get('locker_number'),
-                        'nfc_uid': nfc_data.get('nfc_uid')
-                    })
-                else:
-                    return jsonify({
-                        'has_event': True,
-                        'success': False,
-                        'message': nfc_data.get('message', '알 수 없는 오류'),
-                        'nfc_uid': nfc_data.get('nfc_uid')
-                    })
-            except queue.Empty:
-                # 큐가 비어있음
-                return jsonify({'has_event': False})
-        else:
+        nfc_events = getattr(current_app, 'nfc_events', None)
+        if not nfc_events:
             return jsonify({'has_event': False})
+        
+        after = request.args.get('after', type=int)
+        wait = min(max(request.args.get('wait', 0.0, type=float), 0.0), NFC_POLL_MAX_WAIT)
+        subscriber = (request.args.get('subscriber') or '').strip()[:64] or None
+        
+        if after is not None and after < 0:
+            if subscriber:
+                return jsonify({'has_event': False, 'seq': nfc_events.subscribe(subscriber)})
+            return jsonify({'has_event': False, 'seq': nfc_events.last_seq})
+        
+        event = nfc_events.wait(after=after, timeout=wait, subscriber=subscriber)
+        if event is None:
+            return jsonify({'has_event': False, 'seq': nfc_events.last_seq})
+        return _nfc_event_response(event)
             
     except Exception as e:
-        print(f'[API] NFC 폴링 오류: {e}')
+        logger.error(f'[API] NFC 폴링 오류: {e}')
         return jsonify({'has_event': False, 'error': str(e)})
 
 
+@main_bp.route('/api/nfc/cache', methods=['GET'])
+def api_nfc_cache_stats():
+    """NFC UID → 회원 조회 캐시 통계 (+ 락카 배정 복제, 서킷 브레이커, 리더 수신 통계)
+    
+    Response:
+        {"success": true,
+         "stats": {"local_hits": 40, "hits": 12, "stale_hits": 1, "negative_hits": 3, "misses": 5,
+                   "refreshes": 1, "errors": 0, "size": 5, "hit_rate": 0.918, ...},
+         "replication": {"seq": 122, "size": 87, "lag_seconds": 1.2, "polls": 300, ...},
+         "breaker": {"state": "closed", "consecutive_failures": 0, "open_seconds": null,
+                     "retry_in_seconds": null, "opens": 0, "rejected": 0, ...},
+         "reader": {"lines": 80, "taps": 20, "suppressed": 60, "reconnects": 0, ...}}
+    """
+    from flask import current_app
+    
+    client = getattr(current_app, 'locker_api_client', None)
+    if not client:
+        return jsonify({'success': False, 'message': 'Locker API 클라이언트가 없습니다.'}), 503
+    
+    replicator = getattr(current_app, 'locker_replicator', None)
+    reader = getattr(current_app, 'nfc_reader', None)
+    return jsonify({
+        'success': True,
+        'stats': client.cache_stats(),
+        'replication': replicator.status() if replicator else None,
+        'breaker': client.breaker.snapshot(),
+        'reader': dict(reader.stats) if reader else None
+    })
+
+
 @main_bp.route('/api/test/nfc-inject', methods=['POST'])
 def api_test_nfc_inject():
-    """테스트용: NFC 이벤트 큐에 직접 주입
+    """테스트용: NFC 이벤트 직접 발행 (Socket.IO + 롱폴링)
     
     Request:
         {"nfc_uid": "5A41B914524189"}
@@ -615,7 +679,6 @@ def api_test_nfc_inject():
         {"success": true, "member": {...}}
     """
     from flask import current_app
-    import queue
     
     data = request.json
     nfc_uid = data.get('nfc_uid', '').strip()
@@ -629,69 +692,23 @@ def api_test_nfc_inject():
     
     member_info = current_app.locker_api_client.get_member_by_nfc(nfc_uid)
     
-    nfc_queue = getattr(current_app, 'nfc_queue', None)
+    nfc_events = getattr(current_app, 'nfc_events', None)
     
-    if not nfc_queue:
-        return jsonify({'success': False, 'message': 'NFC 큐가 초기화되지 않았습니다.'}), 500
+    if not nfc_events:
+        return jsonify({'success': False, 'message': 'NFC 이벤트 전달이 초기화되지 않았습니다.'}), 500
     
     if not member_info:
-        # 오류 이벤트 큐에 추가
-        try:
-            nfc_queue.put_nowait({
-                'nfc_uid': nfc_uid,
-                'success': False,
-                'message': '등록되지 않은 NFC 카드입니다.'
-            })
-            print(f"[API] 🧪 테스트: NFC 오류 이벤트 큐에 주입 - {nfc_uid}")
-            return jsonify({
-                'success': False,
-                'message': '등록되지 않은 NFC 카드입니다 (큐에 저장됨)'
-            }), 404
-        except queue.Full:
-            try:
-                nfc_queue.get_nowait()
-                nfc_queue.put_nowait({
-                    'nfc_uid': nfc_uid,
-                    'success': False,
-                    'message': '등록되지 않은 NFC 카드입니다.'
-                })
-                return jsonify({
-                    'success': False,
-                    'message': '등록되지 않은 NFC 카드입니다 (큐에 저장됨, 기존 데이터 덮어씀)'
-                }), 404
-            except:
-                return jsonify({'success': False, 'message': 'NFC 큐 추가 실패'}), 500
-    
-    # 성공 이벤트 큐에 추가
-    try:
-        nfc_queue.put_nowait({
-            'nfc_uid': nfc_uid,
-            'member_id': member_info['member_id'],
-            'name': member_info['name'],
-            'locker_number': member_info['locker_number'],
-            'success': True
-        })
-        print(f"[API] 🧪 테스트: NFC 이벤트 큐에 주입 - {member_info['member_id']} ({member_info['name']})")
+        nfc_events.publish_error(nfc_uid, '등록되지 않은 NFC 카드입니다.')
+        logger.warning(f"[API] 🧪 테스트: NFC 오류 이벤트 발행 - {nfc_uid}")
         return jsonify({
-            'success': True,
-            'message': 'NFC 이벤트가 큐에 추가되었습니다',
-            'member': member_info
-        })
-    except queue.Full:
-        try:
-            nfc_queue.get_nowait()
-            nfc_queue.put_nowait({
-                'nfc_uid': nfc_uid,
-                'member_id': member_info['member_id'],
-                'name': member_info['name'],
-                'locker_number': member_info['locker_number'],
-                'success': True
-            })
-            print(f"[API] 🧪 테스트: NFC 이벤트 큐에 주입 (기존 데이터 덮어씀) - {member_info['member_id']}")
-            return jsonify({
-                'success': True,
-                'message': 'NFC 이벤트가 큐에 추가되었습니다 (기존 데이터 덮어씀)',
-                'member': member_info
-            })
-        except:
-            return jsonify({'success': False, 'message': 'NFC 큐 추가 실패'}), 500
+            'success': False,
+            'message': '등록되지 않은 NFC 카드입니다 (이벤트 발행됨)'
+        }), 404
+    
+    nfc_events.publish_member(nfc_uid, member_info)
+    logger.info(f"[API] 🧪 테스트: NFC 이벤트 발행 - {member_info['member_id']} ({member_info['name']})")
+    return jsonify({
+        'success': True,
+        'message': 'NFC 이벤트가 발행되었습니다',
+        'member': member_info
+    })
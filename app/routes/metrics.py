@@ -0,0 +1,164 @@
+"""
+운영 지표 API
+Prometheus 텍스트 형식 (GET /metrics), LocalCache 락 프로파일 (GET/POST /metrics/locks)
+"""
+
+import logging
+
+from flask import Blueprint, Response, current_app, jsonify, request
+
+from app.services.metrics import MetricsText
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+metrics_bp = Blueprint('metrics', __name__)
+
+
+def _write_local_cache(out: MetricsText, local_cache):
+    """LocalCache 락 대기 시간"""
+    lock = getattr(local_cache, 'lock', None)
+    if lock is None or not hasattr(lock, 'wait_snapshot'):
+        return
+    out.histogram('kiosk_local_cache_lock_wait_seconds', 'LocalCache.lock 획득 대기 시간 (초)',
+                  [(None, lock.wait_snapshot())])
+    out.metric('kiosk_local_cache_lock_held', 'gauge', 'LocalCache.lock 사용 중 여부',
+               [(None, 1 if lock.locked() else 0)])
+    
+    # 호출 위치별 누적 합계 (프로파일링을 켠 동안 기록된 것, 초기화 없음)
+    sites = sorted(lock.profile_snapshot().items())
+    if sites:
+        out.metric('kiosk_local_cache_lock_site_acquires_total', 'counter', '호출 위치별 LocalCache.lock 획득 수',
+                   [({'site': site}, entry['count']) for site, entry in sites])
+        out.metric('kiosk_local_cache_lock_site_hold_seconds_total', 'counter',
+                   '호출 위치별 LocalCache.lock 점유 시간 누적 (초)',
+                   [({'site': site}, entry['hold_total']) for site, entry in sites])
+        out.metric('kiosk_local_cache_lock_site_wait_seconds_total', 'counter',
+                   '호출 위치별 LocalCache.lock 대기 시간 누적 (초)',
+                   [({'site': site}, entry['wait_total']) for site, entry in sites])
+
+
+def _write_queues(out: MetricsText, mqtt_service, event_logger):
+    """MQTT 대기열 / EventLogger 버퍼"""
+    if mqtt_service is not None:
+        out.metric('kiosk_mqtt_connected', 'gauge', 'MQTT 브로커 연결 여부',
+                   [(None, 1 if mqtt_service.is_connected() else 0)])
+        out.metric('kiosk_mqtt_queue_depth', 'gauge', 'paho 대기열 크기',
+                   [({'queue': name}, depth) for name, depth in mqtt_service.queue_depth().items()])
+    
+    if event_logger is not None:
+        out.metric('kiosk_event_log_pending', 'gauge', 'DB 기록 대기 이벤트 수', [(None, event_logger.pending)])
+        out.metric('kiosk_event_log_total', 'counter', 'EventLogger 처리 수',
+                   [({'result': key}, value) for key, value in event_logger.stats.items()])
+
+
+def _write_sync_backlog(out: MetricsText, sheets_sync, local_cache):
+    """Sheets 업로드 백로그"""
+    if local_cache is None:
+        return
+    from app.services.sync_metrics import SyncMetrics
+    
+    try:
+        tables = (sheets_sync.metrics if sheets_sync else SyncMetrics()).snapshot(local_cache)
+    except Exception as e:
+        logger.debug("[Metrics] 동기화 백로그 조회 실패: %s", e)
+        return
+    
+    out.metric('kiosk_sync_unsynced_rows', 'gauge', 'Sheets 미업로드 행 수',
+               [({'table': table}, entry.get('unsynced')) for table, entry in sorted(tables.items())])
+    out.metric('kiosk_sync_oldest_unsynced_age_seconds', 'gauge', '가장 오래된 미업로드 행 경과 시간 (초)',
+               [({'table': table}, entry.get('oldest_unsynced_age_seconds'))
+                for table, entry in sorted(tables.items())])
+
+
+def _write_process(out: MetricsText):
+    """프로세스 메모리/CPU/스레드"""
+    if not PSUTIL_AVAILABLE:
+        return
+    process = psutil.Process()
+    with process.oneshot():
+        rss = process.memory_info().rss
+        cpu = process.cpu_times()
+        threads = process.num_threads()
+    out.metric('process_resident_memory_bytes', 'gauge', '프로세스 RSS (바이트)', [(None, rss)])
+    out.metric('process_cpu_seconds_total', 'counter', '프로세스 CPU 시간 (초)', [(None, cpu.user + cpu.system)])
+    out.metric('process_threads', 'gauge', '프로세스 스레드 수', [(None, threads)])
+
+
+@metrics_bp.route('/metrics', methods=['GET'])
+def metrics():
+    """
+    운영 지표 (Prometheus 텍스트 형식)
+    
+    - kiosk_http_*: 라우트별 응답 시간 히스토그램, 상태 코드별 응답 수, 처리 중 요청 수
+    - kiosk_local_cache_lock_*: LocalCache 락 대기 시간 (프로파일링 기록이 있으면 호출 위치별 누적 counter)
+    - kiosk_mqtt_*, kiosk_event_log_*: MQTT 대기열, 이벤트 기록 버퍼
+    - kiosk_sync_*: Sheets 업로드 백로그
+    - process_*: RSS, CPU 시간, 스레드 수
+    """
+    from app import get_local_cache, get_mqtt_service, get_event_logger, get_sheets_sync
+    
+    out = MetricsText()
+    local_cache = get_local_cache()
+    
+    request_metrics = getattr(current_app, 'request_metrics', None)
+    if request_metrics is not None:
+        request_metrics.write(out)
+    
+    _write_local_cache(out, local_cache)
+    _write_queues(out, get_mqtt_service(), get_event_logger())
+    _write_sync_backlog(out, get_sheets_sync(), local_cache)
+    _write_process(out)
+    
+    return Response(out.render(), content_type=MetricsText.CONTENT_TYPE)
+
+
+@metrics_bp.route('/metrics/locks', methods=['GET'])
+def lock_profile():
+    """
+    LocalCache.lock 호출 위치별 점유/대기 시간 (마지막 주기 보고 이후)
+    
+    Query:
+        top: 개수 (기본 LOCK_PROFILE_TOP, 0이면 전체)
+        sort: hold_total | wait_total | count | hold_max | wait_max
+    
+    Response:
+        {"lock": "local_cache", "enabled": true, "window_seconds": 12.3,
+         "total_hold_ms": 85.2, "total_wait_ms": 3.1,
+         "sites": [{"site": "LocalCache.update_device_status", "count": 120, "hold_total_ms": 40.1,
+                    "hold_avg_ms": 0.334, "hold_max_ms": 2.5, "wait_total_ms": 1.2, "wait_max_ms": 0.8}, ...]}
+    """
+    lock_profiler = getattr(current_app, 'lock_profiler', None)
+    if lock_profiler is None:
+        return jsonify({'error': 'LocalCache 없음'}), 503
+    
+    return jsonify(lock_profiler.report(top_n=request.args.get('top', type=int),
+                                        sort=request.args.get('sort', 'hold_total')))
+
+
+@metrics_bp.route('/metrics/locks', methods=['POST'])
+def toggle_lock_profile():
+    """
+    락 프로파일링 켜기/끄기
+    
+    Request Body:
+        {"enabled": true}   # 끄면 남은 기록을 로그로 보고
+    """
+    lock_profiler = getattr(current_app, 'lock_profiler', None)
+    if lock_profiler is None:
+        return jsonify({'error': 'LocalCache 없음'}), 503
+    
+    data = request.get_json(silent=True) or {}
+    if 'enabled' not in data:
+        return jsonify({'error': 'enabled 필드 필요'}), 400
+    
+    if data['enabled']:
+        lock_profiler.enable()
+    else:
+        lock_profiler.disable()
+    return jsonify({'success': True, 'enabled': lock_profiler.enabled})
@@ -0,0 +1,83 @@
+"""
+카탈로그 응답 캐시
+
+/api/products, /api/inventory, /api/locker/list 응답을 LocalCache.catalog_version 기준으로 캐시
+- 버전이 같으면 직렬화된 JSON 바이트를 그대로 재사용 (재계산/재직렬화 없음)
+- ETag: 이름-버전-본문 해시 → If-None-Match가 일치하면 304 (본문 전송 없음)
+- 시간에 따라 바뀌는 값(기기 온라인 여부)은 build가 돌려주는 만료 시각으로 재생성
+"""
+
+import hashlib
+import json
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+BuildResult = Tuple[Dict, Optional[float]]  # (응답 dict, 만료 시각 epoch 초 또는 None)
+
+
+class CatalogCache:
+    """이름별 최신 응답 1개씩 보관"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict] = {}
+        self.stats = {'hits': 0, 'builds': 0, 'not_modified': 0}
+    
+    def get(self, name: str, version: int, build: Callable[[], BuildResult]) -> Tuple[bytes, str]:
+        """
+        캐시된 응답 조회 (버전이 다르거나 만료되면 build 호출 후 저장)
+        
+        Args:
+            name: 응답 이름 (예: 'products')
+            version: 현재 카탈로그 버전
+            build: (응답 dict, 만료 시각) 반환 함수
+        
+        Returns:
+            (JSON 바이트, ETag 값)
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(name)
+            if (entry and entry['version'] == version
+                    and (entry['expires_at'] is None or now < entry['expires_at'])):
+                self.stats['hits'] += 1
+                return entry['body'], entry['etag']
+        
+        payload, expires_at = build()
+        body = json.dumps(payload, ensure_ascii=False, separators=(',', ':'), default=str).encode('utf-8')
+        etag = f'{name}-{version}-{hashlib.sha1(body).hexdigest()[:16]}'
+        
+        with self._lock:
+            self._entries[name] = {'version': version, 'body': body, 'etag': etag, 'expires_at': expires_at}
+            self.stats['builds'] += 1
+        return body, etag
+    
+    def response(self, name: str, version: int, build: Callable[[], BuildResult]):
+        """
+        조건부 GET 응답 생성 (현재 요청의 If-None-Match 확인)
+        
+        Cache-Control: no-cache → 브라우저는 매번 ETag로 재검증하고, 바뀌지 않았으면 304
+        """
+        from flask import current_app, request
+        
+        body, etag = self.get(name, version, build)
+        response = current_app.response_class(body, mimetype='application/json')
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        response.headers['X-Catalog-Version'] = str(version)
+        
+        response = response.make_conditional(request)
+        if response.status_code == 304:
+            with self._lock:
+                self.stats['not_modified'] += 1
+        return response
+    
+    def clear(self):
+        """캐시 비우기"""
+        with self._lock:
+            self._entries.clear()
+
+
+# 앱 전역 인스턴스 (라우트에서 공유)
+catalog_cache = CatalogCache()
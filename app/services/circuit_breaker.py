@@ -0,0 +1,165 @@
+"""
+서킷 브레이커
+
+외부 서버(락카키 대여기 등)가 죽었을 때 매 요청마다 타임아웃을 기다리지 않도록 차단
+- closed: 정상, 연속 실패가 failure_threshold에 도달하면 open
+- open: 요청 즉시 거부 (reset_timeout 동안)
+- half_open: reset_timeout 후 probe(예: health_check)를 백그라운드에서 한 번 실행
+  성공 → closed, 실패 → 다시 open (대기 시간 두 배, 최대 max_reset_timeout)
+  probe가 없으면 다음 요청 하나를 시험 요청으로 통과
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """연속 실패 기반 서킷 브레이커"""
+    
+    def __init__(self, name: str, failure_threshold: int = 3, reset_timeout: float = 10.0,
+                 max_reset_timeout: float = 60.0, probe: Optional[Callable[[], bool]] = None):
+        """
+        초기화
+        
+        Args:
+            name: 로그/상태 표시용 이름
+            failure_threshold: open으로 바꿀 연속 실패 수
+            reset_timeout: open 유지 시간 (초, 처음 값)
+            max_reset_timeout: probe 연속 실패 시 최대 open 유지 시간 (초)
+            probe: 복구 확인 함수 (True면 복구, None이면 다음 요청으로 확인)
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.probe = probe
+        
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._open_timeout = reset_timeout
+        self._opened_at: Optional[float] = None
+        self._retry_at = 0.0
+        self._trial_in_flight = False
+        
+        self.stats = {'opens': 0, 'rejected': 0, 'probes': 0, 'probe_failed': 0}
+    
+    @property
+    def state(self) -> str:
+        """현재 상태 (closed/open/half_open)"""
+        with self._lock:
+            return self._state
+    
+    @property
+    def is_open(self) -> bool:
+        """요청이 차단되는 상태인지 (open 또는 확인 중인 half_open)"""
+        return self.state != CLOSED
+    
+    def allow(self) -> bool:
+        """
+        요청 허용 여부 (open 대기 시간이 지났으면 복구 확인 시작)
+        
+        Returns:
+            True면 요청 진행 (결과를 record_success/record_failure로 알려야 함)
+        """
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            
+            if self._state == OPEN and time.monotonic() >= self._retry_at:
+                self._state = HALF_OPEN
+                if self.probe is not None:
+                    self.stats['probes'] += 1
+                    threading.Thread(target=self._run_probe, daemon=True,
+                                     name=f'breaker-probe-{self.name}').start()
+                else:
+                    self._trial_in_flight = False
+            
+            if self._state == HALF_OPEN and self.probe is None and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            
+            self.stats['rejected'] += 1
+            return False
+    
+    def record_success(self):
+        """요청 성공 (서버가 응답함)"""
+        with self._lock:
+            self._failures = 0
+            if self._state != CLOSED:
+                self._close()
+    
+    def record_failure(self):
+        """요청 실패 (타임아웃/연결 실패/5xx)"""
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN:
+                self._open(backoff=True)
+            elif self._state == CLOSED and self._failures >= self.failure_threshold:
+                self._open(backoff=False)
+    
+    def reset(self):
+        """강제로 closed (대상 주소가 바뀌었을 때 등)"""
+        with self._lock:
+            self._failures = 0
+            if self._state != CLOSED:
+                self._close()
+    
+    def _run_probe(self):
+        """half_open 복구 확인 (백그라운드)"""
+        try:
+            ok = bool(self.probe())
+        except Exception as e:
+            logger.debug("[Breaker] %s probe 예외: %s", self.name, e)
+            ok = False
+        
+        with self._lock:
+            if self._state != HALF_OPEN:
+                return
+            if ok:
+                self._failures = 0
+                self._close()
+            else:
+                self.stats['probe_failed'] += 1
+                self._open(backoff=True)
+    
+    def _open(self, backoff: bool):
+        """open으로 전환 (_lock 안에서 호출)"""
+        if backoff:
+            self._open_timeout = min(self._open_timeout * 2, self.max_reset_timeout)
+        else:
+            self._open_timeout = self.reset_timeout
+            self.stats['opens'] += 1
+            self._opened_at = time.time()
+            logger.warning(f"[Breaker] {self.name} 차단 (연속 실패 {self._failures}회, "
+                           f"{self._open_timeout:.0f}초 후 복구 확인)")
+        self._state = OPEN
+        self._retry_at = time.monotonic() + self._open_timeout
+    
+    def _close(self):
+        """closed로 전환 (_lock 안에서 호출)"""
+        downtime = time.time() - self._opened_at if self._opened_at else 0.0
+        self._state = CLOSED
+        self._open_timeout = self.reset_timeout
+        self._opened_at = None
+        logger.info(f"[Breaker] {self.name} 복구 ({downtime:.0f}초 차단)")
+    
+    def snapshot(self) -> Dict:
+        """상태 조회 (state, consecutive_failures, open_seconds, retry_in_seconds, stats)"""
+        with self._lock:
+            now = time.monotonic()
+            return {
+                'state': self._state,
+                'consecutive_failures': self._failures,
+                'open_seconds': round(time.time() - self._opened_at, 1) if self._opened_at else None,
+                'retry_in_seconds': round(max(0.0, self._retry_at - now), 1) if self._state == OPEN else None,
+                **self.stats
+            }
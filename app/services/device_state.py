@@ -0,0 +1,171 @@
+"""
+기기 상태 실시간 푸시 서비스
+
+MQTT 핸들러가 LocalCache를 갱신한 뒤 기기의 재고/온라인/잠금 상태를 다시 읽어
+이전에 보낸 값과 달라진 필드만 Socket.IO 'inventory_delta'로 emit
+- 입력: dispense_complete, stock_updated, heartbeat, door_closed, status 핸들러
+- 오프라인 판정: 마지막 하트비트 후 online_timeout 경과 (주기 점검 스레드)
+- 키오스크는 처음/재연결 시 /api/products 한 번 조회 후 델타만 반영
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# 마지막 하트비트 후 이 시간(초)이 지나면 오프라인 (/api/products와 같은 기준)
+ONLINE_TIMEOUT = 120.0
+
+
+def online_until(last_heartbeat, timeout: float = ONLINE_TIMEOUT) -> Optional[float]:
+    """
+    오프라인으로 바뀌는 시각 (epoch 초, 시간대 없는 값은 로컬 시각으로 해석)
+    
+    Returns:
+        last_heartbeat + timeout, 하트비트가 없거나 형식이 잘못되면 None
+    """
+    if not last_heartbeat:
+        return None
+    try:
+        hb_time = datetime.fromisoformat(str(last_heartbeat))
+    except ValueError:
+        return None
+    return hb_time.timestamp() + timeout
+
+
+def is_device_online(last_heartbeat, timeout: float = ONLINE_TIMEOUT) -> bool:
+    """마지막 하트비트 시각 기준 온라인 여부"""
+    until = online_until(last_heartbeat, timeout)
+    return until is not None and time.time() < until
+
+
+class DeviceStatePublisher:
+    """기기 상태 변경분(델타) 푸시"""
+    
+    EVENT_NAME = 'inventory_delta'
+    FIELDS = ('stock', 'online', 'locked')
+    
+    def __init__(self, local_cache, socketio=None, online_timeout: float = ONLINE_TIMEOUT,
+                 check_interval: float = 30.0):
+        """
+        초기화
+        
+        Args:
+            local_cache: LocalCache 인스턴스 (상태 원본)
+            socketio: flask_socketio.SocketIO 인스턴스 (None이면 상태만 추적)
+            online_timeout: 오프라인 판정 시간 (초)
+            check_interval: 오프라인 점검 주기 (초)
+        """
+        self.local_cache = local_cache
+        self.socketio = socketio
+        self.online_timeout = online_timeout
+        self.check_interval = check_interval
+        
+        self._lock = threading.Lock()
+        self._states: Dict[str, Dict] = {}  # {device_uuid: 마지막으로 보낸 상태}
+        self._seq = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        
+        self.stats = {'deltas': 0, 'unchanged': 0, 'emit_failed': 0}
+    
+    def _read_state(self, device_uuid: str) -> Optional[Dict]:
+        """LocalCache에서 현재 상태 조회 (재고는 기기 값 우선, 없으면 상품 재고)"""
+        device = self.local_cache.get_device(device_uuid)
+        product = self.local_cache.get_product_by_device_uuid(device_uuid)
+        if not device and not product:
+            return None
+        
+        stock = device.get('stock') if device else None
+        if stock is None and product:
+            stock = product.get('stock', 0)
+        
+        return {
+            'product_id': product['product_id'] if product else None,
+            'stock': stock,
+            'online': is_device_online(device.get('last_heartbeat') if device else None,
+                                       self.online_timeout),
+            'locked': bool(device.get('locked')) if device else False,
+        }
+    
+    def publish(self, device_uuid: str) -> Optional[Dict]:
+        """
+        기기 상태를 다시 읽어 달라진 필드만 emit
+        
+        Returns:
+            보낸 델타 ({'seq', 'device_uuid', 'product_id', 'changes'}), 변경 없으면 None
+        """
+        try:
+            state = self._read_state(device_uuid)
+        except Exception as e:
+            logger.warning(f"[DeviceState] 상태 조회 실패 ({device_uuid}): {e}")
+            return None
+        if state is None:
+            return None
+        
+        with self._lock:
+            previous = self._states.get(device_uuid, {})
+            changes = {f: state[f] for f in self.FIELDS if previous.get(f) != state[f] or f not in previous}
+            if not changes:
+                self.stats['unchanged'] += 1
+                return None
+            
+            self._states[device_uuid] = state
+            self._seq += 1
+            delta = {
+                'seq': self._seq,
+                'device_uuid': device_uuid,
+                'product_id': state['product_id'],
+                'changes': changes,
+            }
+            self.stats['deltas'] += 1
+        
+        if self.socketio is not None:
+            try:
+                self.socketio.emit(self.EVENT_NAME, delta)
+            except Exception as e:
+                self.stats['emit_failed'] += 1
+                logger.warning(f"[DeviceState] Socket.IO emit 실패: {e}")
+        
+        logger.debug("[DeviceState] %s 변경: %s", device_uuid, changes)
+        return delta
+    
+    def check_offline(self) -> int:
+        """온라인으로 보낸 기기 중 하트비트가 끊긴 기기 재확인 (오프라인 델타 emit)"""
+        with self._lock:
+            online_devices = [uuid for uuid, state in self._states.items() if state.get('online')]
+        return sum(1 for uuid in online_devices if self.publish(uuid))
+    
+    def snapshot(self) -> Dict:
+        """마지막으로 보낸 상태 전체 ({'seq', 'devices': {device_uuid: state}})"""
+        with self._lock:
+            return {'seq': self._seq, 'devices': {k: dict(v) for k, v in self._states.items()}}
+    
+    # =============================
+    # 오프라인 점검 스레드
+    # =============================
+    
+    def start(self):
+        """오프라인 점검 스레드 시작"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._check_loop, daemon=True, name='device-state')
+        self._thread.start()
+    
+    def stop(self):
+        """오프라인 점검 스레드 중지"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=2.0)
+    
+    def _check_loop(self):
+        """check_interval마다 오프라인 점검"""
+        while not self._stop.wait(self.check_interval):
+            try:
+                self.check_offline()
+            except Exception as e:
+                logger.warning(f"[DeviceState] 오프라인 점검 실패: {e}")
@@ -7,12 +7,21 @@ MQTT Raw 이벤트를 비즈니스 이벤트로 분류하여 event_logs 테이
 - device_online / device_offline: 기기 상태
 - door_opened / door_closed: 문 열림/닫힘
 - error: 기기 에러
+
+쓰기는 비동기: log_event는 메모리 버퍼에 넣고 즉시 반환,
+백그라운드 스레드가 모아서 executemany로 한 번에 INSERT
 """
 
+import atexit
 import json
+import logging
+import threading
+from collections import deque
 from datetime import datetime
 from typing import Optional, Dict, Any
 
+logger = logging.getLogger(__name__)
+
 
 class EventLogger:
     """비즈니스 이벤트 로거"""
@@ -39,15 +48,52 @@ class EventLogger:
         'error': 'error',
     }
     
-    def __init__(self, local_cache):
+    # 버퍼가 가득 찼을 때 정책
+    OVERFLOW_DROP = 'drop'    # 가장 오래된 이벤트 버림 (링 버퍼, 호출자 대기 없음)
+    OVERFLOW_BLOCK = 'block'  # block_timeout까지 대기 후에도 가득 차면 새 이벤트 버림
+    
+    def __init__(self, local_cache, buffer_size: int = 1000,
+                 flush_interval: float = 1.0, batch_size: int = 200,
+                 overflow: str = OVERFLOW_DROP, block_timeout: float = 0.5):
         """
         초기화
         
         Args:
             local_cache: LocalCache 인스턴스 (DB 접근용)
+            buffer_size: 메모리 버퍼 최대 이벤트 수
+            flush_interval: 백그라운드 기록 주기 (초)
+            batch_size: 이 수만큼 쌓이면 주기를 기다리지 않고 기록
+            overflow: 버퍼 가득 참 정책 ('drop' | 'block')
+            block_timeout: 'block' 정책에서 최대 대기 시간 (초)
         """
+        if overflow not in (self.OVERFLOW_DROP, self.OVERFLOW_BLOCK):
+            raise ValueError(f"지원하지 않는 overflow 정책: {overflow}")
+        
         self.local_cache = local_cache
-        print("[EventLogger] 초기화 완료")
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        
+        self._buffer = deque()
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()  # flush() 동시 호출 시 순서 보장
+        self._running = True
+        
+        self.stats = {'queued': 0, 'written': 0, 'dropped': 0, 'failed': 0, 'requeued': 0, 'flushes': 0}
+        
+        self._thread = threading.Thread(target=self._flush_loop, daemon=True, name='event-logger')
+        self._thread.start()
+        atexit.register(self.close)
+        
+        logger.info(f"[EventLogger] 초기화 완료 (버퍼 {buffer_size}, 주기 {flush_interval}초, 정책 {overflow})")
+    
+    @property
+    def pending(self) -> int:
+        """DB에 아직 기록하지 않은 이벤트 수"""
+        with self._cond:
+            return len(self._buffer)
     
     def log_event(self, event_type: str, 
                   device_uuid: str = None,
@@ -67,36 +113,145 @@ class EventLogger:
             severity: 심각도 (None이면 자동 결정)
         
         Returns:
-            생성된 event_log ID
+            0: 버퍼에 추가됨 (ID는 기록 시점에 결정), -1: 버려짐
         """
         # 심각도 자동 결정
         if severity is None:
             severity = self.SEVERITY_MAP.get(event_type, 'info')
         
-        # details를 JSON 문자열로 변환
-        details_json = json.dumps(details, ensure_ascii=False) if details else None
-        
         try:
-            conn = self.local_cache.conn
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT INTO event_logs 
-                (event_type, severity, device_uuid, member_id, product_id, details, created_at, synced_to_sheets)
-                VALUES (?, ?, ?, ?, ?, ?, ?, 0)
-            ''', (event_type, severity, device_uuid, member_id, product_id, 
-                  details_json, datetime.now().isoformat()))
-            
-            event_id = cursor.lastrowid
-            conn.commit()
-            
-            print(f"[EventLogger] {severity.upper()}: {event_type} (ID: {event_id})")
-            
-            return event_id
-            
-        except Exception as e:
-            print(f"[EventLogger] 로깅 실패: {e}")
+            # details를 JSON 문자열로 변환
+            details_json = json.dumps(details, ensure_ascii=False) if details else None
+        except (TypeError, ValueError) as e:
+            logger.warning(f"[EventLogger] 로깅 실패: {e}")
             return -1
+        
+        record = (event_type, severity, device_uuid, member_id, product_id,
+                  details_json, datetime.now().isoformat())
+        
+        if severity == 'error':
+            logger.error("[EventLogger] %s (%s)", event_type, device_uuid or '-')
+        
+        with self._cond:
+            if not self._running:
+                # 종료 후 들어온 이벤트는 바로 기록
+                self._buffer.append(record)
+                self.stats['queued'] += 1
+            else:
+                if len(self._buffer) >= self.buffer_size:
+                    if self.overflow == self.OVERFLOW_BLOCK:
+                        self._cond.notify_all()
+                        self._cond.wait_for(lambda: len(self._buffer) < self.buffer_size,
+                                            timeout=self.block_timeout)
+                    
+                    if len(self._buffer) >= self.buffer_size:
+                        self.stats['dropped'] += 1
+                        if self.overflow == self.OVERFLOW_BLOCK:
+                            return -1
+                        self._buffer.popleft()  # 링 버퍼: 가장 오래된 것 버림
+                
+                self._buffer.append(record)
+                self.stats['queued'] += 1
+                if len(self._buffer) >= min(self.batch_size, self.buffer_size):
+                    self._cond.notify_all()
+                return 0
+        
+        self.flush()
+        return 0
+    
+    # =============================
+    # 버퍼 기록
+    # =============================
+    
+    def _flush_loop(self):
+        """백그라운드 기록 루프 (flush_interval마다 또는 batch_size 도달 시)"""
+        while True:
+            with self._cond:
+                threshold = min(self.batch_size, self.buffer_size)
+                self._cond.wait_for(
+                    lambda: not self._running or len(self._buffer) >= threshold,
+                    timeout=self.flush_interval
+                )
+                if not self._running:
+                    return
+            
+            self.flush()
+    
+    def flush(self) -> int:
+        """
+        버퍼의 이벤트를 모두 DB에 기록 (동기)
+        
+        event_logs INSERT와 시간별 집계(event_hourly) 갱신을 한 트랜잭션으로 처리
+        
+        Returns:
+            기록한 이벤트 수
+        """
+        written = 0
+        
+        with self._flush_lock:
+            while True:
+                with self._cond:
+                    if not self._buffer:
+                        break
+                    count = min(len(self._buffer), self.batch_size)
+                    batch = [self._buffer.popleft() for _ in range(count)]
+                    self._cond.notify_all()  # block 정책 대기자 깨우기
+                
+                try:
+                    with self.local_cache.lock:
+                        conn = self.local_cache.conn
+                        try:
+                            conn.executemany('''
+                                INSERT INTO event_logs 
+                                (event_type, severity, device_uuid, member_id, product_id, details, created_at)
+                                VALUES (?, ?, ?, ?, ?, ?, ?)
+                            ''', batch)
+                            self.local_cache.apply_event_rollups(batch)  # 같은 트랜잭션
+                            conn.commit()
+                        except Exception:
+                            conn.rollback()
+                            raise
+                    written += len(batch)
+                except Exception as e:
+                    self.stats['failed'] += len(batch)
+                    lost = self._requeue(batch)
+                    logger.error(f"[EventLogger] 로깅 실패 ({len(batch)}건, 버퍼 초과로 버림 {lost}건): {e}")
+                    break  # 다음 주기에 재시도
+        
+        if written:
+            self.stats['written'] += written
+            self.stats['flushes'] += 1
+        return written
+    
+    def _requeue(self, batch) -> int:
+        """
+        기록 실패한 배치를 버퍼 앞에 되돌림 (순서 유지, buffer_size 초과분은 오래된 것부터 버림)
+        
+        Returns:
+            버린 이벤트 수 (stats['dropped']에 포함)
+        """
+        with self._cond:
+            room = max(0, self.buffer_size - len(self._buffer))
+            lost = max(0, len(batch) - room)
+            self._buffer.extendleft(reversed(batch[lost:]))
+            self.stats['requeued'] += len(batch) - lost
+            self.stats['dropped'] += lost
+        return lost
+    
+    def close(self):
+        """백그라운드 스레드 중지 후 남은 이벤트 기록 (앱 종료 시 자동 호출)"""
+        with self._cond:
+            if not self._running:
+                return
+            self._running = False
+            self._cond.notify_all()
+        
+        self._thread.join(timeout=self.flush_interval + 1)
+        written = self.flush()
+        
+        if self.stats['dropped'] or self._buffer:
+            logger.info(f"[EventLogger] 종료: {written}건 기록, 누적 버림 {self.stats['dropped']}건, "
+                        f"미기록 {len(self._buffer)}건")
     
     # =============================
     # 대여 관련 이벤트
@@ -252,75 +407,35 @@ class EventLogger:
     # =============================
     
     def get_unsynced_events(self, limit: int = 100) -> list:
-        """Sheets에 동기화되지 않은 이벤트 조회"""
+        """Sheets에 동기화되지 않은 이벤트 조회 (동기화 커서 이후, id 오름차순)"""
+        self.flush()
         try:
-            conn = self.local_cache.conn
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                SELECT * FROM event_logs 
-                WHERE synced_to_sheets = 0 
-                ORDER BY created_at
-                LIMIT ?
-            ''', (limit,))
-            
-            columns = [desc[0] for desc in cursor.description]
-            return [dict(zip(columns, row)) for row in cursor.fetchall()]
-            
+            return self.local_cache.get_outbox_batch('event_logs', limit)
         except Exception as e:
-            print(f"[EventLogger] 조회 실패: {e}")
+            logger.warning(f"[EventLogger] 조회 실패: {e}")
             return []
     
     def mark_events_synced(self, event_ids: list):
-        """이벤트를 동기화 완료로 표시"""
+        """이벤트를 동기화 완료로 표시 (동기화 커서 전진)"""
         if not event_ids:
             return
         
         try:
-            conn = self.local_cache.conn
-            cursor = conn.cursor()
-            
-            placeholders = ', '.join(['?' for _ in event_ids])
-            cursor.execute(f'''
-                UPDATE event_logs 
-                SET synced_to_sheets = 1 
-                WHERE id IN ({placeholders})
-            ''', event_ids)
-            
-            conn.commit()
-            print(f"[EventLogger] {len(event_ids)}건 동기화 완료 표시")
-            
+            self.local_cache.advance_sync_cursor('event_logs', max(event_ids))
+            logger.debug("[EventLogger] %d건 동기화 완료 표시", len(event_ids))
         except Exception as e:
-            print(f"[EventLogger] 동기화 표시 실패: {e}")
+            logger.warning(f"[EventLogger] 동기화 표시 실패: {e}")
     
     def get_recent_events(self, limit: int = 50, 
                           event_type: str = None,
                           severity: str = None) -> list:
-        """최근 이벤트 조회"""
+        """최근 이벤트 조회 (details는 JSON 문자열 그대로)"""
+        self.flush()
         try:
-            conn = self.local_cache.conn
-            cursor = conn.cursor()
-            
-            query = 'SELECT * FROM event_logs WHERE 1=1'
-            params = []
-            
-            if event_type:
-                query += ' AND event_type = ?'
-                params.append(event_type)
-            
-            if severity:
-                query += ' AND severity = ?'
-                params.append(severity)
-            
-            query += ' ORDER BY created_at DESC LIMIT ?'
-            params.append(limit)
-            
-            cursor.execute(query, params)
-            
-            columns = [desc[0] for desc in cursor.description]
-            return [dict(zip(columns, row)) for row in cursor.fetchall()]
-            
+            page = self.local_cache.query_events(
+                'business', event_type=event_type, severity=severity, limit=limit
+            )
+            return page['events']
         except Exception as e:
-            print(f"[EventLogger] 조회 실패: {e}")
+            logger.warning(f"[EventLogger] 조회 실패: {e}")
             return []
-
@@ -1,13 +1,18 @@
 """
 시스템 간 통합을 위한 구글 시트 동기화
 락카키 대여기 ↔ 운동복 대여기 간 통신 정보 공유
+
+운동복 대여기는 캐시(config/locker_api_cache.json)의 주소로 바로 시작하고
+시트 조회는 백그라운드에서 주기적으로 (start_auto_refresh) → 주소가 바뀌면 콜백으로 알림
 """
 
 import json
 import socket
 import logging
+import threading
 from datetime import datetime
 from pathlib import Path
+from typing import Callable, Optional
 
 try:
     import gspread
@@ -25,20 +30,40 @@ class IntegrationSync:
     # System_Integration 시트 ID
     INTEGRATION_SHEET_ID = "15qpiY1r_SEK6b2dr00UDmKrYHSVuGMmiMeTZ898Lv8Q"
     
-    def __init__(self):
-        """초기화"""
+    def __init__(self, backend=None):
+        """
+        초기화
+        
+        Args:
+            backend: 스프레드시트 백엔드 (None이면 gspread 직접 사용, 테스트 시 FakeSheetsBackend)
+        """
         self.project_root = Path(__file__).parent.parent.parent
         self.credentials_path = self.project_root / "config" / "credentials.json"
         self.cache_file = self.project_root / "config" / "locker_api_cache.json"
+        self.backend = backend
         
         self.client = None
         self.spreadsheet = None
         self.connected = False
         
+        self._refresh_stop = threading.Event()
+        self._refresh_thread: Optional[threading.Thread] = None
+        self.current_url: Optional[str] = None
+        
         logger.info("[IntegrationSync] 초기화")
     
     def connect(self) -> bool:
         """구글 시트 연결"""
+        if self.backend is not None:
+            try:
+                self.spreadsheet = self.backend.open_by_key(self.INTEGRATION_SHEET_ID)
+                self.connected = True
+                return True
+            except Exception as e:
+                logger.error(f"[IntegrationSync] ❌ 연결 실패: {e}")
+                self.connected = False
+                return False
+        
         if not GSPREAD_AVAILABLE:
             logger.warning("[IntegrationSync] gspread 없음")
             return False
@@ -107,7 +132,6 @@ class IntegrationSync:
             })
             
             logger.info("[IntegrationSync] ✅ 헤더 초기화 완료")
-            print("✅ System_Integration 시트 헤더 작성 완료!")
             return True
             
         except Exception as e:
@@ -144,19 +168,26 @@ class IntegrationSync:
                 worksheet.update('A2:E2', [data])
                 logger.info(f"[IntegrationSync] ✅ IP 업데이트: {ip}:{port}")
             
-            print(f"✅ 락카키 대여기 IP 업로드 완료: {ip}:{port}")
             return True
             
         except Exception as e:
             logger.error(f"[IntegrationSync] ❌ IP 업로드 실패: {e}")
-            print(f"❌ IP 업로드 실패: {e}")
             return False
     
     def download_locker_api_info(self) -> dict:
-        """락카키 대여기 IP를 시트에서 다운로드 (운동복 대여기용)"""
+        """락카키 대여기 IP를 시트에서 다운로드 (운동복 대여기용, 실패 시 캐시)"""
+        return self.fetch_locker_api_info() or self._load_cache()
+    
+    def fetch_locker_api_info(self) -> Optional[dict]:
+        """
+        System_Integration 시트에서 락카키 대여기 주소 조회 (성공 시 캐시 저장)
+        
+        Returns:
+            {'host', 'port', 'url', 'last_updated', 'status'} 또는 None (연결 실패/데이터 없음)
+        """
         if not self.connected:
             if not self.connect():
-                return self._load_cache()
+                return None
         
         try:
             worksheet = self.spreadsheet.sheet1
@@ -166,13 +197,13 @@ class IntegrationSync:
             
             if not values or not values[0]:
                 logger.warning("[IntegrationSync] ⚠️ 데이터 없음")
-                return self._load_cache()
+                return None
             
             row = values[0]
             
             if len(row) < 2:
                 logger.warning("[IntegrationSync] ⚠️ 불완전한 데이터")
-                return self._load_cache()
+                return None
             
             locker_api = {
                 'host': row[0],
@@ -190,7 +221,55 @@ class IntegrationSync:
             
         except Exception as e:
             logger.error(f"[IntegrationSync] ❌ IP 다운로드 실패: {e}")
-            return self._load_cache()
+            self.connected = False  # 다음 조회 때 재연결
+            return None
+    
+    def get_cached_locker_api_info(self) -> dict:
+        """캐시된 락카키 대여기 주소 (네트워크 없이 즉시, 캐시가 없으면 기본값)"""
+        info = self._load_cache()
+        self.current_url = info.get('url')
+        return info
+    
+    # =============================
+    # 주소 백그라운드 갱신
+    # =============================
+    
+    def start_auto_refresh(self, on_change: Callable[[dict], None], interval: float = 300.0):
+        """
+        시트 주소 주기 조회 시작 (시작 직후 1회 + interval마다)
+        
+        Args:
+            on_change: 주소(url)가 current_url과 달라지면 호출 (새 주소 정보 dict)
+            interval: 조회 주기 (초)
+        """
+        if self._refresh_thread and self._refresh_thread.is_alive():
+            return
+        self._refresh_stop.clear()
+        self._refresh_thread = threading.Thread(target=self._refresh_loop, args=(on_change, interval),
+                                                daemon=True, name='integration-refresh')
+        self._refresh_thread.start()
+        logger.info(f"[IntegrationSync] 락카키 대여기 주소 갱신 시작 (주기 {interval:.0f}초)")
+    
+    def stop_auto_refresh(self):
+        """주소 주기 조회 중지"""
+        self._refresh_stop.set()
+        if self._refresh_thread:
+            self._refresh_thread.join(timeout=2.0)
+    
+    def _refresh_loop(self, on_change: Callable[[dict], None], interval: float):
+        """시트 조회 → 주소가 바뀌었으면 on_change (실패 시 현재 주소 유지)"""
+        while not self._refresh_stop.is_set():
+            info = self.fetch_locker_api_info()
+            
+            if info and info['url'] != self.current_url:
+                logger.info(f"[IntegrationSync] 락카키 대여기 주소 변경: {self.current_url} → {info['url']}")
+                self.current_url = info['url']
+                try:
+                    on_change(info)
+                except Exception as e:
+                    logger.error(f"[IntegrationSync] 주소 변경 적용 실패: {e}")
+            
+            self._refresh_stop.wait(interval)
     
     def _save_cache(self, data: dict):
         """로컬 캐시 저장"""
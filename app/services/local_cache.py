@@ -7,14 +7,20 @@ SQLite + 메모리 캐시 조합으로 빠른 데이터 접근 제공
 - 금액권/구독권 관리
 """
 
+import logging
+import base64
 import sqlite3
-import threading
+import time
 import json
 from datetime import datetime, date, timedelta
 from typing import Dict, Optional, List, Tuple
 from pathlib import Path
 import pytz
 
+from app.services.metrics import TimedLock
+
+logger = logging.getLogger(__name__)
+
 # 한국 시간대
 KST = pytz.timezone('Asia/Seoul')
 
@@ -29,9 +35,38 @@ def get_kst_today() -> date:
     return get_kst_now().date()
 
 
+def hour_bucket(timestamp) -> str:
+    """created_at 값을 시간 집계 키('YYYY-MM-DDTHH')로 변환"""
+    return str(timestamp)[:13].replace(' ', 'T')
+
+
 class LocalCache:
     """로컬 캐시 관리 클래스"""
     
+    # Sheets로 append 업로드되는 로그 테이블 (id 오름차순 커서로 순회)
+    OUTBOX_TABLES = ('rental_logs', 'voucher_transactions', 'event_logs', 'mqtt_events')
+    
+    # 시간별 집계 조회에서 허용하는 group_by 컬럼 ('day'는 hour 앞 10자리)
+    RENTAL_ROLLUP_GROUPS = ('hour', 'day', 'product_id', 'device_uuid', 'payment_type')
+    EVENT_ROLLUP_GROUPS = ('hour', 'day', 'event_type', 'severity', 'device_uuid', 'product_id')
+    
+    # 이벤트 조회 대상 (테이블마다 기기/페이로드 컬럼명이 다름)
+    EVENT_SOURCES = {
+        'mqtt': {
+            'table': 'mqtt_events', 'device': 'device_id', 'payload': 'payload',
+            'columns': ('id', 'device_id', 'event_type', 'created_at'),
+        },
+        'business': {
+            'table': 'event_logs', 'device': 'device_uuid', 'payload': 'details',
+            'columns': ('id', 'event_type', 'severity', 'device_uuid', 'member_id', 'product_id', 'created_at'),
+        },
+    }
+    EVENT_PAGE_MAX = 200
+    
+    # 락카 배정 변경 이력 보관 개수 / 한 번에 주는 최대 변경 수
+    LOCKER_CHANGES_KEEP = 5000
+    LOCKER_CHANGES_PAGE_MAX = 1000
+    
     def __init__(self, db_path: str = None):
         """
         초기화
@@ -46,7 +81,7 @@ class LocalCache:
         
         self.db_path = str(db_path)
         self.conn = None
-        self.lock = threading.Lock()  # 동시 접근 제어
+        self.lock = TimedLock('local_cache')  # 동시 접근 제어 (획득 대기 시간 → /metrics)
         
         # 메모리 캐시
         self._members_cache: Dict[str, Dict] = {}  # {member_id: member_data}
@@ -56,8 +91,17 @@ class LocalCache:
         self._device_registry: Dict[str, Dict] = {} # {device_uuid: registry_data}
         self._voucher_products_cache: Dict[str, Dict] = {}  # {product_id: voucher_product}
         self._subscription_products_cache: Dict[str, Dict] = {}  # {product_id: subscription_product}
+        self._nfc_member_cache: Dict[str, Dict] = {}  # {nfc_uid: 복제된 회원/락카 정보}
+        
+        # 카탈로그 버전 (상품/기기 상태/락카 변경 시 증가 → 응답 캐시/ETag 무효화)
+        # 시작 시각(ms)에서 시작하므로 재시작 후에도 이전 값보다 큼
+        self._catalog_version = int(time.time() * 1000)
         
         self._connect()
+        self._ensure_sync_tables()
+        self._ensure_rollup_tables()
+        self._ensure_event_indexes()
+        self._ensure_locker_replication_tables()
         self._load_cache()
     
     def _connect(self):
@@ -65,6 +109,193 @@ class LocalCache:
         self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
         self.conn.row_factory = sqlite3.Row  # 딕셔너리 형태로 결과 반환
     
+    def _ensure_sync_tables(self):
+        """동기화 커서 테이블 생성 (기존 DB 마이그레이션 포함)"""
+        with self.lock:
+            cursor = self.conn.cursor()
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS sync_cursors (
+                    table_name TEXT PRIMARY KEY,
+                    last_id INTEGER NOT NULL DEFAULT 0,
+                    pending_first_id INTEGER,
+                    pending_last_id INTEGER,
+                    sheet_end_row INTEGER,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            # 전송 중 배치 / 기존 업로드 구간 컬럼 추가 (기존 DB)
+            for column in ('pending_first_id', 'pending_last_id', 'sheet_end_row', 'legacy_synced_until'):
+                try:
+                    cursor.execute(f'ALTER TABLE sync_cursors ADD COLUMN {column} INTEGER')
+                except sqlite3.OperationalError:
+                    pass  # 이미 존재함
+            
+            # 업로드 판단은 커서로만 하므로 synced_to_sheets 인덱스는 제거
+            cursor.execute('DROP INDEX IF EXISTS idx_rental_logs_sync')
+            cursor.execute('DROP INDEX IF EXISTS idx_event_logs_sync')
+            
+            # 커서가 없는 테이블은 기존 synced_to_sheets 플래그에서 시작 위치 계산
+            # - last_id: 가장 오래된 미동기화 행 직전 (없으면 마지막 행)
+            # - legacy_synced_until: 그 위에서 이미 업로드된(플래그 1) 마지막 id
+            #   예전 업로드는 최신순(DESC)이라 미동기화 행 위에도 시트에 들어간 행이 있음
+            #   → 커서가 이 id를 지날 때까지 플래그 1인 행은 건너뜀
+            for table in self.OUTBOX_TABLES:
+                cursor.execute('SELECT 1 FROM sync_cursors WHERE table_name = ?', (table,))
+                if cursor.fetchone():
+                    continue
+                
+                legacy_synced_until = None
+                try:
+                    cursor.execute(f'SELECT MIN(id) FROM {table} WHERE synced_to_sheets = 0')
+                    first_unsynced = cursor.fetchone()[0]
+                    if first_unsynced is not None:
+                        cursor.execute(f'SELECT MAX(id) FROM {table} WHERE synced_to_sheets = 1 AND id > ?',
+                                       (first_unsynced,))
+                        legacy_synced_until = cursor.fetchone()[0]
+                except sqlite3.OperationalError:
+                    first_unsynced = None
+                
+                try:
+                    if first_unsynced is not None:
+                        last_id = first_unsynced - 1
+                    else:
+                        cursor.execute(f'SELECT COALESCE(MAX(id), 0) FROM {table}')
+                        last_id = cursor.fetchone()[0]
+                except sqlite3.OperationalError:
+                    last_id = 0
+                
+                cursor.execute('''
+                    INSERT INTO sync_cursors (table_name, last_id, legacy_synced_until, updated_at)
+                    VALUES (?, ?, ?, ?)
+                ''', (table, last_id, legacy_synced_until, get_kst_now().isoformat()))
+            
+            self.conn.commit()
+    
+    def _ensure_rollup_tables(self):
+        """시간별 집계 테이블 생성 (비어 있으면 기존 로그에서 한 번 채움)"""
+        with self.lock:
+            cursor = self.conn.cursor()
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS rental_hourly (
+                    hour TEXT NOT NULL,
+                    product_id TEXT NOT NULL,
+                    device_uuid TEXT NOT NULL,
+                    payment_type TEXT NOT NULL,
+                    rentals INT NOT NULL DEFAULT 0,
+                    quantity INT NOT NULL DEFAULT 0,
+                    amount INT NOT NULL DEFAULT 0,
+                    PRIMARY KEY (hour, product_id, device_uuid, payment_type)
+                )
+            ''')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS event_hourly (
+                    hour TEXT NOT NULL,
+                    event_type TEXT NOT NULL,
+                    severity TEXT NOT NULL,
+                    device_uuid TEXT NOT NULL DEFAULT '',
+                    product_id TEXT NOT NULL DEFAULT '',
+                    count INT NOT NULL DEFAULT 0,
+                    PRIMARY KEY (hour, event_type, severity, device_uuid, product_id)
+                )
+            ''')
+            
+            # 집계 도입 전 로그 백필 (이후에는 기록 시 증분 갱신)
+            try:
+                cursor.execute('SELECT 1 FROM rental_hourly LIMIT 1')
+                if not cursor.fetchone():
+                    cursor.execute('''
+                        INSERT INTO rental_hourly
+                        (hour, product_id, device_uuid, payment_type, rentals, quantity, amount)
+                        SELECT REPLACE(SUBSTR(created_at, 1, 13), ' ', 'T'), product_id, device_uuid,
+                               payment_type, COUNT(*), COALESCE(SUM(quantity), 0), COALESCE(SUM(amount), 0)
+                        FROM rental_logs
+                        GROUP BY 1, 2, 3, 4
+                    ''')
+            except sqlite3.OperationalError:
+                pass  # rental_logs 없음
+            
+            try:
+                cursor.execute('SELECT 1 FROM event_hourly LIMIT 1')
+                if not cursor.fetchone():
+                    cursor.execute('''
+                        INSERT INTO event_hourly
+                        (hour, event_type, severity, device_uuid, product_id, count)
+                        SELECT REPLACE(SUBSTR(created_at, 1, 13), ' ', 'T'), event_type,
+                               COALESCE(severity, 'info'), COALESCE(device_uuid, ''),
+                               COALESCE(product_id, ''), COUNT(*)
+                        FROM event_logs
+                        GROUP BY 1, 2, 3, 4, 5
+                    ''')
+            except sqlite3.OperationalError:
+                pass  # event_logs 없음
+            
+            self.conn.commit()
+    
+    def _ensure_event_indexes(self):
+        """이벤트 조회용 복합 인덱스 생성 (기존 DB 마이그레이션)"""
+        with self.lock:
+            cursor = self.conn.cursor()
+            for statement in (
+                'CREATE INDEX IF NOT EXISTS idx_mqtt_events_device_created ON mqtt_events(device_id, created_at)',
+                'CREATE INDEX IF NOT EXISTS idx_mqtt_events_type_created ON mqtt_events(event_type, created_at)',
+                'CREATE INDEX IF NOT EXISTS idx_event_logs_device_created ON event_logs(device_uuid, created_at)',
+                'CREATE INDEX IF NOT EXISTS idx_event_logs_type_created ON event_logs(event_type, created_at)',
+            ):
+                try:
+                    cursor.execute(statement)
+                except sqlite3.OperationalError:
+                    pass  # 테이블 없음
+            self.conn.commit()
+    
+    def _ensure_locker_replication_tables(self):
+        """락카 배정 복제 테이블 생성 (기존 배정은 변경 이력으로 한 번 옮김)"""
+        with self.lock:
+            cursor = self.conn.cursor()
+            cursor.executescript('''
+                CREATE TABLE IF NOT EXISTS locker_changes (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    action TEXT NOT NULL,
+                    locker_number INT NOT NULL,
+                    member_id TEXT,
+                    nfc_uid TEXT,
+                    changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+                CREATE TABLE IF NOT EXISTS nfc_member_map (
+                    nfc_uid TEXT PRIMARY KEY,
+                    member_id TEXT NOT NULL,
+                    name TEXT,
+                    locker_number INT,
+                    assigned_at TIMESTAMP,
+                    seq INTEGER
+                );
+                CREATE TABLE IF NOT EXISTS replication_cursors (
+                    source TEXT PRIMARY KEY,
+                    last_seq INTEGER NOT NULL DEFAULT 0,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+                CREATE INDEX IF NOT EXISTS idx_nfc_member_map_locker ON nfc_member_map(locker_number);
+            ''')
+            
+            try:
+                cursor.execute('ALTER TABLE locker_mapping ADD COLUMN nfc_uid TEXT')
+            except sqlite3.OperationalError:
+                pass  # 이미 존재함 (또는 테이블 없음)
+            
+            # 이력이 비어 있으면 현재 배정을 assign 변경으로 기록 (since=0 복제본이 전체를 받도록)
+            try:
+                cursor.execute('SELECT 1 FROM locker_changes LIMIT 1')
+                if cursor.fetchone() is None:
+                    cursor.execute('''
+                        INSERT INTO locker_changes (action, locker_number, member_id, nfc_uid, changed_at)
+                        SELECT 'assign', locker_number, member_id, nfc_uid, assigned_at
+                        FROM locker_mapping ORDER BY assigned_at
+                    ''')
+            except sqlite3.OperationalError:
+                pass  # locker_mapping 없음
+            
+            self.conn.commit()
+    
     def _load_cache(self):
         """데이터베이스에서 메모리 캐시로 로드"""
         with self.lock:
@@ -86,6 +317,14 @@ class LocalCache:
             except sqlite3.OperationalError:
                 pass
             
+            # NFC UID 복제본 로드
+            try:
+                cursor.execute('SELECT * FROM nfc_member_map')
+                for row in cursor.fetchall():
+                    self._nfc_member_cache[row['nfc_uid']] = dict(row)
+            except sqlite3.OperationalError:
+                pass
+            
             # 상품 정보 로드
             try:
                 cursor.execute('SELECT * FROM products WHERE enabled = 1')
@@ -132,12 +371,39 @@ class LocalCache:
             except sqlite3.OperationalError:
                 pass
             
-            print(f"[LocalCache] 캐시 로드 완료:")
-            print(f"  - 회원: {len(self._members_cache)}명")
-            print(f"  - 상품: {len(self._products_cache)}개")
-            print(f"  - 금액권 상품: {len(self._voucher_products_cache)}개")
-            print(f"  - 구독 상품: {len(self._subscription_products_cache)}개")
-            print(f"  - 기기: {len(self._device_registry)}개")
+            logger.info(
+                "[LocalCache] 캐시 로드 완료: 회원 %d명, 상품 %d개, 금액권 상품 %d개, 구독 상품 %d개, 기기 %d개",
+                len(self._members_cache), len(self._products_cache), len(self._voucher_products_cache),
+                len(self._subscription_products_cache), len(self._device_registry)
+            )
+    
+    # =============================
+    # 카탈로그 버전
+    # =============================
+    
+    # 카탈로그 응답(/api/products, /api/inventory, /api/locker/list)에 보이는 기기 상태 필드
+    CATALOG_DEVICE_FIELDS = ('stock', 'locked', 'size')
+    
+    @property
+    def catalog_version(self) -> int:
+        """현재 카탈로그 버전"""
+        return self._catalog_version
+    
+    def _bump_catalog_version(self):
+        """카탈로그 버전 증가 (self.lock 안에서 호출)"""
+        self._catalog_version += 1
+    
+    def _affects_catalog(self, device: Dict, changes: Dict) -> bool:
+        """기기 상태 변경이 카탈로그 응답을 바꾸는지 (재고/잠금 값 변경, 오프라인→온라인 전환)"""
+        for key in self.CATALOG_DEVICE_FIELDS:
+            if key in changes and changes[key] != device.get(key):
+                return True
+        
+        if changes.get('last_heartbeat'):
+            # 온라인 → 오프라인은 시간 경과로 일어나므로 응답 캐시 만료 시각으로 처리
+            from app.services.device_state import is_device_online
+            return not is_device_online(device.get('last_heartbeat'))
+        return False
     
     # =============================
     # 회원 관련
@@ -180,7 +446,7 @@ class LocalCache:
             if row:
                 member = dict(row)
                 self._members_cache[member['member_id']] = member  # 캐시에 추가
-                print(f"[LocalCache] DB에서 회원 로드: {member['member_id']} - {member['name']}")
+                logger.debug("[LocalCache] DB에서 회원 로드: %s - %s", member['member_id'], member['name'])
                 return member
         return None
     
@@ -345,7 +611,7 @@ class LocalCache:
                 self.create_voucher(member_id, product['bonus_product_id'], 
                                    parent_voucher_id=voucher_id)
             
-            print(f"[LocalCache] 금액권 생성: #{voucher_id} ({product['name']}) - {member_id}")
+            logger.info(f"[LocalCache] 금액권 생성: #{voucher_id} ({product['name']}) - {member_id}")
             
             return voucher_id
     
@@ -429,7 +695,7 @@ class LocalCache:
                 WHERE voucher_id = ?
             ''', (valid_from, valid_until, now.isoformat(), bonus['voucher_id']))
             
-            print(f"[LocalCache] 보너스 활성화: #{bonus['voucher_id']}")
+            logger.info(f"[LocalCache] 보너스 활성화: #{bonus['voucher_id']}")
         
         self.conn.commit()
     
@@ -562,7 +828,7 @@ class LocalCache:
             subscription_id = cursor.lastrowid
             self.conn.commit()
             
-            print(f"[LocalCache] 구독권 생성: #{subscription_id} ({product['name']}) - {member_id}")
+            logger.info(f"[LocalCache] 구독권 생성: #{subscription_id} ({product['name']}) - {member_id}")
             
             return subscription_id
     
@@ -648,23 +914,26 @@ class LocalCache:
     # 락카 매핑
     # =============================
     
-    def assign_locker(self, locker_number: int, member_id: str) -> bool:
-        """락카 배정"""
+    def assign_locker(self, locker_number: int, member_id: str, nfc_uid: str = None) -> bool:
+        """락카 배정 (변경 이력 기록 - 운동복 대여기 복제용)"""
         with self.lock:
             if member_id not in self._members_cache:
                 raise ValueError(f"회원을 찾을 수 없습니다: {member_id}")
             
             self._locker_cache[locker_number] = member_id
+            now = get_kst_now().isoformat()
             
             cursor = self.conn.cursor()
             cursor.execute('''
                 INSERT OR REPLACE INTO locker_mapping 
-                (locker_number, member_id, assigned_at)
-                VALUES (?, ?, ?)
-            ''', (locker_number, member_id, get_kst_now().isoformat()))
+                (locker_number, member_id, nfc_uid, assigned_at)
+                VALUES (?, ?, ?, ?)
+            ''', (locker_number, member_id, nfc_uid, now))
+            self._record_locker_change(cursor, 'assign', locker_number, member_id, nfc_uid, now)
             
             self.conn.commit()
-            print(f"[LocalCache] 락카 배정: {locker_number}번 → {member_id}")
+            self._bump_catalog_version()
+            logger.info(f"[LocalCache] 락카 배정: {locker_number}번 → {member_id}")
             
             return True
     
@@ -673,16 +942,23 @@ class LocalCache:
         return self._locker_cache.get(locker_number)
     
     def release_locker(self, locker_number: int) -> bool:
-        """락카 해제"""
+        """락카 해제 (변경 이력 기록)"""
         with self.lock:
             if locker_number not in self._locker_cache:
                 return False
             
-            del self._locker_cache[locker_number]
+            member_id = self._locker_cache.pop(locker_number)
             
             cursor = self.conn.cursor()
+            cursor.execute('SELECT nfc_uid FROM locker_mapping WHERE locker_number = ?', (locker_number,))
+            row = cursor.fetchone()
+            nfc_uid = row['nfc_uid'] if row else None
+            
             cursor.execute('DELETE FROM locker_mapping WHERE locker_number = ?', (locker_number,))
+            self._record_locker_change(cursor, 'release', locker_number, member_id, nfc_uid,
+                                       get_kst_now().isoformat())
             self.conn.commit()
+            self._bump_catalog_version()
             
             return True
     
@@ -706,6 +982,168 @@ class LocalCache:
     def get_all_lockers(self) -> Dict[int, str]:
         """모든 배정된 락카 목록 조회"""
         return dict(self._locker_cache)
+
+    # =============================
+    # 락카 배정 복제
+    # =============================
+    
+    def _record_locker_change(self, cursor, action: str, locker_number: int, member_id: str,
+                              nfc_uid: Optional[str], changed_at: str):
+        """변경 이력 추가 + 보관 개수 초과분 삭제 (self.lock 안에서 호출, 커밋 안 함)"""
+        cursor.execute('''
+            INSERT INTO locker_changes (action, locker_number, member_id, nfc_uid, changed_at)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (action, locker_number, member_id, nfc_uid, changed_at))
+        cursor.execute('DELETE FROM locker_changes WHERE seq <= ?',
+                       (cursor.lastrowid - self.LOCKER_CHANGES_KEEP,))
+    
+    def _locker_change_dict(self, row) -> Dict:
+        """변경 이력 행 → 응답 dict (회원 이름 포함)"""
+        member = self._members_cache.get(row['member_id']) if row['member_id'] else None
+        return {
+            'seq': row['seq'],
+            'action': row['action'],
+            'locker_number': row['locker_number'],
+            'member_id': row['member_id'],
+            'nfc_uid': row['nfc_uid'],
+            'name': member.get('name', '') if member else '',
+            'changed_at': row['changed_at'],
+        }
+    
+    def get_locker_changes(self, since: int = 0, limit: int = 500) -> Dict:
+        """
+        since 이후 락카 배정 변경분 조회 (락카키 대여기 측)
+        
+        Args:
+            since: 복제본이 마지막으로 반영한 seq
+            limit: 최대 변경 수 (LOCKER_CHANGES_PAGE_MAX 이하)
+        
+        Returns:
+            {'changes': [...], 'last_seq': 마지막 seq, 'has_more': bool, 'reset': bool}
+            reset=True면 since 이후 이력 일부가 잘렸거나(또는 이력이 since보다 뒤처짐 - DB 재생성)
+            현재 배정 전체를 assign으로 보냄 (복제본은 기존 데이터를 비우고 적용)
+        """
+        limit = max(1, min(int(limit), self.LOCKER_CHANGES_PAGE_MAX))
+        
+        with self.lock:
+            cursor = self.conn.cursor()
+            cursor.execute('SELECT MIN(seq), MAX(seq) FROM locker_changes')
+            min_seq, max_seq = cursor.fetchone()
+            max_seq = max_seq or 0
+            
+            if (min_seq is not None and since < min_seq - 1) or since > max_seq:
+                cursor.execute('''
+                    SELECT ? AS seq, 'assign' AS action, locker_number, member_id, nfc_uid,
+                           assigned_at AS changed_at
+                    FROM locker_mapping ORDER BY locker_number
+                ''', (max_seq,))
+                changes = [self._locker_change_dict(row) for row in cursor.fetchall()]
+                return {'changes': changes, 'last_seq': max_seq, 'has_more': False, 'reset': True}
+            
+            cursor.execute('''
+                SELECT * FROM locker_changes WHERE seq > ? ORDER BY seq LIMIT ?
+            ''', (since, limit + 1))
+            rows = cursor.fetchall()
+            has_more = len(rows) > limit
+            changes = [self._locker_change_dict(row) for row in rows[:limit]]
+        
+        last_seq = changes[-1]['seq'] if changes else since
+        return {'changes': changes, 'last_seq': last_seq, 'has_more': has_more, 'reset': False}
+    
+    def apply_locker_changes(self, changes: List[Dict], last_seq: int, reset: bool = False,
+                             source: str = 'locker') -> set:
+        """
+        락카 배정 변경분을 NFC UID 복제본에 반영 (운동복 대여기 측, 한 트랜잭션)
+        
+        - assign: 같은 락카의 이전 UID 제거 후 UID → 회원 저장 (UID 없으면 제거만)
+        - release: 해당 락카의 UID 제거
+        
+        Returns:
+            추가/변경/삭제된 NFC UID 집합 (조회 캐시 무효화용)
+        """
+        touched = set()
+        
+        with self.lock:
+            cursor = self.conn.cursor()
+            try:
+                if reset:
+                    touched.update(self._nfc_member_cache)
+                    cursor.execute('DELETE FROM nfc_member_map')
+                    self._nfc_member_cache.clear()
+                
+                for change in changes:
+                    locker_number = change.get('locker_number')
+                    
+                    cursor.execute('SELECT nfc_uid FROM nfc_member_map WHERE locker_number = ?',
+                                   (locker_number,))
+                    for row in cursor.fetchall():
+                        touched.add(row['nfc_uid'])
+                        self._nfc_member_cache.pop(row['nfc_uid'], None)
+                    cursor.execute('DELETE FROM nfc_member_map WHERE locker_number = ?', (locker_number,))
+                    
+                    nfc_uid = change.get('nfc_uid')
+                    if change.get('action') == 'assign' and nfc_uid and change.get('member_id'):
+                        entry = {
+                            'nfc_uid': nfc_uid,
+                            'member_id': change['member_id'],
+                            'name': change.get('name', ''),
+                            'locker_number': locker_number,
+                            'assigned_at': change.get('changed_at'),
+                            'seq': change.get('seq'),
+                        }
+                        cursor.execute('''
+                            INSERT OR REPLACE INTO nfc_member_map
+                            (nfc_uid, member_id, name, locker_number, assigned_at, seq)
+                            VALUES (:nfc_uid, :member_id, :name, :locker_number, :assigned_at, :seq)
+                        ''', entry)
+                        self._nfc_member_cache[nfc_uid] = entry
+                        touched.add(nfc_uid)
+                
+                cursor.execute('''
+                    INSERT INTO replication_cursors (source, last_seq, updated_at) VALUES (?, ?, ?)
+                    ON CONFLICT(source) DO UPDATE SET last_seq = excluded.last_seq,
+                                                      updated_at = excluded.updated_at
+                ''', (source, last_seq, get_kst_now().isoformat()))
+                self.conn.commit()
+            except Exception:
+                self.conn.rollback()
+                # 메모리 복제본을 DB 기준으로 되돌림
+                cursor.execute('SELECT * FROM nfc_member_map')
+                self._nfc_member_cache = {row['nfc_uid']: dict(row) for row in cursor.fetchall()}
+                raise
+        
+        return touched
+    
+    def get_replication_seq(self, source: str = 'locker') -> int:
+        """복제본이 마지막으로 반영한 seq (없으면 0)"""
+        with self.lock:
+            cursor = self.conn.cursor()
+            cursor.execute('SELECT last_seq FROM replication_cursors WHERE source = ?', (source,))
+            row = cursor.fetchone()
+            return row['last_seq'] if row else 0
+    
+    def get_replicated_member(self, nfc_uid: str) -> Optional[Dict]:
+        """
+        복제본에서 NFC UID로 회원 조회 (메모리, 네트워크 없음)
+        
+        Returns:
+            LockerAPIClient.get_member_by_nfc와 같은 형식 또는 None
+            (locker_number도 HTTP 응답처럼 문자열 - 복제본/HTTP 어느 쪽으로 조회해도 같은 값)
+        """
+        entry = self._nfc_member_cache.get(nfc_uid)
+        if entry is None:
+            return None
+        locker_number = entry.get('locker_number')
+        return {
+            'member_id': entry['member_id'],
+            'name': entry.get('name') or '',
+            'locker_number': str(locker_number) if locker_number is not None else '',
+            'assigned_at': entry.get('assigned_at') or ''
+        }
+    
+    def get_replica_size(self) -> int:
+        """복제된 NFC UID 수"""
+        return len(self._nfc_member_cache)
     
     # =============================
     # 상품 관련
@@ -739,6 +1177,7 @@ class LocalCache:
             ''', (stock, product['updated_at'], product_id))
             
             self.conn.commit()
+            self._bump_catalog_version()
             return True
     
     # =============================
@@ -789,7 +1228,7 @@ class LocalCache:
                     'first_seen_at': now, 'last_seen_at': now, 'updated_at': now
                 }
                 self._device_registry[device_uuid] = device_info
-                print(f"[LocalCache] ✅ 새 기기 등록: {device_uuid}")
+                logger.info(f"[LocalCache] ✅ 새 기기 등록: {device_uuid}")
             
             self.conn.commit()
             
@@ -805,6 +1244,7 @@ class LocalCache:
                               (product_id, device_uuid))
                 self.conn.commit()
             
+            self._bump_catalog_version()
             return device_info
     
     def _create_or_update_product(self, device_uuid: str, category: str, 
@@ -854,7 +1294,7 @@ class LocalCache:
                 'price': price, 'device_uuid': device_uuid,
                 'stock': stock, 'enabled': True, 'display_order': 0, 'updated_at': now
             }
-            print(f"[LocalCache] ✅ 새 상품 생성: {product_id} ({name})")
+            logger.info(f"[LocalCache] ✅ 새 상품 생성: {product_id} ({name})")
         
         self.conn.commit()
         return product_id
@@ -891,6 +1331,9 @@ class LocalCache:
                 }
                 self._device_cache[device_uuid] = device
             
+            if self._affects_catalog(device, kwargs):
+                self._bump_catalog_version()
+            
             for key, value in kwargs.items():
                 device[key] = value
             device['updated_at'] = get_kst_now().isoformat()
@@ -949,69 +1392,333 @@ class LocalCache:
         Returns:
             rental_id
         """
+        created_at = get_kst_now().isoformat()
+        
         with self.lock:
             cursor = self.conn.cursor()
             cursor.execute('''
                 INSERT INTO rental_logs 
                 (member_id, locker_number, product_id, product_name, device_uuid,
-                 quantity, payment_type, subscription_id, amount, created_at, synced_to_sheets)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0)
+                 quantity, payment_type, subscription_id, amount, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             ''', (member_id, locker_number, product_id, product_name, device_uuid,
-                  quantity, payment_type, subscription_id, amount, get_kst_now().isoformat()))
+                  quantity, payment_type, subscription_id, amount, created_at))
             
             rental_id = cursor.lastrowid
+            
+            # 시간별 집계 (같은 트랜잭션)
+            cursor.execute('''
+                INSERT INTO rental_hourly
+                (hour, product_id, device_uuid, payment_type, rentals, quantity, amount)
+                VALUES (?, ?, ?, ?, 1, ?, ?)
+                ON CONFLICT (hour, product_id, device_uuid, payment_type) DO UPDATE SET
+                    rentals = rentals + 1,
+                    quantity = quantity + excluded.quantity,
+                    amount = amount + excluded.amount
+            ''', (hour_bucket(created_at), product_id, device_uuid, payment_type,
+                  quantity or 0, amount or 0))
+            
             self.conn.commit()
             
             return rental_id
     
-    def get_unsynced_rentals(self) -> List[Dict]:
-        """동기화되지 않은 대여 로그 조회"""
+    def get_unsynced_rentals(self, limit: int = 500) -> List[Dict]:
+        """동기화되지 않은 대여 로그 조회 (커서 이후, id 오름차순)"""
+        return self.get_outbox_batch('rental_logs', limit)
+    
+    def mark_rentals_synced(self, rental_ids: List[int]):
+        """대여 로그를 동기화 완료로 표시 (커서 전진)"""
+        if rental_ids:
+            self.advance_sync_cursor('rental_logs', max(rental_ids))
+    
+    def get_unsynced_voucher_transactions(self, limit: int = 500) -> List[Dict]:
+        """동기화되지 않은 금액권 거래 조회 (커서 이후, id 오름차순)"""
+        return self.get_outbox_batch('voucher_transactions', limit)
+    
+    def mark_voucher_transactions_synced(self, transaction_ids: List[int]):
+        """금액권 거래를 동기화 완료로 표시 (커서 전진)"""
+        if transaction_ids:
+            self.advance_sync_cursor('voucher_transactions', max(transaction_ids))
+    
+    # =============================
+    # 시간별 집계 (Rollup)
+    # =============================
+    
+    def apply_event_rollups(self, records: List[Tuple]):
+        """
+        event_logs에 기록하는 이벤트를 event_hourly에 반영
+        
+        self.lock 안에서 event_logs INSERT와 같은 트랜잭션으로 호출 (commit은 호출자).
+        
+        Args:
+            records: (event_type, severity, device_uuid, member_id, product_id, details, created_at) 목록
+        """
+        counts: Dict[Tuple, int] = {}
+        for event_type, severity, device_uuid, _, product_id, _, created_at in records:
+            key = (hour_bucket(created_at), event_type, severity or 'info',
+                   device_uuid or '', product_id or '')
+            counts[key] = counts.get(key, 0) + 1
+        
+        self.conn.executemany('''
+            INSERT INTO event_hourly
+            (hour, event_type, severity, device_uuid, product_id, count)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (hour, event_type, severity, device_uuid, product_id) DO UPDATE SET
+                count = count + excluded.count
+        ''', [key + (count,) for key, count in counts.items()])
+    
+    def _query_rollup(self, table: str, allowed_groups: Tuple[str, ...], sums: str,
+                      start: str, end: str, group_by, filters: Dict) -> List[Dict]:
+        """시간별 집계 테이블 조회 공통 (start 포함, end 미포함)"""
+        if isinstance(group_by, str):
+            group_by = [g.strip() for g in group_by.split(',') if g.strip()]
+        group_by = list(group_by or [])
+        
+        invalid = [g for g in group_by if g not in allowed_groups]
+        if invalid:
+            raise ValueError(f"지원하지 않는 group_by: {', '.join(invalid)}")
+        
+        columns = ['SUBSTR(hour, 1, 10) AS day' if g == 'day' else g for g in group_by]
+        query = f'SELECT {", ".join(columns + [sums])} FROM {table} WHERE 1=1'
+        params = []
+        
+        if start:
+            query += ' AND hour >= ?'
+            params.append(hour_bucket(start))
+        if end:
+            query += ' AND hour < ?'
+            params.append(hour_bucket(end))
+        for column, value in filters.items():
+            if value is not None:
+                query += f' AND {column} = ?'
+                params.append(value)
+        
+        if group_by:
+            query += f' GROUP BY {", ".join(group_by)} ORDER BY {", ".join(group_by)}'
+        
         with self.lock:
             cursor = self.conn.cursor()
-            cursor.execute('''
-                SELECT * FROM rental_logs 
-                WHERE synced_to_sheets = 0 
-                ORDER BY created_at
-            ''')
+            cursor.execute(query, params)
             return [dict(row) for row in cursor.fetchall()]
     
-    def mark_rentals_synced(self, rental_ids: List[int]):
-        """대여 로그를 동기화 완료로 표시"""
-        if not rental_ids:
-            return
+    def get_rental_rollup(self, start: str = None, end: str = None,
+                          group_by=('hour',), product_id: str = None,
+                          device_uuid: str = None, payment_type: str = None) -> List[Dict]:
+        """
+        시간별 대여 집계 조회 (rental_logs 스캔 없이 시간 버킷 단위)
+        
+        Args:
+            start: 시작 시각 (포함, 'YYYY-MM-DD' 또는 ISO 형식)
+            end: 종료 시각 (미포함)
+            group_by: RENTAL_ROLLUP_GROUPS 중 컬럼 목록 또는 쉼표 구분 문자열 (비우면 전체 합계)
+            product_id, device_uuid, payment_type: 필터
+        
+        Returns:
+            [{...group_by 컬럼, 'rentals', 'quantity', 'amount'}]
+        """
+        return self._query_rollup(
+            'rental_hourly', self.RENTAL_ROLLUP_GROUPS,
+            'COALESCE(SUM(rentals), 0) AS rentals, COALESCE(SUM(quantity), 0) AS quantity, '
+            'COALESCE(SUM(amount), 0) AS amount',
+            start, end, group_by,
+            {'product_id': product_id, 'device_uuid': device_uuid, 'payment_type': payment_type}
+        )
+    
+    def get_event_rollup(self, start: str = None, end: str = None,
+                         group_by=('hour',), event_type: str = None,
+                         severity: str = None, device_uuid: str = None,
+                         product_id: str = None) -> List[Dict]:
+        """
+        시간별 이벤트 집계 조회 (예: 오늘 기기별 에러 수)
+        
+        Args:
+            start: 시작 시각 (포함, 'YYYY-MM-DD' 또는 ISO 형식)
+            end: 종료 시각 (미포함)
+            group_by: EVENT_ROLLUP_GROUPS 중 컬럼 목록 또는 쉼표 구분 문자열 (비우면 전체 합계)
+            event_type, severity, device_uuid, product_id: 필터
+        
+        Returns:
+            [{...group_by 컬럼, 'count'}]
+        """
+        return self._query_rollup(
+            'event_hourly', self.EVENT_ROLLUP_GROUPS,
+            'COALESCE(SUM(count), 0) AS count',
+            start, end, group_by,
+            {'event_type': event_type, 'severity': severity,
+             'device_uuid': device_uuid, 'product_id': product_id}
+        )
+    
+    # =============================
+    # 동기화 커서 (Outbox)
+    # =============================
+    
+    def get_sync_cursor(self, table: str) -> int:
+        """테이블의 마지막 업로드 id 조회"""
+        if table not in self.OUTBOX_TABLES:
+            raise ValueError(f"커서 대상 테이블이 아닙니다: {table}")
+        
+        with self.lock:
+            cursor = self.conn.cursor()
+            cursor.execute('SELECT last_id FROM sync_cursors WHERE table_name = ?', (table,))
+            row = cursor.fetchone()
+            return row['last_id'] if row else 0
+    
+    def get_outbox_batch(self, table: str, limit: int = 500) -> List[Dict]:
+        """
+        커서 이후의 미업로드 행을 id 오름차순으로 조회
+        
+        Args:
+            table: OUTBOX_TABLES 중 하나
+            limit: 한 페이지 최대 행 수
+        
+        Returns:
+            행 목록 (가장 오래된 것부터)
+        """
+        if table not in self.OUTBOX_TABLES:
+            raise ValueError(f"커서 대상 테이블이 아닙니다: {table}")
         
         with self.lock:
             cursor = self.conn.cursor()
-            placeholders = ', '.join(['?' for _ in rental_ids])
+            last_id, skip_sql, skip_params = self._outbox_range(cursor, table)
             cursor.execute(f'''
-                UPDATE rental_logs SET synced_to_sheets = 1 WHERE id IN ({placeholders})
-            ''', rental_ids)
+                SELECT * FROM {table}
+                WHERE id > ?{skip_sql}
+                ORDER BY id
+                LIMIT ?
+            ''', (last_id, *skip_params, limit))
+            return [dict(row) for row in cursor.fetchall()]
+    
+    def _outbox_range(self, cursor, table: str):
+        """
+        커서 위치와 기존 업로드 구간 제외 조건 (락 보유 중 호출)
+        
+        Returns:
+            (last_id, 추가 WHERE 절, 파라미터) - 커서가 legacy_synced_until을 지나면 조건 없음
+        """
+        cursor.execute('SELECT last_id, legacy_synced_until FROM sync_cursors WHERE table_name = ?', (table,))
+        row = cursor.fetchone()
+        if not row:
+            return 0, '', ()
+        if row['legacy_synced_until'] is None or row['legacy_synced_until'] <= row['last_id']:
+            return row['last_id'], '', ()
+        return row['last_id'], ' AND (id > ? OR synced_to_sheets = 0)', (row['legacy_synced_until'],)
+    
+    def advance_sync_cursor(self, table: str, last_id: int, sheet_end_row: int = None):
+        """
+        업로드 완료 위치까지 커서 전진 (뒤로 가지 않음), 전송 중 배치 해제
+        
+        Args:
+            table: OUTBOX_TABLES 중 하나
+            last_id: 업로드된 마지막 행 id
+            sheet_end_row: 업로드 후 시트의 마지막 데이터 행 번호 (모르면 None → 기존 값 유지)
+        """
+        if table not in self.OUTBOX_TABLES:
+            raise ValueError(f"커서 대상 테이블이 아닙니다: {table}")
+        
+        with self.lock:
+            cursor = self.conn.cursor()
+            cursor.execute('''
+                INSERT INTO sync_cursors (table_name, last_id, sheet_end_row, updated_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(table_name) DO UPDATE SET
+                    last_id = MAX(last_id, excluded.last_id),
+                    pending_first_id = NULL,
+                    pending_last_id = NULL,
+                    sheet_end_row = COALESCE(excluded.sheet_end_row, sheet_end_row),
+                    legacy_synced_until = CASE WHEN legacy_synced_until > MAX(last_id, excluded.last_id)
+                                               THEN legacy_synced_until END,
+                    updated_at = excluded.updated_at
+            ''', (table, last_id, sheet_end_row, get_kst_now().isoformat()))
             self.conn.commit()
     
-    def get_unsynced_voucher_transactions(self) -> List[Dict]:
-        """동기화되지 않은 금액권 거래 조회"""
+    def begin_outbox_batch(self, table: str, first_id: int, last_id: int, sheet_end_row: int = None):
+        """
+        전송 직전 배치 id 범위 기록
+        
+        append 응답 전에 중단되어도 다음 주기에 이 범위가 시트에 들어갔는지
+        시트 끝부분만 읽어 판단할 수 있음 (advance_sync_cursor에서 해제).
+        
+        Args:
+            sheet_end_row: 전송 직전 시트 마지막 데이터 행 번호 (None이면 기존 값 유지)
+        """
+        if table not in self.OUTBOX_TABLES:
+            raise ValueError(f"커서 대상 테이블이 아닙니다: {table}")
+        
         with self.lock:
             cursor = self.conn.cursor()
             cursor.execute('''
-                SELECT * FROM voucher_transactions 
-                WHERE synced_to_sheets = 0 
-                ORDER BY created_at
-            ''')
-            return [dict(row) for row in cursor.fetchall()]
+                INSERT INTO sync_cursors (table_name, last_id, pending_first_id, pending_last_id, sheet_end_row, updated_at)
+                VALUES (?, 0, ?, ?, ?, ?)
+                ON CONFLICT(table_name) DO UPDATE SET
+                    pending_first_id = excluded.pending_first_id,
+                    pending_last_id = excluded.pending_last_id,
+                    sheet_end_row = COALESCE(excluded.sheet_end_row, sheet_end_row),
+                    updated_at = excluded.updated_at
+            ''', (table, first_id, last_id, sheet_end_row, get_kst_now().isoformat()))
+            self.conn.commit()
     
-    def mark_voucher_transactions_synced(self, transaction_ids: List[int]):
-        """금액권 거래를 동기화 완료로 표시"""
-        if not transaction_ids:
-            return
+    def clear_outbox_batch(self, table: str, sheet_end_row: int = None):
+        """전송 중 배치 해제 (시트에 없음 확인 → 다음 페이지에서 재전송)"""
+        if table not in self.OUTBOX_TABLES:
+            raise ValueError(f"커서 대상 테이블이 아닙니다: {table}")
         
         with self.lock:
             cursor = self.conn.cursor()
-            placeholders = ', '.join(['?' for _ in transaction_ids])
-            cursor.execute(f'''
-                UPDATE voucher_transactions SET synced_to_sheets = 1 WHERE id IN ({placeholders})
-            ''', transaction_ids)
+            cursor.execute('''
+                UPDATE sync_cursors
+                SET pending_first_id = NULL, pending_last_id = NULL,
+                    sheet_end_row = COALESCE(?, sheet_end_row), updated_at = ?
+                WHERE table_name = ?
+            ''', (sheet_end_row, get_kst_now().isoformat(), table))
             self.conn.commit()
     
+    def get_outbox_state(self, table: str) -> Dict:
+        """
+        커서/전송 중 배치 상태 조회
+        
+        Returns:
+            {'last_id', 'pending_first_id', 'pending_last_id', 'sheet_end_row'}
+        """
+        if table not in self.OUTBOX_TABLES:
+            raise ValueError(f"커서 대상 테이블이 아닙니다: {table}")
+        
+        with self.lock:
+            cursor = self.conn.cursor()
+            cursor.execute('''
+                SELECT last_id, pending_first_id, pending_last_id, sheet_end_row
+                FROM sync_cursors WHERE table_name = ?
+            ''', (table,))
+            row = cursor.fetchone()
+            if not row:
+                return {'last_id': 0, 'pending_first_id': None, 'pending_last_id': None, 'sheet_end_row': None}
+            return dict(row)
+    
+    def get_outbox_backlog(self, table: str) -> Dict:
+        """
+        커서 이후 미업로드 현황 조회
+        
+        Returns:
+            {'last_id': 커서 위치, 'unsynced': 미업로드 행 수,
+             'oldest_unsynced_at': 가장 오래된 미업로드 행 created_at (없으면 None)}
+        """
+        if table not in self.OUTBOX_TABLES:
+            raise ValueError(f"커서 대상 테이블이 아닙니다: {table}")
+        
+        with self.lock:
+            cursor = self.conn.cursor()
+            last_id, skip_sql, skip_params = self._outbox_range(cursor, table)
+            
+            cursor.execute(f'SELECT COUNT(*) FROM {table} WHERE id > ?{skip_sql}', (last_id, *skip_params))
+            unsynced = cursor.fetchone()[0]
+            
+            oldest = None
+            if unsynced:
+                cursor.execute(f'SELECT created_at FROM {table} WHERE id > ?{skip_sql} ORDER BY id LIMIT 1',
+                               (last_id, *skip_params))
+                oldest = cursor.fetchone()[0]
+            
+            return {'last_id': last_id, 'unsynced': unsynced, 'oldest_unsynced_at': oldest}
+    
     # =============================
     # MQTT 이벤트 로깅
     # =============================
@@ -1030,30 +1737,115 @@ class LocalCache:
             return event_id
     
     def get_recent_events(self, device_id: str = None, limit: int = 50) -> List[Dict]:
-        """최근 MQTT 이벤트 조회"""
+        """최근 MQTT 이벤트 조회 (payload 디코딩 포함)"""
+        page = self.query_events('mqtt', device_id=device_id, limit=limit)
+        return [self.decode_event_payload(event) for event in page['events']]
+    
+    # =============================
+    # 이벤트 조회 (키셋 페이지네이션)
+    # =============================
+    
+    @staticmethod
+    def encode_event_cursor(created_at: str, event_id: int) -> str:
+        """다음 페이지 커서 (마지막 행의 created_at, id → URL 안전 문자열)"""
+        raw = json.dumps([created_at, event_id]).encode('utf-8')
+        return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+    
+    @staticmethod
+    def decode_event_cursor(cursor: str) -> Tuple[str, int]:
+        """encode_event_cursor의 역변환 (형식이 잘못되면 ValueError)"""
+        try:
+            raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            created_at, event_id = json.loads(raw)
+            return str(created_at), int(event_id)
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"잘못된 커서: {cursor}") from e
+    
+    @staticmethod
+    def decode_event_payload(event: Dict) -> Dict:
+        """query_events 결과 행의 payload/details JSON 문자열을 dict로 변환 (제자리)"""
+        for key in ('payload', 'details'):
+            value = event.get(key)
+            if isinstance(value, str):
+                try:
+                    event[key] = json.loads(value)
+                except ValueError:
+                    pass  # JSON이 아니면 문자열 그대로
+        return event
+    
+    def query_events(self, source: str = 'mqtt', device_id: str = None,
+                     event_type: str = None, severity: str = None,
+                     start: str = None, end: str = None, cursor: str = None,
+                     limit: int = 50, include_payload: bool = True) -> Dict:
+        """
+        이벤트 조회 (최신순, 키셋 페이지네이션)
+        
+        (created_at, id) 내림차순으로 정렬하고 다음 페이지는 마지막 행 이후부터 조회
+        → 페이지 깊이와 관계없이 (기기|타입, created_at) 인덱스 구간만 읽음.
+        payload는 JSON 문자열 그대로 반환 (필요한 행만 decode_event_payload로 변환).
+        
+        Args:
+            source: 'mqtt' (mqtt_events) 또는 'business' (event_logs)
+            device_id: 기기 ID/UUID 필터
+            event_type: 이벤트 타입 필터
+            severity: 심각도 필터 ('business'만 지원)
+            start: 시작 시각 (포함, 'YYYY-MM-DD' 또는 ISO 형식)
+            end: 종료 시각 (미포함)
+            cursor: 이전 페이지의 next_cursor
+            limit: 페이지 크기 (최대 EVENT_PAGE_MAX)
+            include_payload: False면 payload/details 컬럼을 읽지 않음
+        
+        Returns:
+            {'events': [...], 'next_cursor': 다음 페이지 커서 (마지막 페이지면 None)}
+        """
+        spec = self.EVENT_SOURCES.get(source)
+        if spec is None:
+            raise ValueError(f"지원하지 않는 이벤트 소스: {source}")
+        if severity and 'severity' not in spec['columns']:
+            raise ValueError(f"severity 필터는 {source} 이벤트에서 지원하지 않습니다")
+        
+        limit = max(1, min(int(limit), self.EVENT_PAGE_MAX))
+        columns = list(spec['columns'])
+        if include_payload:
+            columns.append(spec['payload'])
+        
+        query = f'SELECT {", ".join(columns)} FROM {spec["table"]} WHERE 1=1'
+        params = []
+        
+        if device_id:
+            query += f' AND {spec["device"]} = ?'
+            params.append(device_id)
+        if event_type:
+            query += ' AND event_type = ?'
+            params.append(event_type)
+        if severity:
+            query += ' AND severity = ?'
+            params.append(severity)
+        if start:
+            query += ' AND created_at >= ?'
+            params.append(str(start))
+        if end:
+            query += ' AND created_at < ?'
+            params.append(str(end))
+        if cursor:
+            query += ' AND (created_at, id) < (?, ?)'
+            params.extend(self.decode_event_cursor(cursor))
+        
+        query += ' ORDER BY created_at DESC, id DESC LIMIT ?'
+        params.append(limit + 1)  # 다음 페이지 존재 여부 확인용 1행 추가
+        
         with self.lock:
-            cursor = self.conn.cursor()
-            
-            if device_id:
-                cursor.execute('''
-                    SELECT * FROM mqtt_events 
-                    WHERE device_id = ?
-                    ORDER BY created_at DESC LIMIT ?
-                ''', (device_id, limit))
-            else:
-                cursor.execute('''
-                    SELECT * FROM mqtt_events 
-                    ORDER BY created_at DESC LIMIT ?
-                ''', (limit,))
-            
-            results = []
-            for row in cursor.fetchall():
-                event = dict(row)
-                if event.get('payload'):
-                    event['payload'] = json.loads(event['payload'])
-                results.append(event)
-            
-            return results
+            cur = self.conn.cursor()
+            cur.execute(query, params)
+            events = [dict(row) for row in cur.fetchall()]
+        
+        next_cursor = None
+        if len(events) > limit:
+            events = events[:limit]
+            last = events[-1]
+            next_cursor = self.encode_event_cursor(last['created_at'], last['id'])
+        
+        return {'events': events, 'next_cursor': next_cursor}
     
     # =============================
     # 동기화
@@ -1067,7 +1859,8 @@ class LocalCache:
             cursor.execute('SELECT * FROM members')
             for row in cursor.fetchall():
                 self._members_cache[row['member_id']] = dict(row)
-            print(f"[LocalCache] 회원 정보 재로드: {len(self._members_cache)}명")
+            self._bump_catalog_version()  # 락카 목록의 회원 이름
+            logger.info(f"[LocalCache] 회원 정보 재로드: {len(self._members_cache)}명")
     
     def reload_products(self):
         """상품 정보 재로드"""
@@ -1077,7 +1870,8 @@ class LocalCache:
             cursor.execute('SELECT * FROM products WHERE enabled = 1')
             for row in cursor.fetchall():
                 self._products_cache[row['product_id']] = dict(row)
-            print(f"[LocalCache] 상품 정보 재로드: {len(self._products_cache)}개")
+            self._bump_catalog_version()
+            logger.info(f"[LocalCache] 상품 정보 재로드: {len(self._products_cache)}개")
     
     def reload_voucher_products(self):
         """금액권 상품 재로드"""
@@ -1087,7 +1881,7 @@ class LocalCache:
             cursor.execute('SELECT * FROM voucher_products WHERE enabled = 1')
             for row in cursor.fetchall():
                 self._voucher_products_cache[row['product_id']] = dict(row)
-            print(f"[LocalCache] 금액권 상품 재로드: {len(self._voucher_products_cache)}개")
+            logger.info(f"[LocalCache] 금액권 상품 재로드: {len(self._voucher_products_cache)}개")
     
     def reload_subscription_products(self):
         """구독 상품 재로드"""
@@ -1100,7 +1894,7 @@ class LocalCache:
                 if product.get('daily_limits'):
                     product['daily_limits'] = json.loads(product['daily_limits'])
                 self._subscription_products_cache[row['product_id']] = product
-            print(f"[LocalCache] 구독 상품 재로드: {len(self._subscription_products_cache)}개")
+            logger.info(f"[LocalCache] 구독 상품 재로드: {len(self._subscription_products_cache)}개")
     
     # =============================
     # 유틸리티
@@ -1110,7 +1904,7 @@ class LocalCache:
         """데이터베이스 연결 종료"""
         if self.conn:
             self.conn.close()
-            print("[LocalCache] 데이터베이스 연결 종료")
+            logger.info("[LocalCache] 데이터베이스 연결 종료")
     
     def __enter__(self):
         return self
@@ -0,0 +1,156 @@
+"""
+락 경합 프로파일러
+
+TimedLock(LocalCache.lock)을 잡는 호출 위치(함수 이름)별로 획득 대기/점유 시간을 모아
+interval마다 상위 top_n개를 로그로 남김
+- TimedLock은 누적 합계만 가짐 (/metrics counter) → 보고서는 직전 보고 시점 값과의 차이로 계산
+- 실행 중 켜고 끄기 가능 (POST /metrics/locks, 시작 시 LOCK_PROFILE=1)
+- 꺼져 있을 때는 보고 스레드도 없고 락 비용도 거의 없음
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class LockProfiler:
+    """TimedLock 호출 위치별 대기/점유 시간 주기 보고"""
+    
+    SORT_KEYS = ('hold_total', 'wait_total', 'count', 'hold_max', 'wait_max')
+    
+    def __init__(self, lock, interval: float = 60.0, top_n: int = 10):
+        """
+        초기화
+        
+        Args:
+            lock: TimedLock 인스턴스
+            interval: 보고 주기 (초)
+            top_n: 보고할 호출 위치 수 (점유 시간 합계 순)
+        """
+        self.lock = lock
+        self.interval = interval
+        self.top_n = top_n
+        
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        
+        # 보고 구간 시작 시점의 누적 값 {site: (횟수, 대기 합, 점유 합)}
+        self._baseline: Dict[str, Tuple[int, float, float]] = {}
+        self._window_started = time.monotonic()
+    
+    @property
+    def enabled(self) -> bool:
+        """기록 중 여부"""
+        return self.lock.profiling
+    
+    def enable(self):
+        """기록 시작 + 주기 보고 스레드 시작"""
+        if self.enabled:
+            return
+        self._start_window(self.lock.profile_snapshot(reset_max=True))
+        self.lock.set_profiling(True)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, daemon=True, name='lock-profiler')
+        self._thread.start()
+        logger.info(f"[LockProfiler] {self.lock.name} 기록 시작 (보고 주기 {self.interval:.0f}초, 상위 {self.top_n}개)")
+    
+    def disable(self):
+        """기록 중지 (남은 기록은 마지막으로 보고)"""
+        if not self.enabled:
+            return
+        self.lock.set_profiling(False)
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=2.0)
+        self.log_report()
+        logger.info(f"[LockProfiler] {self.lock.name} 기록 중지")
+    
+    def _start_window(self, sites: Dict[str, Dict]):
+        """보고 구간 시작 (현재 누적 값을 기준으로)"""
+        self._baseline = {site: (entry['count'], entry['wait_total'], entry['hold_total'])
+                          for site, entry in sites.items()}
+        self._window_started = time.monotonic()
+    
+    def report(self, top_n: int = None, sort: str = 'hold_total', reset: bool = False) -> Dict:
+        """
+        호출 위치별 기록 (마지막 보고 이후 구간, 상위 top_n개)
+        
+        Args:
+            top_n: 개수 (None이면 self.top_n, 0이면 전체)
+            sort: 정렬 기준 (SORT_KEYS)
+            reset: 이 시점부터 새 보고 구간 시작 (TimedLock 누적 합계는 그대로)
+        
+        Returns:
+            {'lock', 'enabled', 'window_seconds', 'total_hold_ms', 'total_wait_ms',
+             'sites': [{'site', 'count', 'hold_total_ms', 'hold_avg_ms', 'hold_max_ms',
+                        'wait_total_ms', 'wait_max_ms'}, ...]}
+        """
+        if sort not in self.SORT_KEYS:
+            sort = 'hold_total'
+        window = time.monotonic() - self._window_started
+        totals = self.lock.profile_snapshot(reset_max=reset)
+        
+        sites = {}
+        for site, entry in totals.items():
+            count, wait_total, hold_total = self._baseline.get(site, (0, 0.0, 0.0))
+            if entry['count'] > count:
+                sites[site] = dict(entry, count=entry['count'] - count,
+                                   wait_total=entry['wait_total'] - wait_total,
+                                   hold_total=entry['hold_total'] - hold_total)
+        if reset:
+            self._start_window(totals)
+        
+        ranked = sorted(sites.items(), key=lambda item: item[1][sort], reverse=True)
+        limit = self.top_n if top_n is None else top_n
+        if limit:
+            ranked = ranked[:limit]
+        
+        return {
+            'lock': self.lock.name,
+            'enabled': self.enabled,
+            'window_seconds': round(window, 1),
+            'total_hold_ms': round(sum(s['hold_total'] for s in sites.values()) * 1000, 2),
+            'total_wait_ms': round(sum(s['wait_total'] for s in sites.values()) * 1000, 2),
+            'sites': [self._format_site(site, entry) for site, entry in ranked]
+        }
+    
+    @staticmethod
+    def _format_site(site: str, entry: Dict) -> Dict:
+        """초 → ms 변환"""
+        count = entry['count'] or 1
+        return {
+            'site': site,
+            'count': entry['count'],
+            'hold_total_ms': round(entry['hold_total'] * 1000, 2),
+            'hold_avg_ms': round(entry['hold_total'] / count * 1000, 3),
+            'hold_max_ms': round(entry['hold_max'] * 1000, 2),
+            'wait_total_ms': round(entry['wait_total'] * 1000, 2),
+            'wait_max_ms': round(entry['wait_max'] * 1000, 2),
+        }
+    
+    def log_report(self, reset: bool = True) -> Dict:
+        """보고서를 로그로 남김 (기록이 없으면 생략)"""
+        result = self.report(reset=reset)
+        sites: List[Dict] = result['sites']
+        if not sites:
+            return result
+        
+        logger.info(f"[LockProfiler] {result['lock']} 상위 {len(sites)}개 ({result['window_seconds']:.0f}초, "
+                    f"점유 {result['total_hold_ms']:.1f}ms, 대기 {result['total_wait_ms']:.1f}ms)")
+        for rank, site in enumerate(sites, 1):
+            logger.info(f"[LockProfiler]  {rank:2d}. {site['site']}: {site['count']}회, "
+                        f"점유 {site['hold_total_ms']:.1f}ms (평균 {site['hold_avg_ms']:.2f}, "
+                        f"최대 {site['hold_max_ms']:.1f}), 대기 {site['wait_total_ms']:.1f}ms "
+                        f"(최대 {site['wait_max_ms']:.1f})")
+        return result
+    
+    def _loop(self):
+        """interval마다 보고 후 새 구간 시작"""
+        while not self._stop.wait(self.interval):
+            try:
+                self.log_report()
+            except Exception as e:
+                logger.warning(f"[LockProfiler] 보고 실패: {e}")
@@ -1,35 +1,240 @@
 """
 락카키 대여기 API 클라이언트
 NFC UID로 회원 정보 조회
+
+UID → 회원 조회 결과는 TTL + LRU 캐시에 보관
+- 조회 성공: member_ttl 동안 네트워크 없이 응답
+- 락카 미배정(404): negative_ttl 동안 짧게 보관 (연속 태그 시 재조회 방지)
+- 성공 결과가 만료돼도 stale_ttl 안이면 이전 값을 바로 주고 백그라운드에서 갱신
+  (미배정 결과는 방금 배정됐을 수 있으므로 만료 후 재사용하지 않음)
+- 타임아웃/연결 실패는 캐시하지 않음
+
+연속 실패(타임아웃/연결 실패/5xx)가 breaker_threshold번이면 서킷 브레이커가 열림
+- 열린 동안 HTTP 조회 없이 즉시 None (태그마다 연결 타임아웃을 기다리지 않음)
+- 캐시에 있는 성공 결과는 stale_ttl이 지나도 그대로 제공, 백그라운드 갱신도 하지 않음
+- breaker_reset초 후 health_check로 복구 확인 (실패하면 대기 시간 두 배)
+
+local_lookup(락카 배정 복제본, LockerReplicator)이 있으면 캐시/HTTP보다 먼저 조회하고
+복제본에 없는 UID만 위 캐시 → HTTP 순서로 조회.
+
+HTTP는 클라이언트가 가진 keep-alive 세션(연결 풀)으로 보냄 - 태그마다 TCP 연결을 새로 열지 않음.
+GET은 멱등이므로 연결 실패/게이트웨이 오류 시 retries번 재시도 (응답 대기 타임아웃은 재시도 없이 바로 실패).
 """
 
+import logging
+import threading
+import time
 import requests
-from typing import Optional, Dict
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from collections import OrderedDict
+from typing import Optional, Dict, Tuple
+
+from app.services.circuit_breaker import CircuitBreaker
+
+logger = logging.getLogger(__name__)
 
 
 class LockerAPIClient:
     """락카키 대여기 API 클라이언트"""
     
-    def __init__(self, base_url: str = "http://192.168.0.23:5000", timeout: float = 2.0):
+    def __init__(self, base_url: str = "http://192.168.0.23:5000", timeout: float = 2.0,
+                 member_ttl: float = 60.0, negative_ttl: float = 5.0, stale_ttl: float = 600.0,
+                 max_entries: int = 256, connect_timeout: float = 0.5, pool_size: int = 4,
+                 retries: int = 1, breaker_threshold: int = 3, breaker_reset: float = 10.0):
         """
         초기화
         
         Args:
             base_url: 락카키 대여기 API 주소
-            timeout: 타임아웃 (초)
+            timeout: 응답 대기 타임아웃 (초)
+            member_ttl: 조회 성공 결과 캐시 시간 (초, 0이면 캐시 안 함)
+            negative_ttl: 락카 미배정 결과 캐시 시간 (초)
+            stale_ttl: 만료된 성공 결과를 갱신 중에 대신 줄 수 있는 시간 (초, 저장 시점 기준)
+            max_entries: 캐시 최대 UID 수 (넘으면 가장 오래 안 쓴 것부터 제거)
+            connect_timeout: 연결 타임아웃 (초, 같은 LAN이므로 짧게)
+            pool_size: 유지할 keep-alive 연결 수 (동시 요청 수)
+            retries: GET 재시도 횟수 (0이면 재시도 안 함)
+            breaker_threshold: 서킷 브레이커를 열 연속 실패 수
+            breaker_reset: 브레이커가 열린 뒤 복구 확인까지 대기 시간 (초)
         """
         self.base_url = base_url
         self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.session = self._create_session(pool_size, retries)
+        self.breaker = CircuitBreaker('locker-api', failure_threshold=breaker_threshold,
+                                      reset_timeout=breaker_reset, probe=self.health_check)
+        
+        self.member_ttl = member_ttl
+        self.negative_ttl = negative_ttl
+        self.stale_ttl = max(stale_ttl, member_ttl)
+        self.max_entries = max_entries
+        
+        self.local_lookup = None  # nfc_uid → member 또는 None (set_local_lookup)
+        
+        self._cache_lock = threading.Lock()
+        self._cache: OrderedDict = OrderedDict()  # {nfc_uid: (member 또는 None, 저장 시각)}
+        self._refreshing = set()
+        
+        self.stats = {'local_hits': 0, 'hits': 0, 'stale_hits': 0, 'negative_hits': 0, 'misses': 0,
+                      'refreshes': 0, 'refresh_failed': 0, 'errors': 0, 'evictions': 0}
+    
+    @staticmethod
+    def _create_session(pool_size: int, retries: int) -> requests.Session:
+        """keep-alive 연결 풀 + GET 재시도 세션"""
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=False,  # 응답 대기 타임아웃은 재시도 안 함 (대기 시간만 배로 늘어남)
+            status=retries,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset({'GET', 'HEAD'}),
+            backoff_factor=0.1,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+    
+    def close(self):
+        """연결 풀 닫기"""
+        self.session.close()
+    
+    def set_base_url(self, base_url: str):
+        """
+        API 주소 변경 (System_Integration 시트에서 바뀐 주소를 재시작 없이 적용)
+        
+        조회 캐시는 유지 (UID → 회원 매핑은 주소와 무관), 이전 주소 기준 브레이커 상태는 초기화
+        """
+        base_url = base_url.rstrip('/')
+        if base_url == self.base_url:
+            return
+        logger.info(f"[Locker API] 주소 변경: {self.base_url} → {base_url}")
+        self.base_url = base_url
+        self.breaker.reset()
+    
+    def set_local_lookup(self, lookup):
+        """로컬 복제본 조회 함수 등록 (nfc_uid → member 또는 None)"""
+        self.local_lookup = lookup
+    
+    # =============================
+    # 회원 조회 (캐시)
+    # =============================
     
     def get_member_by_nfc(self, nfc_uid: str) -> Optional[Dict]:
         """
-        NFC UID로 회원 정보 조회
+        NFC UID로 회원 정보 조회 (캐시 우선)
+        
+        Args:
+            nfc_uid: NFC 태그 UID (예: "5A41B914524189")
+        
+        Returns:
+            dict: 회원 정보 또는 None (_fetch_member 참고)
+        """
+        if self.local_lookup is not None:
+            member = self.local_lookup(nfc_uid)
+            if member is not None:
+                with self._cache_lock:
+                    self.stats['local_hits'] += 1
+                return member
+        
+        now = time.monotonic()
+        stale = None
+        refresh = False
+        breaker_open = self.breaker.is_open
+        
+        with self._cache_lock:
+            entry = self._cache.get(nfc_uid)
+            if entry is not None:
+                member, stored_at = entry
+                age = now - stored_at
+                self._cache.move_to_end(nfc_uid)
+                
+                if member is None:
+                    if age < self.negative_ttl:
+                        self.stats['negative_hits'] += 1
+                        return None
+                elif age < self.member_ttl:
+                    self.stats['hits'] += 1
+                    return dict(member)
+                elif age < self.stale_ttl or breaker_open:
+                    # 브레이커가 열려 있으면 오래된 값이라도 제공 (갱신은 복구 후)
+                    self.stats['stale_hits'] += 1
+                    stale = dict(member)
+                    if not breaker_open:
+                        refresh = nfc_uid not in self._refreshing
+                        self._refreshing.add(nfc_uid)
+            
+            if stale is None:
+                self.stats['misses'] += 1
+        
+        # 만료된 성공 결과: 바로 응답하고 갱신은 백그라운드 (UID당 하나만)
+        if stale is not None:
+            if refresh:
+                threading.Thread(target=self._refresh, args=(nfc_uid,), daemon=True,
+                                 name='locker-api-refresh').start()
+            return stale
+        
+        member, cacheable = self._fetch_member(nfc_uid)
+        if cacheable:
+            self._store(nfc_uid, member)
+        return member
+    
+    def _refresh(self, nfc_uid: str):
+        """만료된 성공 결과 백그라운드 갱신 (실패하면 이전 값 유지)"""
+        try:
+            member, cacheable = self._fetch_member(nfc_uid)
+            with self._cache_lock:
+                self.stats['refreshes' if cacheable else 'refresh_failed'] += 1
+            if cacheable:
+                self._store(nfc_uid, member)
+        finally:
+            with self._cache_lock:
+                self._refreshing.discard(nfc_uid)
+    
+    def _store(self, nfc_uid: str, member: Optional[Dict]):
+        """조회 결과 저장 (LRU 초과분 제거)"""
+        ttl = self.member_ttl if member is not None else self.negative_ttl
+        if ttl <= 0:
+            return
+        with self._cache_lock:
+            self._cache[nfc_uid] = (dict(member) if member else None, time.monotonic())
+            self._cache.move_to_end(nfc_uid)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+                self.stats['evictions'] += 1
+    
+    def invalidate(self, nfc_uid: str = None):
+        """캐시 삭제 (nfc_uid 없으면 전체 - 락카 배정 변경 시)"""
+        with self._cache_lock:
+            if nfc_uid is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(nfc_uid, None)
+    
+    def cache_stats(self) -> Dict:
+        """캐시 통계 (local_hits/hits/stale_hits/negative_hits/misses/... + size, hit_rate)"""
+        with self._cache_lock:
+            stats = dict(self.stats)
+            stats['size'] = len(self._cache)
+        served = stats['local_hits'] + stats['hits'] + stats['stale_hits'] + stats['negative_hits']
+        total = served + stats['misses']
+        stats['hit_rate'] = round(served / total, 3) if total else 0.0
+        return stats
+    
+    def _fetch_member(self, nfc_uid: str) -> Tuple[Optional[Dict], bool]:
+        """
+        NFC UID로 회원 정보 조회 (락카키 대여기 API 호출)
         
         Args:
             nfc_uid: NFC 태그 UID (예: "5A41B914524189")
         
         Returns:
-            dict: 회원 정보 또는 None
+            (회원 정보 또는 None, 캐시 가능 여부 - 타임아웃/연결 실패/브레이커 차단이면 False)
+            회원 정보:
             {
                 'member_id': '20240861',
                 'name': '쩐부테쑤안',
@@ -37,48 +242,95 @@ class LockerAPIClient:
                 'assigned_at': '2025-12-09 10:33:52'
             }
         """
+        if not self.breaker.allow():
+            logger.debug("[Locker API] 브레이커 열림 - 조회 생략: NFC %s", nfc_uid)
+            return None, False
+        
         try:
             url = f"{self.base_url}/api/member/by-nfc/{nfc_uid}"
-            print(f"[Locker API] 요청: {url}")
+            logger.debug("[Locker API] 요청: %s", url)
             
-            response = requests.get(url, timeout=self.timeout)
+            response = self.session.get(url, timeout=(self.connect_timeout, self.timeout))
+            if response.status_code < 500:
+                self.breaker.record_success()
+            else:
+                self.breaker.record_failure()
             
             if response.status_code == 200:
                 data = response.json()
                 
                 if data.get('status') == 'ok':
-                    print(f"[Locker API] ✓ 회원 조회 성공: {data.get('name')} ({data.get('member_id')})")
+                    logger.debug("[Locker API] ✓ 회원 조회 성공: %s (%s)", data.get('name'), data.get('member_id'))
                     return {
                         'member_id': data['member_id'],
                         'name': data['name'],
                         'locker_number': data.get('locker_number', ''),
                         'assigned_at': data.get('assigned_at', '')
-                    }
+                    }, True
                 else:
-                    print(f"[Locker API] ✗ 응답 오류: {data.get('message')}")
-                    return None
+                    logger.warning(f"[Locker API] ✗ 응답 오류: {data.get('message')}")
+                    return None, True
                     
             elif response.status_code == 404:
-                print(f"[Locker API] ✗ 락카 미배정: NFC {nfc_uid}")
-                return None
+                logger.warning(f"[Locker API] ✗ 락카 미배정: NFC {nfc_uid}")
+                return None, True
             else:
-                print(f"[Locker API] ✗ HTTP 오류: {response.status_code}")
-                return None
+                logger.warning(f"[Locker API] ✗ HTTP 오류: {response.status_code}")
                 
         except requests.Timeout:
-            print(f"[Locker API] ✗ 타임아웃: 락카키 대여기 응답 없음")
-            return None
+            self.breaker.record_failure()
+            logger.error(f"[Locker API] ✗ 타임아웃: 락카키 대여기 응답 없음")
         except requests.ConnectionError:
-            print(f"[Locker API] ✗ 연결 실패: 락카키 대여기 서버 다운")
-            return None
+            self.breaker.record_failure()
+            logger.error(f"[Locker API] ✗ 연결 실패: 락카키 대여기 서버 다운")
         except Exception as e:
-            print(f"[Locker API] ✗ 예외 발생: {e}")
+            logger.error(f"[Locker API] ✗ 예외 발생: {e}")
+        
+        with self._cache_lock:
+            self.stats['errors'] += 1
+        return None, False
+    
+    def get_locker_changes(self, since: int, limit: int = 500) -> Optional[Dict]:
+        """
+        락카 배정 변경분 조회 (GET /api/locker/changes)
+        
+        Returns:
+            {'changes', 'last_seq', 'has_more', 'reset'} 또는 None (실패/미지원/브레이커 차단)
+        """
+        if not self.breaker.allow():
+            return None
+        
+        try:
+            response = self.session.get(
+                f"{self.base_url}/api/locker/changes",
+                params={'since': since, 'limit': limit},
+                timeout=(self.connect_timeout, self.timeout)
+            )
+        except requests.RequestException as e:
+            self.breaker.record_failure()
+            logger.debug("[Locker API] 변경분 조회 실패: %s", e)
+            return None
+        
+        # 404(변경분 API 미지원)도 서버는 살아 있는 것
+        if response.status_code < 500:
+            self.breaker.record_success()
+        else:
+            self.breaker.record_failure()
+        
+        try:
+            if response.status_code != 200:
+                logger.debug("[Locker API] 변경분 조회 HTTP %s", response.status_code)
+                return None
+            data = response.json()
+            return data if data.get('status') == 'ok' else None
+        except ValueError as e:
+            logger.debug("[Locker API] 변경분 응답 오류: %s", e)
             return None
     
     def health_check(self) -> bool:
-        """락카키 대여기 API 서버 상태 확인"""
+        """락카키 대여기 API 서버 상태 확인 (브레이커를 거치지 않음 - 복구 확인용)"""
         try:
-            response = requests.get(f"{self.base_url}/api/health", timeout=1.0)
+            response = self.session.get(f"{self.base_url}/api/health", timeout=(self.connect_timeout, 1.0))
             return response.status_code == 200
         except:
             return False
@@ -0,0 +1,138 @@
+"""
+락카 배정 복제 서비스 (운동복 대여기 측)
+
+락카키 대여기의 락카 배정 변경분(GET /api/locker/changes?since=seq)을 주기적으로 가져와
+LocalCache의 NFC UID → 회원 복제본(nfc_member_map)에 반영
+- NFC 로그인은 복제본(메모리)에서 바로 조회, 없을 때만 HTTP 조회 (LockerAPIClient.local_lookup)
+- 반영한 seq는 DB에 저장 → 재시작 후 이어서 받음
+- 변경된 UID는 LockerAPIClient 조회 캐시에서 삭제 (해제된 락카의 이전 회원이 캐시로 로그인되지 않도록)
+- 락카키 대여기가 변경분 API를 지원하지 않거나 응답이 없으면 간격을 늘려 재시도
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class LockerReplicator:
+    """락카 배정 변경분 주기 복제"""
+    
+    SOURCE = 'locker'
+    
+    def __init__(self, client, local_cache, interval: float = 3.0, max_interval: float = 60.0,
+                 batch_size: int = 500):
+        """
+        초기화
+        
+        Args:
+            client: LockerAPIClient 인스턴스 (변경분 조회 + 캐시 무효화)
+            local_cache: LocalCache 인스턴스 (복제본 저장)
+            interval: 변경분 조회 주기 (초)
+            max_interval: 연속 실패 시 최대 조회 간격 (초)
+            batch_size: 한 번에 받을 최대 변경 수
+        """
+        self.client = client
+        self.local_cache = local_cache
+        self.interval = interval
+        self.max_interval = max_interval
+        self.batch_size = batch_size
+        
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._failures = 0
+        
+        self.stats = {'polls': 0, 'applied': 0, 'resets': 0, 'failures': 0, 'last_success_at': None}
+    
+    def sync_once(self) -> Optional[int]:
+        """
+        밀린 변경분을 모두 받아 반영
+        
+        Returns:
+            반영한 변경 수, 조회 실패 시 None
+        """
+        applied = 0
+        since = self.local_cache.get_replication_seq(self.SOURCE)
+        
+        while True:
+            result = self.client.get_locker_changes(since, self.batch_size)
+            self.stats['polls'] += 1
+            if result is None:
+                return None if applied == 0 else applied
+            
+            changes = result.get('changes', [])
+            reset = bool(result.get('reset'))
+            last_seq = int(result.get('last_seq', since))
+            
+            if changes or reset or last_seq != since:
+                touched = self.local_cache.apply_locker_changes(changes, last_seq, reset, self.SOURCE)
+                for nfc_uid in touched:
+                    self.client.invalidate(nfc_uid)
+                applied += len(changes)
+                if reset:
+                    self.stats['resets'] += 1
+                    logger.info(f"[Replication] 락카 배정 전체 재동기화: {len(changes)}건 (seq {last_seq})")
+            
+            since = last_seq
+            if not result.get('has_more'):
+                break
+        
+        self.stats['applied'] += applied
+        self.stats['last_success_at'] = time.time()
+        if applied:
+            logger.debug("[Replication] 락카 배정 변경 %d건 반영 (seq %d)", applied, since)
+        return applied
+    
+    def status(self) -> Dict:
+        """복제 상태 (seq, 복제된 UID 수, 마지막 성공 후 경과 시간 포함)"""
+        stats = dict(self.stats)
+        last = stats.pop('last_success_at')
+        stats['seq'] = self.local_cache.get_replication_seq(self.SOURCE)
+        stats['size'] = self.local_cache.get_replica_size()
+        stats['lag_seconds'] = round(time.time() - last, 1) if last else None
+        return stats
+    
+    # =============================
+    # 주기 조회 스레드
+    # =============================
+    
+    def start(self):
+        """주기 조회 스레드 시작"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, daemon=True, name='locker-replication')
+        self._thread.start()
+        logger.info(f"[Replication] 락카 배정 복제 시작 (주기 {self.interval}초)")
+    
+    def stop(self):
+        """주기 조회 스레드 중지"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=2.0)
+    
+    def _loop(self):
+        """interval마다 sync_once (실패가 이어지면 간격을 두 배씩 늘림)"""
+        while not self._stop.is_set():
+            try:
+                ok = self.sync_once() is not None
+            except Exception as e:
+                ok = False
+                logger.warning(f"[Replication] 복제 반영 실패: {e}")
+            
+            if ok:
+                if self._failures:
+                    logger.info("[Replication] 락카키 대여기 변경분 조회 복구")
+                self._failures = 0
+            else:
+                self._failures += 1
+                self.stats['failures'] += 1
+                if self._failures == 1:
+                    logger.warning("[Replication] 락카키 대여기 변경분 조회 실패 - HTTP 조회로 대체")
+            
+            delay = self.interval
+            if self._failures:
+                delay = min(self.interval * 2 ** min(self._failures, 10), self.max_interval)
+            self._stop.wait(delay)
@@ -0,0 +1,160 @@
+"""
+로깅 설정 서비스
+
+print() 대신 표준 logging 사용 (모듈마다 logger = logging.getLogger(__name__))
+- 레벨: LOG_LEVEL 환경변수 (기본 INFO, 메시지별 로그는 DEBUG)
+- 비차단: 호출 스레드는 큐에 넣기만 하고 별도 스레드가 stdout에 출력
+  (MQTT/NFC/요청 스레드가 터미널·journald I/O를 기다리지 않음)
+- 속도 제한: 같은 호출 위치의 로그는 window초 동안 burst개까지만 출력,
+  초과분은 버리고 다음 출력에 생략 건수 표시
+"""
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+LOG_FORMAT = '%(asctime)s %(levelname)-7s %(message)s'
+DATE_FORMAT = '%H:%M:%S'
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional['NonBlockingQueueHandler'] = None
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    호출 위치(logger, 파일 행, 레벨)별 로그 속도 제한
+    
+    f-string 메시지도 호출 위치가 같으면 같은 키로 묶임.
+    """
+    
+    def __init__(self, burst: int = 20, window: float = 10.0):
+        super().__init__()
+        self.burst = burst
+        self.window = window
+        self._lock = threading.Lock()
+        self._state: Dict[Tuple, list] = {}  # key → [window 시작 시각, 출력 수, 생략 수]
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.burst <= 0:
+            return True
+        
+        key = (record.name, record.lineno, record.levelno)
+        now = time.monotonic()
+        
+        with self._lock:
+            state = self._state.get(key)
+            if state is None or now - state[0] >= self.window:
+                suppressed = state[2] if state else 0
+                self._state[key] = [now, 1, 0]
+                if suppressed:
+                    record.suppressed = suppressed
+                return True
+            
+            if state[1] < self.burst:
+                state[1] += 1
+                return True
+            
+            state[2] += 1
+            return False
+
+
+class SuppressedCountFormatter(logging.Formatter):
+    """생략된 로그 건수를 메시지 뒤에 표시"""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        suppressed = getattr(record, 'suppressed', 0)
+        if suppressed:
+            text += f' (직전 {suppressed}건 생략)'
+        return text
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    큐가 가득 차면 기다리지 않고 버리는 QueueHandler
+    
+    prepare는 기본 QueueHandler 그대로: 호출 스레드에서 메시지/예외를 문자열로 만들고
+    args/exc_info를 비움 (출력 시점에 바뀌었거나 스레드 안전하지 않은 인자 객체를 참조하지 않음).
+    """
+    
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+    
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def setup_logging(level: str = None, burst: int = None, window: float = None,
+                  queue_size: int = 10000) -> logging.Logger:
+    """
+    루트 로거에 비차단 큐 핸들러 설치 (여러 번 호출해도 한 번만 적용)
+    
+    Args:
+        level: 로그 레벨 (None이면 LOG_LEVEL 환경변수, 기본 INFO)
+        burst: 호출 위치별 window 동안 최대 출력 수 (None이면 LOG_RATE_BURST, 기본 20, 0=제한 없음)
+        window: 속도 제한 구간 (초, None이면 LOG_RATE_WINDOW, 기본 10)
+        queue_size: 출력 대기 큐 크기 (가득 차면 버림)
+    
+    Returns:
+        루트 로거
+    """
+    global _listener, _queue_handler
+    
+    root = logging.getLogger()
+    level = (level or os.getenv('LOG_LEVEL', 'INFO')).upper()
+    root.setLevel(level)
+    
+    if _listener is not None:
+        return root
+    
+    # 포맷에서 쓰지 않는 LogRecord 필드 수집 생략 (호출 스레드 비용 감소)
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    
+    burst = int(os.getenv('LOG_RATE_BURST', 20)) if burst is None else burst
+    window = float(os.getenv('LOG_RATE_WINDOW', 10)) if window is None else window
+    
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(SuppressedCountFormatter(LOG_FORMAT, DATE_FORMAT))
+    
+    log_queue = queue.Queue(maxsize=queue_size)
+    _queue_handler = NonBlockingQueueHandler(log_queue)
+    _queue_handler.addFilter(RateLimitFilter(burst=burst, window=window))
+    
+    root.addHandler(_queue_handler)
+    
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+    
+    # 외부 라이브러리 로그는 경고 이상만
+    for name in ('werkzeug', 'engineio', 'socketio', 'urllib3'):
+        logging.getLogger(name).setLevel(logging.WARNING)
+    
+    return root
+
+
+def shutdown_logging():
+    """큐에 남은 로그 출력 후 출력 스레드 종료"""
+    global _listener, _queue_handler
+    
+    if _listener is None:
+        return
+    
+    _listener.stop()
+    logging.getLogger().removeHandler(_queue_handler)
+    if _queue_handler.dropped:
+        print(f"[Logging] 큐 가득 참으로 버린 로그: {_queue_handler.dropped}건")
+    _listener = None
+    _queue_handler = None
@@ -0,0 +1,297 @@
+"""
+요청/락 지표 수집 (GET /metrics, Prometheus 텍스트 형식)
+
+- RequestMetrics: Flask before/after/teardown 훅으로 라우트별 응답 시간 히스토그램,
+  상태 코드별 응답 수, 처리 중 요청 수 기록
+- TimedLock: threading.Lock 대신 사용, 획득 대기 시간 히스토그램 기록
+  (경합 없으면 대기 시간 측정 없이 바로 획득, 켜면 호출 위치별 대기/점유 시간도 기록)
+- MetricsText: Prometheus 텍스트 형식 출력 도우미
+"""
+
+import sys
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from flask import g, request
+
+# 응답 시간 구간 (초) - /api/nfc/poll 롱폴링(최대 30초)까지 포함
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# 락 대기 시간 구간 (초)
+LOCK_BUCKETS = (0.00001, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+
+
+class Histogram:
+    """누적 구간 히스토그램 (동기화는 호출 측 책임)"""
+    
+    def __init__(self, buckets: Iterable[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # 마지막 칸은 +Inf
+        self.sum = 0.0
+        self.count = 0
+    
+    def observe(self, value: float):
+        """값 하나 기록"""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+    
+    def copy(self) -> 'Histogram':
+        """현재 값 복사 (출력용)"""
+        other = Histogram(self.buckets)
+        other.counts = list(self.counts)
+        other.sum = self.sum
+        other.count = self.count
+        return other
+
+
+# =============================
+# Prometheus 텍스트 출력
+# =============================
+
+def _escape(value) -> str:
+    """라벨 값 이스케이프"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(labels: Optional[Dict]) -> str:
+    """{'route': '/api/x'} → '{route="/api/x"}'"""
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + '}'
+
+
+def _number(value: float) -> str:
+    """정수는 소수점 없이"""
+    if isinstance(value, float) and not value.is_integer():
+        return repr(round(value, 6))
+    return str(int(value))
+
+
+class MetricsText:
+    """Prometheus 텍스트 형식 작성기"""
+    
+    CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+    
+    def __init__(self):
+        self.lines: List[str] = []
+    
+    def metric(self, name: str, kind: str, help_text: str, samples: Iterable[Tuple[Optional[Dict], float]]):
+        """
+        gauge/counter 추가
+        
+        Args:
+            name: 지표 이름
+            kind: 'gauge' 또는 'counter'
+            help_text: 설명
+            samples: [(라벨 dict 또는 None, 값), ...]
+        """
+        self.lines.append(f'# HELP {name} {help_text}')
+        self.lines.append(f'# TYPE {name} {kind}')
+        for labels, value in samples:
+            if value is not None:
+                self.lines.append(f'{name}{_labels(labels)} {_number(value)}')
+    
+    def histogram(self, name: str, help_text: str, series: Iterable[Tuple[Optional[Dict], Histogram]]):
+        """히스토그램 추가 (_bucket/_sum/_count)"""
+        self.lines.append(f'# HELP {name} {help_text}')
+        self.lines.append(f'# TYPE {name} histogram')
+        for labels, histogram in series:
+            labels = labels or {}
+            cumulative = 0
+            for bound, count in zip(histogram.buckets + (None,), histogram.counts):
+                cumulative += count
+                le = '+Inf' if bound is None else repr(bound)
+                self.lines.append(f'{name}_bucket{_labels(dict(labels, le=le))} {cumulative}')
+            self.lines.append(f'{name}_sum{_labels(labels)} {_number(histogram.sum)}')
+            self.lines.append(f'{name}_count{_labels(labels)} {histogram.count}')
+    
+    def render(self) -> str:
+        """최종 텍스트"""
+        return '\n'.join(self.lines) + '\n'
+
+
+# =============================
+# 요청 지표 (Flask 미들웨어)
+# =============================
+
+class RequestMetrics:
+    """라우트별 응답 시간/상태 코드/처리 중 요청 수"""
+    
+    def __init__(self, buckets: Iterable[float] = REQUEST_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._latency: Dict[Tuple[str, str], Histogram] = {}  # {(method, route): Histogram}
+        self._responses: Dict[Tuple[str, str, int], int] = {}  # {(method, route, status): 수}
+        self.in_flight = 0
+    
+    def init_app(self, app):
+        """요청 훅 등록 (다른 훅보다 먼저 등록해야 전체 처리 시간이 잡힘)"""
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+        app.request_metrics = self
+    
+    def _before_request(self):
+        g._metrics_started = time.perf_counter()
+        with self._lock:
+            self.in_flight += 1
+    
+    def _after_request(self, response):
+        g._metrics_status = response.status_code
+        return response
+    
+    def _teardown_request(self, exc):
+        """응답 완료(예외 포함) 시 기록 - after_request를 못 거쳤으면 500"""
+        started = g.pop('_metrics_started', None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        status = g.pop('_metrics_status', 500)
+        # 라벨 수가 늘지 않도록 URL이 아닌 라우트 규칙으로 (매칭 실패는 하나로)
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        self.record(request.method, route, status, elapsed)
+    
+    def record(self, method: str, route: str, status: int, seconds: float):
+        """요청 하나 기록"""
+        with self._lock:
+            self.in_flight = max(0, self.in_flight - 1)
+            histogram = self._latency.get((method, route))
+            if histogram is None:
+                histogram = self._latency[(method, route)] = Histogram(self.buckets)
+            histogram.observe(seconds)
+            key = (method, route, status)
+            self._responses[key] = self._responses.get(key, 0) + 1
+    
+    def write(self, out: MetricsText):
+        """지표 출력"""
+        with self._lock:
+            latency = [({'method': method, 'route': route}, histogram.copy())
+                       for (method, route), histogram in sorted(self._latency.items())]
+            responses = [({'method': method, 'route': route, 'status': status}, count)
+                         for (method, route, status), count in sorted(self._responses.items())]
+            in_flight = self.in_flight
+        
+        out.metric('kiosk_http_requests_in_flight', 'gauge', '처리 중인 HTTP 요청 수', [(None, in_flight)])
+        out.histogram('kiosk_http_request_duration_seconds', '라우트별 HTTP 응답 시간 (초)', latency)
+        out.metric('kiosk_http_responses_total', 'counter', '라우트/상태 코드별 응답 수', responses)
+
+
+# =============================
+# 대기 시간 기록 락
+# =============================
+
+class TimedLock:
+    """
+    획득 대기 시간을 기록하는 Lock (threading.Lock과 같은 사용법)
+    
+    지표는 락을 잡은 상태에서 갱신하므로 별도 동기화 없음.
+    경합이 없으면 시간 측정 없이 바로 획득 (uncontended만 증가).
+    
+    profiling을 켜면 호출 위치(함수 이름)별 획득 대기/점유 시간도 기록 (LockProfiler)
+    - 횟수/합계는 누적만 함 (초기화 없음 → /metrics counter, 주기 보고는 직전 값과의 차이)
+    - 꺼져 있을 때 추가 비용은 속성 확인 두 번
+    """
+    
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.wait_histogram = Histogram(LOCK_BUCKETS)  # 경합이 있었던 획득만
+        self.uncontended = 0
+        
+        self.profiling = False
+        self._sites: Dict[str, List[float]] = {}  # {호출 위치: [횟수, 대기 합, 대기 최대, 점유 합, 점유 최대]} (합계는 누적)
+        self._held_site: Optional[str] = None
+        self._held_at = 0.0
+    
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        if self._lock.acquire(False):
+            self.uncontended += 1
+            if self.profiling:
+                self._profile_acquired(0.0)
+            return True
+        if not blocking:
+            return False
+        
+        started = time.perf_counter()
+        if not self._lock.acquire(True, timeout):
+            return False
+        waited = time.perf_counter() - started
+        self.wait_histogram.observe(waited)
+        if self.profiling:
+            self._profile_acquired(waited)
+        return True
+    
+    def release(self):
+        if self._held_site is not None:
+            self._profile_released()
+        self._lock.release()
+    
+    def locked(self) -> bool:
+        return self._lock.locked()
+    
+    __enter__ = acquire
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+    
+    def wait_snapshot(self) -> Histogram:
+        """대기 시간 히스토그램 (경합 없던 획득은 0초 구간에 포함)"""
+        histogram = self.wait_histogram.copy()
+        histogram.counts[0] += self.uncontended
+        histogram.count += self.uncontended
+        return histogram
+    
+    # =============================
+    # 호출 위치별 프로파일링
+    # =============================
+    
+    def _profile_acquired(self, waited: float):
+        """획득 직후 (락 보유 중) - 호출 위치 = acquire/__enter__를 부른 함수"""
+        code = sys._getframe(2).f_code
+        site = getattr(code, 'co_qualname', code.co_name)
+        
+        entry = self._sites.get(site)
+        if entry is None:
+            entry = self._sites[site] = [0, 0.0, 0.0, 0.0, 0.0]
+        entry[0] += 1
+        entry[1] += waited
+        if waited > entry[2]:
+            entry[2] = waited
+        
+        self._held_site = site
+        self._held_at = time.perf_counter()
+    
+    def _profile_released(self):
+        """해제 직전 (락 보유 중) - 점유 시간 기록"""
+        held = time.perf_counter() - self._held_at
+        entry = self._sites.get(self._held_site)
+        self._held_site = None
+        if entry is not None:
+            entry[3] += held
+            if held > entry[4]:
+                entry[4] = held
+    
+    def set_profiling(self, enabled: bool):
+        """호출 위치별 기록 켜기/끄기 (실행 중 전환 가능, 누적 합계는 유지)"""
+        self.profiling = enabled
+    
+    def profile_snapshot(self, reset_max: bool = False) -> Dict[str, Dict]:
+        """
+        호출 위치별 기록 (이 락을 잡은 스레드에서 호출하면 안 됨)
+        
+        Args:
+            reset_max: 읽은 뒤 최대값만 초기화 (주기 보고 구간별 최대, 합계는 그대로)
+        
+        Returns:
+            {site: {'count', 'wait_total', 'wait_max', 'hold_total', 'hold_max'}} (초, count/합계는 누적)
+        """
+        with self._lock:
+            sites = {site: dict(zip(('count', 'wait_total', 'wait_max', 'hold_total', 'hold_max'), entry))
+                     for site, entry in self._sites.items()}
+            if reset_max:
+                for entry in self._sites.values():
+                    entry[2] = entry[4] = 0.0
+        return sites
@@ -6,6 +6,7 @@ ESP32 F-BOX 기기들과 MQTT 프로토콜로 통신
 - 이벤트 수신 (dispense_complete, heartbeat 등)
 """
 
+import logging
 import paho.mqtt.client as mqtt
 import json
 import time
@@ -13,6 +14,8 @@ from datetime import datetime
 from typing import Callable, Dict, Optional
 from threading import Thread
 
+logger = logging.getLogger(__name__)
+
 
 class MQTTService:
     """MQTT 통신 관리 클래스"""
@@ -49,7 +52,7 @@ class MQTTService:
         # 자동 재연결 설정 (min 5초, max 120초) - 너무 빠르면 충돌 발생
         self.client.reconnect_delay_set(min_delay=5, max_delay=120)
         
-        print(f"[MQTT] 초기화: {broker_host}:{broker_port}")
+        logger.info(f"[MQTT] 초기화: {broker_host}:{broker_port}")
     
     def connect(self) -> bool:
         """
@@ -59,7 +62,7 @@ class MQTTService:
             성공 여부
         """
         try:
-            print(f"[MQTT] 연결 시도: {self.broker_host}:{self.broker_port}")
+            logger.info(f"[MQTT] 연결 시도: {self.broker_host}:{self.broker_port}")
             self.client.connect(self.broker_host, self.broker_port, keepalive=60)
             
             # 백그라운드 스레드에서 루프 실행
@@ -72,21 +75,21 @@ class MQTTService:
                 time.sleep(0.1)
             
             if self.connected:
-                print("[MQTT] ✓ 연결 성공")
+                logger.info("[MQTT] ✓ 연결 성공")
                 return True
             else:
-                print("[MQTT] ✗ 연결 실패 (타임아웃)")
+                logger.warning("[MQTT] ✗ 연결 실패 (타임아웃)")
                 return False
                 
         except Exception as e:
-            print(f"[MQTT] ✗ 연결 실패: {e}")
+            logger.error(f"[MQTT] ✗ 연결 실패: {e}")
             return False
     
     def disconnect(self):
         """MQTT 브로커 연결 해제"""
         self.client.loop_stop()
         self.client.disconnect()
-        print("[MQTT] 연결 해제")
+        logger.info("[MQTT] 연결 해제")
     
     def _on_connect(self, client, userdata, flags, rc):
         """연결 성공 콜백"""
@@ -96,27 +99,27 @@ class MQTTService:
             self._reconnecting = False
             
             if was_reconnect:
-                print("[MQTT] ✅ 브로커 재연결 성공")
+                logger.info("[MQTT] ✅ 브로커 재연결 성공")
             else:
-                print("[MQTT] 브로커 연결됨")
+                logger.info("[MQTT] 브로커 연결됨")
             
             # 모든 F-BOX 기기의 상태 토픽 구독
             self.subscribe_all_devices()
         else:
             self.connected = False
-            print(f"[MQTT] 연결 실패: RC={rc}")
+            logger.warning(f"[MQTT] 연결 실패: RC={rc}")
     
     def _on_disconnect(self, client, userdata, rc):
         """연결 해제 콜백"""
         self.connected = False
         if rc != 0:
             self._reconnecting = True
-            print(f"[MQTT] ⚠️ 예기치 않은 연결 해제: RC={rc}, 자동 재연결 시도 중...")
+            logger.warning(f"[MQTT] ⚠️ 예기치 않은 연결 해제: RC={rc}, 자동 재연결 시도 중...")
             # paho-mqtt의 loop_start()가 자동으로 재연결 시도함
             # reconnect_delay_set()으로 설정된 간격으로 재시도
         else:
             self._reconnecting = False
-            print("[MQTT] 정상 연결 해제")
+            logger.info("[MQTT] 정상 연결 해제")
     
     def _on_message(self, client, userdata, msg):
         """메시지 수신 콜백"""
@@ -135,12 +138,12 @@ class MQTTService:
                     # 이벤트 처리
                     self._handle_event(device_id, payload)
                 else:
-                    print(f"[MQTT] 알 수 없는 토픽: {topic}")
+                    logger.debug("[MQTT] 알 수 없는 토픽: %s", topic)
             
         except json.JSONDecodeError as e:
-            print(f"[MQTT] JSON 파싱 실패: {e}")
+            logger.warning(f"[MQTT] JSON 파싱 실패: {e}")
         except Exception as e:
-            print(f"[MQTT] 메시지 처리 오류: {e}")
+            logger.error(f"[MQTT] 메시지 처리 오류: {e}")
     
     def _handle_event(self, device_id: str, payload: Dict):
         """
@@ -153,29 +156,29 @@ class MQTTService:
         event_type = payload.get('event')
         
         if not event_type:
-            print(f"[MQTT] 이벤트 타입 없음: {payload}")
+            logger.warning(f"[MQTT] 이벤트 타입 없음: {payload}")
             return
         
         # device_uuid 추출 (payload에서 우선, 없으면 토픽에서 추출한 device_id 사용)
         device_uuid = payload.get('deviceUUID', device_id)
         
-        print(f"[MQTT] ← {device_uuid}: {event_type}")
+        logger.debug("[MQTT] ← %s: %s", device_uuid, event_type)
         
         # DB 로깅 (local_cache가 설정되어 있으면)
         if hasattr(self, 'local_cache') and self.local_cache:
             try:
                 self.local_cache.log_mqtt_event(device_uuid, event_type, payload)
             except Exception as e:
-                print(f"[MQTT] DB 로깅 오류: {e}")
+                logger.error(f"[MQTT] DB 로깅 오류: {e}")
         
         # 등록된 핸들러 실행
         if event_type in self.event_handlers:
             try:
                 self.event_handlers[event_type](device_uuid, payload)
             except Exception as e:
-                print(f"[MQTT] 핸들러 실행 오류 ({event_type}): {e}")
+                logger.error(f"[MQTT] 핸들러 실행 오류 ({event_type}): {e}")
         else:
-            print(f"[MQTT] 미등록 이벤트: {event_type}")
+            logger.debug("[MQTT] 미등록 이벤트: %s", event_type)
     
     # =============================
     # 구독 관리
@@ -185,13 +188,13 @@ class MQTTService:
         """모든 F-BOX 기기의 상태 토픽 구독"""
         topic = 'fbox/+/status'
         self.client.subscribe(topic, qos=0)
-        print(f"[MQTT] Subscribe: {topic}")
+        logger.info(f"[MQTT] Subscribe: {topic}")
     
     def subscribe_device(self, device_id: str):
         """특정 기기의 상태 토픽 구독"""
         topic = f'fbox/{device_id}/status'
         self.client.subscribe(topic, qos=0)
-        print(f"[MQTT] Subscribe: {topic}")
+        logger.info(f"[MQTT] Subscribe: {topic}")
     
     # =============================
     # 명령 전송
@@ -210,7 +213,7 @@ class MQTTService:
             성공 여부
         """
         if not self.connected:
-            print("[MQTT] 브로커 미연결 상태")
+            logger.info("[MQTT] 브로커 미연결 상태")
             return False
         
         topic = f'fbox/{device_id}/cmd'
@@ -224,14 +227,14 @@ class MQTTService:
             result = self.client.publish(topic, json.dumps(payload), qos=1)
             
             if result.rc == mqtt.MQTT_ERR_SUCCESS:
-                print(f"[MQTT] → {device_id}: {command} {params}")
+                logger.info("[MQTT] → %s: %s %s", device_id, command, params)
                 return True
             else:
-                print(f"[MQTT] 전송 실패: RC={result.rc}")
+                logger.warning(f"[MQTT] 전송 실패: RC={result.rc}")
                 return False
                 
         except Exception as e:
-            print(f"[MQTT] 명령 전송 오류: {e}")
+            logger.error(f"[MQTT] 명령 전송 오류: {e}")
             return False
     
     def dispense(self, device_id: str) -> bool:
@@ -283,13 +286,13 @@ class MQTTService:
             handler: 핸들러 함수 (device_id, payload를 인자로 받음)
         """
         self.event_handlers[event_type] = handler
-        print(f"[MQTT] 핸들러 등록: {event_type}")
+        logger.debug("[MQTT] 핸들러 등록: %s", event_type)
     
     def unregister_event_handler(self, event_type: str):
         """이벤트 핸들러 등록 해제"""
         if event_type in self.event_handlers:
             del self.event_handlers[event_type]
-            print(f"[MQTT] 핸들러 해제: {event_type}")
+            logger.debug("[MQTT] 핸들러 해제: %s", event_type)
     
     # =============================
     # 유틸리티
@@ -299,10 +302,23 @@ class MQTTService:
         """연결 상태 확인"""
         return self.connected
     
+    def queue_depth(self) -> Dict[str, int]:
+        """
+        paho 내부 대기열 크기 (/metrics)
+        
+        out_packets: 소켓 쓰기 대기 패킷, out_messages: 브로커 확인 대기 메시지(QoS>0),
+        in_messages: 수신 처리 중 메시지(QoS 2)
+        """
+        return {
+            'out_packets': len(getattr(self.client, '_out_packet', ())),
+            'out_messages': len(getattr(self.client, '_out_messages', ())),
+            'in_messages': len(getattr(self.client, '_in_messages', ()))
+        }
+    
     def set_local_cache(self, local_cache):
         """LocalCache 인스턴스 설정 (이벤트 로깅용)"""
         self.local_cache = local_cache
-        print("[MQTT] LocalCache 연결됨")
+        logger.info("[MQTT] LocalCache 연결됨")
     
     def __enter__(self):
         self.connect()
@@ -324,12 +340,8 @@ def handle_boot_complete(device_uuid: str, payload: Dict):
     ip_address = payload.get('ipAddress', '')
     firmware = payload.get('firmwareVersion', '')
     
-    print(f"[Event] {device_uuid} 부팅 완료:")
-    print(f"  - MAC: {mac_address}")
-    print(f"  - Size: {size}")
-    print(f"  - Stock: {stock}")
-    print(f"  - IP: {ip_address}")
-    print(f"  - Firmware: {firmware}")
+    logger.info("[Event] %s 부팅 완료: MAC %s, Size %s, Stock %s, IP %s, Firmware %s",
+                device_uuid, mac_address, size, stock, ip_address, firmware)
 
 
 def handle_heartbeat(device_uuid: str, payload: Dict):
@@ -341,25 +353,25 @@ def handle_heartbeat(device_uuid: str, payload: Dict):
 def handle_dispense_complete(device_uuid: str, payload: Dict):
     """토출 완료 이벤트 핸들러"""
     stock = payload.get('stock')
-    print(f"[Event] {device_uuid} 토출 완료: 재고 {stock}개")
+    logger.info(f"[Event] {device_uuid} 토출 완료: 재고 {stock}개")
 
 
 def handle_dispense_failed(device_uuid: str, payload: Dict):
     """토출 실패 이벤트 핸들러"""
     reason = payload.get('reason')
-    print(f"[Event] {device_uuid} 토출 실패: {reason}")
+    logger.warning(f"[Event] {device_uuid} 토출 실패: {reason}")
 
 
 def handle_door_opened(device_uuid: str, payload: Dict):
     """문 열림 이벤트 핸들러"""
-    print(f"[Event] {device_uuid} 문 열림 (재고 보충 시작?)")
+    logger.info(f"[Event] {device_uuid} 문 열림 (재고 보충 시작?)")
 
 
 def handle_door_closed(device_uuid: str, payload: Dict):
     """문 닫힘 이벤트 핸들러"""
     stock = payload.get('stock')
     sensor_available = payload.get('sensorAvailable', False)
-    print(f"[Event] {device_uuid} 문 닫힘: 재고 {stock}개 (센서: {'O' if sensor_available else 'X'})")
+    logger.info(f"[Event] {device_uuid} 문 닫힘: 재고 {stock}개 (센서: {'O' if sensor_available else 'X'})")
 
 
 def handle_stock_updated(device_uuid: str, payload: Dict):
@@ -368,27 +380,27 @@ def handle_stock_updated(device_uuid: str, payload: Dict):
     source = payload.get('source', 'unknown')
     needs_verification = payload.get('needsVerification', False)
     
-    print(f"[Event] {device_uuid} 재고 업데이트: {stock}개 (출처: {source})")
+    logger.info(f"[Event] {device_uuid} 재고 업데이트: {stock}개 (출처: {source})")
     if needs_verification:
-        print(f"  ⚠️  관리자 확인 필요")
+        logger.warning(f"[Event] {device_uuid} ⚠️  재고 관리자 확인 필요")
 
 
 def handle_stock_low(device_uuid: str, payload: Dict):
     """재고 부족 이벤트 핸들러"""
     stock = payload.get('stock')
-    print(f"[Event] {device_uuid} ⚠️  재고 부족: {stock}개")
+    logger.warning(f"[Event] {device_uuid} ⚠️  재고 부족: {stock}개")
 
 
 def handle_stock_empty(device_uuid: str, payload: Dict):
     """재고 없음 이벤트 핸들러"""
-    print(f"[Event] {device_uuid} ❌ 재고 없음")
+    logger.warning(f"[Event] {device_uuid} ❌ 재고 없음")
 
 
 def handle_error(device_uuid: str, payload: Dict):
     """에러 이벤트 핸들러"""
     error_code = payload.get('errorCode')
     error_message = payload.get('errorMessage')
-    print(f"[Event] {device_uuid} ❌ 에러: [{error_code}] {error_message}")
+    logger.error(f"[Event] {device_uuid} ❌ 에러: [{error_code}] {error_message}")
 
 
 def handle_status(device_uuid: str, payload: Dict):
@@ -400,42 +412,43 @@ def handle_status(device_uuid: str, payload: Dict):
     locked = payload.get('locked', False)
     rssi = payload.get('wifiRssi')
     
-    print(f"[Event] {device_uuid} 상태:")
-    print(f"  - Size: {size}, Stock: {stock}")
-    print(f"  - Door: {door_state}, Floor: {floor_state}")
-    print(f"  - Locked: {locked}, RSSI: {rssi}dBm")
+    logger.debug("[Event] %s 상태: Size %s, Stock %s, Door %s, Floor %s, Locked %s, RSSI %sdBm",
+                 device_uuid, size, stock, door_state, floor_state, locked, rssi)
 
 
 def handle_home_failed(device_uuid: str, payload: Dict):
     """홈 복귀 실패 이벤트 핸들러"""
     reason = payload.get('reason')
-    print(f"[Event] {device_uuid} ⚠️ 홈 복귀 실패: {reason}")
+    logger.warning(f"[Event] {device_uuid} ⚠️ 홈 복귀 실패: {reason}")
 
 
 def handle_wifi_reconnected(device_uuid: str, payload: Dict):
     """Wi-Fi 재연결 이벤트 핸들러"""
     ip = payload.get('ipAddress')
-    print(f"[Event] {device_uuid} 📶 Wi-Fi 재연결: {ip}")
+    logger.info(f"[Event] {device_uuid} 📶 Wi-Fi 재연결: {ip}")
 
 
 def handle_mqtt_reconnected(device_uuid: str, payload: Dict):
     """MQTT 재연결 이벤트 핸들러"""
-    print(f"[Event] {device_uuid} 🔄 MQTT 재연결")
+    logger.info(f"[Event] {device_uuid} 🔄 MQTT 재연결")
 
 
 # =============================
 # 기본 핸들러 등록 유틸리티
 # =============================
 
-def register_default_handlers(mqtt_service: MQTTService, local_cache=None, sheets_sync=None, event_logger=None):
+def register_default_handlers(mqtt_service: MQTTService, local_cache=None, sheets_sync=None, event_logger=None,
+                              state_publisher=None):
     """
     기본 이벤트 핸들러 등록
     
     Args:
         mqtt_service: MQTT 서비스 인스턴스
         local_cache: LocalCache 인스턴스 (선택, 재고 동기화용)
-        sheets_sync: SheetsSync 인스턴스 (선택, 상품 자동 동기화용)
+        sheets_sync: SheetsSync 인스턴스 또는 반환 함수 (선택, 상품 자동 동기화용 -
+                     함수면 호출 시점에 조회하므로 Sheets가 나중에 연결돼도 됨)
         event_logger: EventLogger 인스턴스 (선택, 비즈니스 이벤트 로깅용)
+        state_publisher: DeviceStatePublisher 인스턴스 (선택, 키오스크 실시간 재고/상태 푸시용)
     """
     # 정상 작동 이벤트
     mqtt_service.register_event_handler('boot_complete', handle_boot_complete)
@@ -492,17 +505,18 @@ def register_default_handlers(mqtt_service: MQTTService, local_cache=None, sheet
             )
             
             product_id = device_info.get('product_id', '')
-            print(f"[Event] ✅ {device_uuid} 기기+상품 등록 완료")
-            print(f"        상품ID: {product_id}, 상품명: {device_name or category}")
+            logger.info(f"[Event] ✅ {device_uuid} 기기+상품 등록 완료")
+            logger.info(f"        상품ID: {product_id}, 상품명: {device_name or category}")
             
             # 새 상품 등록 시 즉시 Google Sheets 동기화
-            if sheets_sync and product_id:
+            sync = sheets_sync() if callable(sheets_sync) else sheets_sync
+            if sync and product_id:
                 try:
-                    count = sheets_sync.upload_products(local_cache)
+                    count = sync.upload_products(local_cache)
                     if count > 0:
-                        print(f"[Event] 📤 Google Sheets 상품 동기화: {count}개")
+                        logger.info(f"[Event] 📤 Google Sheets 상품 동기화: {count}개")
                 except Exception as e:
-                    print(f"[Event] Sheets 동기화 실패: {e}")
+                    logger.warning(f"[Event] Sheets 동기화 실패: {e}")
         
         def handle_heartbeat_with_cache(device_uuid: str, payload: Dict):
             """하트비트 시 상태 업데이트"""
@@ -633,9 +647,10 @@ def register_default_handlers(mqtt_service: MQTTService, local_cache=None, sheet
                 )
                 local_cache.update_device_status(device_uuid, size=size, stock=stock)
                 
-                if sheets_sync and device_info.get('product_id'):
+                sync = sheets_sync() if callable(sheets_sync) else sheets_sync
+                if sync and device_info.get('product_id'):
                     try:
-                        sheets_sync.upload_products(local_cache)
+                        sync.upload_products(local_cache)
                     except:
                         pass
             # 비즈니스 이벤트 로깅
@@ -656,9 +671,23 @@ def register_default_handlers(mqtt_service: MQTTService, local_cache=None, sheet
         mqtt_service.register_event_handler('door_closed', handle_door_closed_with_logger)
         mqtt_service.register_event_handler('boot_complete', handle_boot_complete_with_logger)
         mqtt_service.register_event_handler('error', handle_error_with_logger)
-        print("[MQTT] EventLogger 연동 핸들러 등록 완료")
-    
-    print("[MQTT] 기본 핸들러 등록 완료")
+        logger.info("[MQTT] EventLogger 연동 핸들러 등록 완료")
+    
+    # 키오스크 실시간 푸시 (위에서 등록된 핸들러가 캐시를 갱신한 뒤 변경분만 emit)
+    if state_publisher:
+        def with_state_push(handler: Callable) -> Callable:
+            def handler_with_push(device_uuid: str, payload: Dict):
+                handler(device_uuid, payload)
+                state_publisher.publish(device_uuid)
+            return handler_with_push
+        
+        for event_type in ('dispense_complete', 'stock_updated', 'heartbeat', 'door_closed', 'status'):
+            handler = mqtt_service.event_handlers.get(event_type)
+            if handler:
+                mqtt_service.register_event_handler(event_type, with_state_push(handler))
+        logger.info("[MQTT] 실시간 상태 푸시 연동 완료")
+    
+    logger.info("[MQTT] 기본 핸들러 등록 완료")
 
 
 # =============================
@@ -0,0 +1,219 @@
+"""
+NFC 이벤트 전달 서비스
+
+NFC 태그 처리 결과(회원 조회 성공/실패)를 키오스크 화면으로 전달
+- Socket.IO 푸시: 'nfc_detected' (성공) / 'nfc_error' (실패) 즉시 emit
+- 롱폴링 대체 경로: 새 이벤트가 올 때까지 요청을 붙잡고 대기 (Socket.IO 미연결 시)
+
+이벤트마다 증가하는 seq를 붙여 두 경로로 같은 이벤트를 받아도 화면은 한 번만 처리.
+seq는 서버 시작 시각(ms)에서 시작하므로 재시작 후에도 이전 값보다 큼.
+
+구독자(화면/탭)별 전달 위치
+- 롱폴링에 subscriber를 주면 서버가 구독자별로 마지막 전달 seq를 기억 → 이벤트를 구독자마다 정확히 한 번 전달
+  (같은 구독자의 요청이 겹쳐도 한 요청만 받음, 다른 화면의 폴링이 이벤트를 가져가지 않음)
+- subscriber_ttl 동안 폴링이 없는 구독자는 삭제 (페이지를 닫은 탭)
+- subscriber도 after도 없는 기존 클라이언트는 하나의 공용 위치를 같이 씀
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class NFCEventBus:
+    """NFC 이벤트 발행/대기 (Socket.IO emit + 롱폴링)"""
+    
+    EVENT_DETECTED = 'nfc_detected'
+    EVENT_ERROR = 'nfc_error'
+    
+    LEGACY_SUBSCRIBER = ''
+    
+    def __init__(self, socketio=None, history_size: int = 20, max_age: float = 10.0,
+                 subscriber_ttl: float = 60.0, max_subscribers: int = 32):
+        """
+        초기화
+        
+        Args:
+            socketio: flask_socketio.SocketIO 인스턴스 (None이면 롱폴링만)
+            history_size: 롱폴링용으로 보관할 최근 이벤트 수
+            max_age: 이 시간(초)이 지난 이벤트는 전달하지 않음 (뒤늦은 자동 로그인 방지)
+            subscriber_ttl: 폴링이 없으면 구독자를 삭제할 시간 (초)
+            max_subscribers: 최대 구독자 수 (넘으면 가장 오래 폴링 안 한 구독자부터 삭제)
+        """
+        self.socketio = socketio
+        self.max_age = max_age
+        self.subscriber_ttl = subscriber_ttl
+        self.max_subscribers = max_subscribers
+        
+        self._cond = threading.Condition()
+        self._events = deque(maxlen=history_size)
+        self._seq = int(time.time() * 1000)
+        
+        # {subscriber: {'seq': 마지막 전달 seq, 'last_seen': 마지막 폴링 시각, 'waiting': 대기 중 요청 수}}
+        self._subscribers: Dict[str, Dict] = {}
+        self._get_subscriber(self.LEGACY_SUBSCRIBER)  # 기존 클라이언트는 서버 시작 시점부터
+        
+        self.stats = {'published': 0, 'emitted': 0, 'emit_failed': 0, 'delivered': 0, 'expired_subscribers': 0}
+    
+    @property
+    def last_seq(self) -> int:
+        """마지막으로 발행한 이벤트 seq"""
+        with self._cond:
+            return self._seq
+    
+    def publish(self, event: Dict) -> Dict:
+        """
+        이벤트 발행 (대기 중인 롱폴링 요청 깨우고 Socket.IO로 emit)
+        
+        Args:
+            event: {'success': bool, 'nfc_uid': ..., 성공 시 'member_id'/'name'/'locker_number',
+                    실패 시 'message'}
+        
+        Returns:
+            seq가 붙은 이벤트
+        """
+        with self._cond:
+            self._seq += 1
+            event = dict(event, seq=self._seq)
+            self._events.append((time.monotonic(), event))
+            self.stats['published'] += 1
+            self._cond.notify_all()
+        
+        if self.socketio is not None:
+            name = self.EVENT_DETECTED if event.get('success') else self.EVENT_ERROR
+            try:
+                self.socketio.emit(name, event)
+                self.stats['emitted'] += 1
+            except Exception as e:
+                self.stats['emit_failed'] += 1
+                logger.warning(f"[NFCEvents] Socket.IO emit 실패: {e}")
+        
+        logger.debug("[NFCEvents] 이벤트 발행: seq=%d, success=%s", event['seq'], event.get('success'))
+        return event
+    
+    def publish_member(self, nfc_uid: str, member: Dict) -> Dict:
+        """회원 조회 성공 이벤트 발행"""
+        return self.publish({
+            'nfc_uid': nfc_uid,
+            'member_id': member['member_id'],
+            'name': member.get('name', ''),
+            'locker_number': member.get('locker_number', ''),
+            'success': True
+        })
+    
+    def publish_error(self, nfc_uid: str, message: str) -> Dict:
+        """회원 조회 실패 이벤트 발행"""
+        return self.publish({
+            'nfc_uid': nfc_uid,
+            'success': False,
+            'message': message
+        })
+    
+    def _next_event(self, after: int) -> Optional[Dict]:
+        """after 이후 첫 유효 이벤트 (_cond 안에서 호출)"""
+        now = time.monotonic()
+        for published_at, event in self._events:
+            if event['seq'] > after and now - published_at <= self.max_age:
+                return event
+        return None
+    
+    # =============================
+    # 구독자별 전달
+    # =============================
+    
+    def _get_subscriber(self, subscriber: str, after: int = None) -> Dict:
+        """구독자 조회/등록 (_cond 안에서 호출, 새 구독자는 after 또는 현재 seq부터)"""
+        now = time.monotonic()
+        sub = self._subscribers.get(subscriber)
+        if sub is None:
+            self._prune_subscribers(now)
+            sub = {'seq': self._seq if after is None else after, 'last_seen': now, 'waiting': 0}
+            self._subscribers[subscriber] = sub
+            logger.debug("[NFCEvents] 구독자 등록: %s (seq=%d)", subscriber or 'legacy', sub['seq'])
+        sub['last_seen'] = now
+        return sub
+    
+    def _prune_subscribers(self, now: float):
+        """오래 폴링하지 않은 구독자 삭제 (_cond 안에서 호출, 대기 중인 구독자와 공용 위치는 유지)"""
+        idle = [(sub['last_seen'], name) for name, sub in self._subscribers.items()
+                if name != self.LEGACY_SUBSCRIBER and sub['waiting'] == 0]
+        idle.sort()
+        
+        overflow = len(self._subscribers) + 1 - self.max_subscribers
+        for index, (last_seen, name) in enumerate(idle):
+            if index < overflow or now - last_seen > self.subscriber_ttl:
+                del self._subscribers[name]
+                self.stats['expired_subscribers'] += 1
+    
+    def subscribe(self, subscriber: str) -> int:
+        """
+        구독자 등록 (이후 발행되는 이벤트부터 전달)
+        
+        Returns:
+            구독자의 현재 전달 위치 seq
+        """
+        with self._cond:
+            return self._get_subscriber(subscriber)['seq']
+    
+    def unsubscribe(self, subscriber: str):
+        """구독자 삭제"""
+        with self._cond:
+            self._subscribers.pop(subscriber, None)
+    
+    @property
+    def subscriber_count(self) -> int:
+        """현재 구독자 수 (공용 위치 제외)"""
+        with self._cond:
+            return sum(1 for name in self._subscribers if name != self.LEGACY_SUBSCRIBER)
+    
+    def wait(self, after: int = None, timeout: float = 0.0, subscriber: str = None) -> Optional[Dict]:
+        """
+        after 이후 이벤트 대기 (롱폴링)
+        
+        Args:
+            after: 클라이언트가 마지막으로 처리한 seq
+            timeout: 최대 대기 시간 (초, 0이면 즉시 반환)
+            subscriber: 구독자 ID (주면 서버가 전달 위치를 기억해 구독자마다 한 번만 전달,
+                        after와 함께 주면 둘 중 큰 값 이후부터)
+                        after도 subscriber도 없으면 공용 위치 사용 (기존 폴링 방식)
+        
+        Returns:
+            이벤트 또는 None (timeout)
+        """
+        deadline = time.monotonic() + max(0.0, timeout)
+        
+        if subscriber is None and after is None:
+            subscriber = self.LEGACY_SUBSCRIBER
+        
+        with self._cond:
+            sub = self._get_subscriber(subscriber, after) if subscriber is not None else None
+            if sub is not None:
+                sub['waiting'] += 1
+            
+            try:
+                while True:
+                    # 대기 중 같은 구독자의 다른 요청이 가져갔을 수 있으므로 매번 위치를 다시 읽음
+                    if sub is None:
+                        cursor = after
+                    else:
+                        cursor = sub['seq'] if after is None else max(sub['seq'], after)
+                    
+                    event = self._next_event(cursor)
+                    if event is not None:
+                        if sub is not None:
+                            sub['seq'] = event['seq']
+                        self.stats['delivered'] += 1
+                        return event
+                    
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return None
+                    self._cond.wait(remaining)
+            finally:
+                if sub is not None:
+                    sub['waiting'] -= 1
+                    sub['last_seen'] = time.monotonic()
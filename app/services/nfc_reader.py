@@ -1,94 +1,182 @@
 """
 NFC 리더 서비스
 ESP32로부터 NFC UID를 시리얼로 수신
+
+- 수신 스레드는 read()에서 블로킹 대기 (포트 timeout까지, 유휴 시 CPU 사용 없음)
+- 받은 바이트는 재사용 버퍼에 이어 붙이고 줄바꿈 단위로 잘라 처리 (줄이 여러 read에 걸쳐도 됨)
+- 시리얼 오류(USB 분리 등) 시 포트를 닫고 reconnect_interval마다 재연결
+- 카드를 리더에 대고 있으면 ESP32가 같은 UID를 반복 전송 → 같은 UID가 debounce_seconds 안에
+  다시 오면 무시 (마지막 수신 기준이므로 계속 대고 있는 동안은 한 번만 처리)
 """
 
+import logging
 import serial
 import json
 import threading
 import time
-from typing import Callable, Optional
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
 
 
 class NFCReaderService:
     """ESP32 NFC 리더와 시리얼 통신"""
     
-    def __init__(self, port: str = '/dev/ttyUSB0', baudrate: int = 115200):
+    MAX_LINE = 1024  # 줄바꿈 없이 이보다 길어지면 버림 (노이즈/보드 리셋 출력)
+    
+    def __init__(self, port: str = '/dev/ttyUSB0', baudrate: int = 115200,
+                 read_timeout: float = 1.0, reconnect_interval: float = 2.0,
+                 debounce_seconds: float = 1.5):
         """
         초기화
         
         Args:
             port: 시리얼 포트 (예: /dev/ttyUSB0, /dev/ttyACM0)
             baudrate: 통신 속도 (ESP32와 동일해야 함)
+            read_timeout: read() 최대 대기 시간 (초, 중지 요청 확인 주기)
+            reconnect_interval: 시리얼 오류 후 재연결 시도 간격 (초)
+            debounce_seconds: 같은 UID 반복 수신 무시 시간 (초, 0이면 끔)
         """
         self.port = port
         self.baudrate = baudrate
+        self.read_timeout = read_timeout
+        self.reconnect_interval = reconnect_interval
+        self.debounce_seconds = debounce_seconds
         self.serial_conn: Optional[serial.Serial] = None
         self.running = False
         self.thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._buffer = bytearray()
+        self._last_seen: Dict[str, float] = {}  # {nfc_uid: 마지막 수신 시각}
         
         # NFC UID 수신 콜백
         self.on_nfc_detected: Optional[Callable[[str], None]] = None
         
+        self.stats = {'lines': 0, 'taps': 0, 'suppressed': 0, 'reconnects': 0, 'overflows': 0}
+    
     def connect(self) -> bool:
         """시리얼 포트 연결"""
         try:
             self.serial_conn = serial.Serial(
                 port=self.port,
                 baudrate=self.baudrate,
-                timeout=1.0
+                timeout=self.read_timeout
             )
-            print(f"[NFC Reader] ✓ 연결 성공: {self.port}")
+            logger.info(f"[NFC Reader] ✓ 연결 성공: {self.port}")
             return True
         except serial.SerialException as e:
-            print(f"[NFC Reader] ✗ 연결 실패: {e}")
-            print(f"[NFC Reader] 포트 확인: ls -l /dev/ttyUSB* /dev/ttyACM*")
+            logger.error(f"[NFC Reader] ✗ 연결 실패: {e}")
+            logger.warning(f"[NFC Reader] 포트 확인: ls -l /dev/ttyUSB* /dev/ttyACM*")
             return False
         except Exception as e:
-            print(f"[NFC Reader] ✗ 예외 발생: {e}")
+            logger.error(f"[NFC Reader] ✗ 예외 발생: {e}")
             return False
     
     def start(self):
-        """백그라운드 스레드에서 NFC UID 수신 시작"""
+        """
+        백그라운드 스레드에서 NFC UID 수신 시작
+        
+        부팅 시 포트가 아직 없어도(USB 늦게 인식, 리더 분리 상태) 스레드는 시작하고
+        수신 루프가 reconnect_interval마다 포트를 다시 찾음
+        """
         if self.running:
-            print("[NFC Reader] 이미 실행 중")
+            logger.info("[NFC Reader] 이미 실행 중")
             return
         
         if not self.serial_conn or not self.serial_conn.is_open:
             if not self.connect():
-                print("[NFC Reader] 시리얼 연결 실패, 건너뜀")
-                return
+                logger.warning(f"[NFC Reader] 시리얼 연결 실패, {self.reconnect_interval:g}초마다 재연결 시도")
         
         self.running = True
-        self.thread = threading.Thread(target=self._read_loop, daemon=True)
+        self._stop_event.clear()
+        self.thread = threading.Thread(target=self._read_loop, daemon=True, name='nfc-reader')
         self.thread.start()
-        print("[NFC Reader] 시리얼 리스닝 시작")
+        logger.info("[NFC Reader] 시리얼 리스닝 시작")
     
     def stop(self):
         """NFC 리더 중지"""
         self.running = False
+        self._stop_event.set()
+        conn = self.serial_conn
+        if conn is not None and conn.is_open and hasattr(conn, 'cancel_read'):
+            conn.cancel_read()  # 블로킹 read() 즉시 해제 (POSIX)
         if self.thread:
             self.thread.join(timeout=2.0)
         if self.serial_conn and self.serial_conn.is_open:
             self.serial_conn.close()
-        print("[NFC Reader] 중지")
+        logger.info("[NFC Reader] 중지")
     
     def _read_loop(self):
-        """시리얼 데이터 읽기 루프"""
+        """시리얼 데이터 읽기 루프 (블로킹 read + 줄 단위 분리, 오류 시 재연결)"""
         while self.running:
+            conn = self.serial_conn
+            if conn is None or not conn.is_open:
+                if not self._reconnect():
+                    continue
+                conn = self.serial_conn
+            
             try:
-                if self.serial_conn and self.serial_conn.in_waiting > 0:
-                    line = self.serial_conn.readline().decode('utf-8').strip()
-                    
-                    if line:
-                        self._process_line(line)
-                        
+                # 첫 바이트까지 블로킹(최대 read_timeout), 이미 도착한 나머지는 한 번에
+                chunk = conn.read(conn.in_waiting or 1)
             except serial.SerialException as e:
-                print(f"[NFC Reader] 시리얼 오류: {e}")
-                time.sleep(1.0)
+                if self.running:
+                    logger.error(f"[NFC Reader] 시리얼 오류: {e}")
+                    self._close_port()
+                continue
             except Exception as e:
-                print(f"[NFC Reader] 읽기 오류: {e}")
-                time.sleep(1.0)
+                logger.error(f"[NFC Reader] 읽기 오류: {e}")
+                self._stop_event.wait(1.0)
+                continue
+            
+            if chunk:
+                self._feed(chunk)
+    
+    def _feed(self, chunk: bytes):
+        """수신 바이트를 버퍼에 추가하고 완성된 줄 처리"""
+        buffer = self._buffer
+        buffer += chunk
+        
+        start = 0
+        while True:
+            end = buffer.find(b'\n', start)
+            if end < 0:
+                break
+            line = buffer[start:end].decode('utf-8', errors='replace').strip()
+            start = end + 1
+            if line:
+                self.stats['lines'] += 1
+                self._process_line(line)
+        del buffer[:start]
+        
+        if len(buffer) > self.MAX_LINE:
+            self.stats['overflows'] += 1
+            logger.warning(f"[NFC Reader] 줄바꿈 없는 데이터 {len(buffer)}바이트 버림")
+            buffer.clear()
+    
+    def _close_port(self):
+        """오류 난 포트 닫기 (미완성 줄 버림)"""
+        try:
+            if self.serial_conn:
+                self.serial_conn.close()
+        except Exception:
+            pass
+        self._buffer.clear()
+    
+    def _reconnect(self) -> bool:
+        """reconnect_interval 대기 후 포트 재연결"""
+        if self._stop_event.wait(self.reconnect_interval):
+            return False
+        
+        try:
+            self.serial_conn = serial.Serial(port=self.port, baudrate=self.baudrate,
+                                             timeout=self.read_timeout)
+        except (serial.SerialException, OSError) as e:
+            logger.debug("[NFC Reader] 재연결 실패: %s", e)
+            return False
+        
+        self.stats['reconnects'] += 1
+        logger.info(f"[NFC Reader] ✓ 재연결 성공: {self.port}")
+        return True
     
     def _process_line(self, line: str):
         """
@@ -101,26 +189,47 @@ class NFCReaderService:
             nfc_uid = data.get('nfc_uid')
             
             if nfc_uid:
-                print(f"[NFC Reader] ← NFC 태그 감지: {nfc_uid}")
+                if self._is_repeat(nfc_uid):
+                    self.stats['suppressed'] += 1
+                    logger.debug("[NFC Reader] 반복 태그 무시: %s", nfc_uid)
+                    return
+                
+                self.stats['taps'] += 1
+                logger.debug("[NFC Reader] ← NFC 태그 감지: %s", nfc_uid)
                 
                 # 콜백 실행
                 if self.on_nfc_detected:
                     try:
                         self.on_nfc_detected(nfc_uid)
                     except Exception as e:
-                        print(f"[NFC Reader] 콜백 실행 오류: {e}")
+                        logger.error(f"[NFC Reader] 콜백 실행 오류: {e}")
             else:
-                print(f"[NFC Reader] nfc_uid 없음: {line}")
+                logger.warning(f"[NFC Reader] nfc_uid 없음: {line}")
                 
         except json.JSONDecodeError:
             # JSON이 아닌 일반 텍스트 (디버그 메시지 등)
             if line.startswith('{'):
-                print(f"[NFC Reader] JSON 파싱 실패: {line}")
+                logger.warning(f"[NFC Reader] JSON 파싱 실패: {line}")
             else:
                 # 디버그 메시지는 무시
                 pass
         except Exception as e:
-            print(f"[NFC Reader] 처리 오류: {e}")
+            logger.error(f"[NFC Reader] 처리 오류: {e}")
+    
+    def _is_repeat(self, nfc_uid: str) -> bool:
+        """같은 UID가 debounce_seconds 안에 다시 왔는지 (수신 스레드에서만 호출)"""
+        if self.debounce_seconds <= 0:
+            return False
+        
+        now = time.monotonic()
+        last = self._last_seen.get(nfc_uid)
+        self._last_seen[nfc_uid] = now
+        
+        if len(self._last_seen) > 64:
+            self._last_seen = {uid: seen for uid, seen in self._last_seen.items()
+                               if now - seen < self.debounce_seconds}
+        
+        return last is not None and now - last < self.debounce_seconds
     
     def set_callback(self, callback: Callable[[str], None]):
         """
@@ -130,7 +239,7 @@ class NFCReaderService:
             callback: NFC UID를 인자로 받는 함수
         """
         self.on_nfc_detected = callback
-        print("[NFC Reader] 콜백 등록 완료")
+        logger.info("[NFC Reader] 콜백 등록 완료")
     
     def is_connected(self) -> bool:
         """연결 상태 확인"""
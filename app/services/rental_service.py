@@ -11,15 +11,18 @@
 7. 대여 로그 기록
 """
 
+import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 import threading
 
+logger = logging.getLogger(__name__)
+
 # 옵셔널 임포트
 try:
     from app.services.local_cache import LocalCache, get_kst_now
 except Exception as e:
-    print(f"[RentalService] LocalCache 임포트 실패: {e}")
+    logger.warning(f"[RentalService] LocalCache 임포트 실패: {e}")
     LocalCache = None
     def get_kst_now():
         return datetime.now()
@@ -27,15 +30,9 @@ except Exception as e:
 try:
     from app.services.mqtt_service import MQTTService
 except Exception as e:
-    print(f"[RentalService] MQTTService 임포트 실패: {e}")
+    logger.warning(f"[RentalService] MQTTService 임포트 실패: {e}")
     MQTTService = None
 
-try:
-    from app.services.event_logger import EventLogger
-except Exception as e:
-    print(f"[RentalService] EventLogger 임포트 실패: {e}")
-    EventLogger = None
-
 
 class DispenseResult:
     """DISPENSE 응답 대기를 위한 클래스"""
@@ -68,15 +65,22 @@ class RentalService:
     _pending_dispense: Dict[str, DispenseResult] = {}
     _pending_lock = threading.Lock()
     
-    def __init__(self, local_cache=None, mqtt_service=None):
-        """초기화"""
+    def __init__(self, local_cache=None, mqtt_service=None, event_logger=None):
+        """
+        초기화
+        
+        Args:
+            local_cache: LocalCache 인스턴스 (없으면 새로 생성)
+            mqtt_service: MQTTService 인스턴스 (나중에 set_mqtt_service로 주입 가능)
+            event_logger: 앱 공용 EventLogger (버퍼/기록 스레드를 따로 만들지 않음, 없으면 이벤트 기록 생략)
+        """
         if local_cache:
             self.local_cache = local_cache
         elif LocalCache:
             try:
                 self.local_cache = LocalCache()
             except Exception as e:
-                print(f"[RentalService] LocalCache 초기화 실패: {e}")
+                logger.warning(f"[RentalService] LocalCache 초기화 실패: {e}")
                 self.local_cache = None
         else:
             self.local_cache = None
@@ -84,13 +88,7 @@ class RentalService:
         self._mqtt_service = mqtt_service
         self._handlers_registered = False
         
-        # EventLogger 초기화
-        self._event_logger = None
-        if self.local_cache and EventLogger:
-            try:
-                self._event_logger = EventLogger(self.local_cache)
-            except Exception as e:
-                print(f"[RentalService] EventLogger 초기화 실패: {e}")
+        self._event_logger = event_logger
     
     def set_mqtt_service(self, mqtt_service):
         """외부에서 MQTT 서비스 주입"""
@@ -102,7 +100,7 @@ class RentalService:
     def mqtt_service(self) -> Optional[MQTTService]:
         """MQTT 서비스"""
         if self._mqtt_service is None:
-            print("[RentalService] ⚠️ MQTT 서비스가 설정되지 않음")
+            logger.warning("[RentalService] ⚠️ MQTT 서비스가 설정되지 않음")
             return None
         
         if not self._handlers_registered:
@@ -127,19 +125,19 @@ class RentalService:
             with self._pending_lock:
                 if device_uuid in self._pending_dispense:
                     self._pending_dispense[device_uuid].set_success(stock)
-                    print(f"[RentalService] ✅ DISPENSE 성공: {device_uuid}, 재고: {stock}")
+                    logger.info(f"[RentalService] ✅ DISPENSE 성공: {device_uuid}, 재고: {stock}")
         
         def on_dispense_failed(device_uuid: str, payload: dict):
             reason = payload.get('reason', 'unknown')
             with self._pending_lock:
                 if device_uuid in self._pending_dispense:
                     self._pending_dispense[device_uuid].set_failed(reason)
-                    print(f"[RentalService] ❌ DISPENSE 실패: {device_uuid}, 이유: {reason}")
+                    logger.warning(f"[RentalService] ❌ DISPENSE 실패: {device_uuid}, 이유: {reason}")
         
         self._mqtt_service.register_event_handler('dispense_complete', on_dispense_complete)
         self._mqtt_service.register_event_handler('dispense_failed', on_dispense_failed)
         self._handlers_registered = True
-        print("[RentalService] DISPENSE 응답 핸들러 등록 완료")
+        logger.info("[RentalService] DISPENSE 응답 핸들러 등록 완료")
     
     def _dispense_and_wait(self, device_uuid: str, timeout: float = 10.0) -> DispenseResult:
         """DISPENSE 명령 전송 후 응답 대기"""
@@ -160,7 +158,7 @@ class RentalService:
             
             if not result.wait(timeout):
                 result.set_failed("timeout")
-                print(f"[RentalService] ⏰ DISPENSE 타임아웃: {device_uuid}")
+                logger.warning(f"[RentalService] ⏰ DISPENSE 타임아웃: {device_uuid}")
         finally:
             with self._pending_lock:
                 self._pending_dispense.pop(device_uuid, None)
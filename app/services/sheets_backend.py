@@ -0,0 +1,409 @@
+"""
+스프레드시트 백엔드
+
+SheetsSync / IntegrationSync가 사용하는 스프레드시트 접근 계층
+- GspreadBackend: 실제 Google Sheets (gspread + 서비스 계정)
+- FakeSheetsBackend: 프로세스 내 메모리 시트 (네트워크/인증 없이 동기화 테스트·벤치마크용)
+
+credentials_path 대신 "fake://" URL을 주면 가짜 백엔드 선택:
+    fake://?latency=0.2&jitter=0.05&quota=60&error_rate=0.01&seed=42
+    - latency: 호출당 지연 (초)
+    - jitter: 지연 편차 (초, 균등 분포)
+    - quota: 분당 최대 호출 수 (초과 시 429)
+    - error_rate: 무작위 429 발생 확률 (0~1)
+    - seed: 난수 시드 (재현 가능한 벤치마크용)
+"""
+
+import random
+import re
+from abc import ABC, abstractmethod
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+from urllib.parse import urlparse, parse_qs
+
+try:
+    import gspread
+    from gspread import WorksheetNotFound, SpreadsheetNotFound
+    GSPREAD_AVAILABLE = True
+except ImportError:
+    GSPREAD_AVAILABLE = False
+    
+    class WorksheetNotFound(Exception):
+        """워크시트 없음 (gspread 미설치 시 대체)"""
+    
+    class SpreadsheetNotFound(Exception):
+        """스프레드시트 없음 (gspread 미설치 시 대체)"""
+
+
+FAKE_SCHEME = 'fake://'
+
+
+class SpreadsheetBackend(ABC):
+    """스프레드시트 백엔드 인터페이스 (메서드를 다 구현하지 않은 백엔드는 생성 시 TypeError)"""
+    
+    @abstractmethod
+    def open(self, spreadsheet_name: str):
+        """이름으로 스프레드시트 열기 (gspread.Spreadsheet 호환 객체 반환)"""
+    
+    @abstractmethod
+    def open_by_key(self, key: str):
+        """키(ID)로 스프레드시트 열기"""
+
+
+class GspreadBackend(SpreadsheetBackend):
+    """실제 Google Sheets 백엔드"""
+    
+    SCOPE = [
+        'https://spreadsheets.google.com/feeds',
+        'https://www.googleapis.com/auth/drive'
+    ]
+    
+    def __init__(self, credentials_path: str):
+        """
+        초기화
+        
+        Args:
+            credentials_path: Google 서비스 계정 JSON 키 파일 경로
+        """
+        self.credentials_path = credentials_path
+        self.client = None
+    
+    def _authorize(self):
+        """서비스 계정 인증 (최초 1회)"""
+        if self.client is None:
+            from oauth2client.service_account import ServiceAccountCredentials
+            
+            creds = ServiceAccountCredentials.from_json_keyfile_name(
+                self.credentials_path, self.SCOPE
+            )
+            self.client = gspread.authorize(creds)
+        return self.client
+    
+    def open(self, spreadsheet_name: str):
+        return self._authorize().open(spreadsheet_name)
+    
+    def open_by_key(self, key: str):
+        return self._authorize().open_by_key(key)
+
+
+# =============================
+# 가짜 백엔드 (메모리)
+# =============================
+
+class QuotaExceededError(Exception):
+    """가짜 백엔드의 429 (RESOURCE_EXHAUSTED) 응답"""
+    
+    status_code = 429
+    
+    def __init__(self, message: str = 'Quota exceeded (429)'):
+        super().__init__(message)
+
+
+def _column_index(letters: str) -> int:
+    """A1 표기 열 문자 → 0부터 시작하는 인덱스"""
+    index = 0
+    for ch in letters.upper():
+        index = index * 26 + (ord(ch) - 64)
+    return index - 1
+
+
+def _parse_a1(cell: str):
+    """'B3' → (row, col) 0 기반. 숫자 생략 시 row=0"""
+    match = re.fullmatch(r'([A-Za-z]+)(\d*)', cell.strip())
+    if not match:
+        raise ValueError(f"잘못된 셀 주소: {cell}")
+    letters, digits = match.groups()
+    row = int(digits) - 1 if digits else 0
+    return row, _column_index(letters)
+
+
+class FakeWorksheet:
+    """메모리 워크시트 (gspread.Worksheet에서 SheetsSync가 쓰는 메서드만 구현)"""
+    
+    def __init__(self, spreadsheet: 'FakeSpreadsheet', title: str, rows: int = 1000, cols: int = 26):
+        self.spreadsheet = spreadsheet
+        self.title = title
+        self.row_count = rows
+        self.col_count = cols
+        self._rows: List[List] = []
+    
+    # 읽기
+    
+    def get_all_values(self) -> List[List]:
+        self.spreadsheet._call('get_all_values')
+        with self.spreadsheet.lock:
+            return [list(row) for row in self._rows]
+    
+    def get_all_records(self) -> List[Dict]:
+        self.spreadsheet._call('get_all_records')
+        with self.spreadsheet.lock:
+            if not self._rows:
+                return []
+            headers = self._rows[0]
+            records = []
+            for row in self._rows[1:]:
+                padded = list(row) + [''] * (len(headers) - len(row))
+                records.append(dict(zip(headers, padded)))
+            return records
+    
+    def col_values(self, col: int) -> List:
+        """열 전체 값 (1부터 시작, 끝의 빈 칸 제외)"""
+        self.spreadsheet._call('col_values')
+        with self.spreadsheet.lock:
+            values = [row[col - 1] if len(row) >= col else '' for row in self._rows]
+        while values and values[-1] in ('', None):
+            values.pop()
+        return values
+    
+    def get(self, range_name: str) -> List[List]:
+        self.spreadsheet._call('get')
+        start, _, end = range_name.partition(':')
+        r0, c0 = _parse_a1(start)
+        r1, c1 = _parse_a1(end) if end else (r0, c0)
+        with self.spreadsheet.lock:
+            return [list(row[c0:c1 + 1]) for row in self._rows[r0:r1 + 1] if row[c0:c1 + 1]]
+    
+    # 쓰기
+    
+    def append_row(self, values: List):
+        self.append_rows([values])
+    
+    def append_rows(self, values: List[List]) -> Dict:
+        """행 추가 (gspread와 같은 형식의 응답 반환: updates.updatedRange)"""
+        self.spreadsheet._call('append_rows', rows=len(values), payload=values)
+        with self.spreadsheet.lock:
+            start = len(self._rows) + 1
+            self._rows.extend(list(row) for row in values)
+            self.row_count = max(self.row_count, len(self._rows))
+            end = len(self._rows)
+        width = max((len(row) for row in values), default=1)
+        return {
+            'updates': {
+                'updatedRange': f"'{self.title}'!A{start}:{chr(64 + width)}{end}",
+                'updatedRows': len(values),
+            }
+        }
+    
+    def update(self, range_name: str, values: List[List] = None):
+        # gspread 6.x 호출 순서 (values, range_name)도 허용
+        if isinstance(range_name, list):
+            range_name, values = values, range_name
+        
+        self.spreadsheet._call('update', rows=len(values), payload=values)
+        self._write(range_name, values)
+    
+    def batch_update(self, data: List[Dict]):
+        """여러 범위를 한 번의 호출로 갱신 ([{'range': 'G3', 'values': [[...]]}, ...])"""
+        payload = [item['values'] for item in data]
+        self.spreadsheet._call('batch_update', rows=sum(len(v) for v in payload), payload=payload)
+        for item in data:
+            self._write(item['range'], item['values'])
+    
+    def _write(self, range_name: str, values: List[List]):
+        r0, c0 = _parse_a1(range_name.partition(':')[0])
+        with self.spreadsheet.lock:
+            while len(self._rows) < r0 + len(values):
+                self._rows.append([])
+            for offset, new_row in enumerate(values):
+                row = self._rows[r0 + offset]
+                if len(row) < c0 + len(new_row):
+                    row.extend([''] * (c0 + len(new_row) - len(row)))
+                row[c0:c0 + len(new_row)] = list(new_row)
+            self.row_count = max(self.row_count, len(self._rows))
+    
+    def clear(self):
+        self.spreadsheet._call('clear')
+        with self.spreadsheet.lock:
+            self._rows = []
+    
+    def format(self, range_name: str, cell_format: Dict):
+        self.spreadsheet._call('format')
+    
+    # 테스트/벤치마크용 (API 호출로 집계하지 않음)
+    
+    def load_rows(self, rows: List[List]):
+        """지연/쿼터 없이 행 직접 적재 (헤더 포함)"""
+        with self.spreadsheet.lock:
+            self._rows = [list(row) for row in rows]
+            self.row_count = max(self.row_count, len(self._rows))
+    
+    def __len__(self):
+        return len(self._rows)
+
+
+class FakeSpreadsheet:
+    """메모리 스프레드시트 (지연·쿼터·429 주입 가능)"""
+    
+    def __init__(self, title: str, backend: 'FakeSheetsBackend'):
+        self.title = title
+        self.id = title
+        self.backend = backend
+        self.lock = threading.RLock()
+        self._worksheets: Dict[str, FakeWorksheet] = {}
+    
+    def _call(self, method: str, rows: int = 0, payload=None):
+        self.backend._call(method, rows, payload)
+    
+    def worksheet(self, title: str) -> FakeWorksheet:
+        self._call('worksheet')
+        with self.lock:
+            if title not in self._worksheets:
+                raise WorksheetNotFound(title)
+            return self._worksheets[title]
+    
+    def worksheets(self) -> List[FakeWorksheet]:
+        self._call('worksheets')
+        with self.lock:
+            return list(self._worksheets.values())
+    
+    def add_worksheet(self, title: str, rows: int = 1000, cols: int = 26) -> FakeWorksheet:
+        self._call('add_worksheet')
+        with self.lock:
+            if title in self._worksheets:
+                raise ValueError(f"이미 존재하는 워크시트: {title}")
+            sheet = FakeWorksheet(self, title, rows, cols)
+            self._worksheets[title] = sheet
+            return sheet
+    
+    @property
+    def sheet1(self) -> FakeWorksheet:
+        with self.lock:
+            if not self._worksheets:
+                self._worksheets['Sheet1'] = FakeWorksheet(self, 'Sheet1')
+            return next(iter(self._worksheets.values()))
+    
+    def peek_worksheet(self, title: str) -> Optional[FakeWorksheet]:
+        """지연/쿼터 없이 워크시트 조회 (검증용, 없으면 None)"""
+        with self.lock:
+            return self._worksheets.get(title)
+    
+    def seed_worksheet(self, title: str, rows: List[List]) -> FakeWorksheet:
+        """지연/쿼터 없이 워크시트 생성 + 행 적재 (헤더 포함)"""
+        with self.lock:
+            sheet = self._worksheets.get(title)
+            if sheet is None:
+                sheet = FakeWorksheet(self, title, len(rows), len(rows[0]) if rows else 26)
+                self._worksheets[title] = sheet
+        sheet.load_rows(rows)
+        return sheet
+
+
+class FakeSheetsBackend(SpreadsheetBackend):
+    """
+    프로세스 내 가짜 Google Sheets
+    
+    모든 호출에 지연을 넣고, 분당 쿼터 초과나 무작위 확률로 429를 발생시켜
+    실제 API와 비슷한 조건에서 동기화 로직을 반복 측정할 수 있게 함
+    """
+    
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0,
+                 quota_per_minute: int = 0, error_rate: float = 0.0,
+                 seed: Optional[int] = None):
+        """
+        초기화
+        
+        Args:
+            latency: 호출당 기본 지연 (초)
+            jitter: 지연 편차 (초)
+            quota_per_minute: 분당 최대 호출 수 (0이면 무제한)
+            error_rate: 무작위 429 확률
+            seed: 난수 시드
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.quota_per_minute = quota_per_minute
+        self.error_rate = error_rate
+        
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._call_times = deque()
+        self._spreadsheets: Dict[str, FakeSpreadsheet] = {}
+        
+        # 호출 통계
+        self.stats = {
+            'calls': 0,
+            'errors': 0,
+            'rows_written': 0,
+            'by_method': {},
+        }
+    
+    @classmethod
+    def from_url(cls, url: str) -> 'FakeSheetsBackend':
+        """fake://?latency=...&quota=... 형식에서 생성"""
+        params = {k: v[-1] for k, v in parse_qs(urlparse(url).query).items()}
+        return cls(
+            latency=float(params.get('latency', 0)),
+            jitter=float(params.get('jitter', 0)),
+            quota_per_minute=int(params.get('quota', 0)),
+            error_rate=float(params.get('error_rate', 0)),
+            seed=int(params['seed']) if 'seed' in params else None,
+        )
+    
+    def _call(self, method: str, rows: int = 0, payload=None):
+        """API 호출 1회 시뮬레이션 (통계 → 쿼터/429 → 지연)"""
+        with self._lock:
+            now = time.monotonic()
+            self.stats['calls'] += 1
+            self.stats['by_method'][method] = self.stats['by_method'].get(method, 0) + 1
+            
+            if self.quota_per_minute:
+                while self._call_times and now - self._call_times[0] >= 60:
+                    self._call_times.popleft()
+                if len(self._call_times) >= self.quota_per_minute:
+                    self.stats['errors'] += 1
+                    raise QuotaExceededError(
+                        f"Quota exceeded: {self.quota_per_minute} requests/min ({method})"
+                    )
+                self._call_times.append(now)
+            
+            if self.error_rate and self._random.random() < self.error_rate:
+                self.stats['errors'] += 1
+                raise QuotaExceededError(f"Injected 429 ({method})")
+            
+            delay = self.latency
+            if self.jitter:
+                delay += self._random.uniform(-self.jitter, self.jitter)
+            
+            self.stats['rows_written'] += rows if payload is not None else 0
+        
+        if delay > 0:
+            time.sleep(delay)
+    
+    def _get(self, key: str, create: bool = True) -> FakeSpreadsheet:
+        with self._lock:
+            if key not in self._spreadsheets:
+                if not create:
+                    raise SpreadsheetNotFound(key)
+                self._spreadsheets[key] = FakeSpreadsheet(key, self)
+            return self._spreadsheets[key]
+    
+    def open(self, spreadsheet_name: str) -> FakeSpreadsheet:
+        self._call('open')
+        return self._get(spreadsheet_name)
+    
+    def open_by_key(self, key: str) -> FakeSpreadsheet:
+        self._call('open_by_key')
+        return self._get(key)
+    
+    def spreadsheet(self, name: str) -> FakeSpreadsheet:
+        """지연/쿼터 없이 스프레드시트 핸들 가져오기 (데이터 준비용)"""
+        return self._get(name)
+
+
+def is_fake_url(credentials_path) -> bool:
+    """가짜 백엔드 URL 여부"""
+    return str(credentials_path).startswith(FAKE_SCHEME)
+
+
+def create_backend(credentials_path) -> SpreadsheetBackend:
+    """
+    credentials_path에 맞는 백엔드 생성
+    
+    Args:
+        credentials_path: 서비스 계정 JSON 경로 또는 fake:// URL
+    """
+    if is_fake_url(credentials_path):
+        return FakeSheetsBackend.from_url(str(credentials_path))
+    return GspreadBackend(str(credentials_path))
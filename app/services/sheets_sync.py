@@ -6,74 +6,148 @@ Google Sheets ↔ SQLite 간 데이터 동기화
 - 업로드: 대여 이력, 금액권 거래, 기기 상태
 """
 
+import logging
 import gspread
-from oauth2client.service_account import ServiceAccountCredentials
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import hashlib
+import threading
 import time
 import json
+import re
+
+from app.services.sheets_backend import SpreadsheetBackend, WorksheetNotFound, create_backend
+from app.services.sync_metrics import SyncMetrics
+
+logger = logging.getLogger(__name__)
 
 
 class SheetsSync:
     """Google Sheets 동기화 클래스"""
     
-    def __init__(self, credentials_path: str, spreadsheet_name: str = 'F-BOX-DB-TEST'):
+    # 참조 데이터 시트 (SQLite 반영 순서 = FK 의존 순서)
+    REFERENCE_SHEETS = (
+        'members',
+        'products',
+        'voucher_products',
+        'subscription_products',
+        'member_vouchers',
+        'member_subscriptions',
+    )
+    
+    # 참조 관계 (부모 시트 조회에 실패하면 자식 시트도 이번 주기에 반영하지 않음)
+    REFERENCE_DEPENDS = {
+        'member_vouchers': ('members', 'voucher_products'),
+        'member_subscriptions': ('members', 'subscription_products'),
+    }
+    
+    # 시트별 로그 표시 (이름, 단위)
+    REFERENCE_LABELS = {
+        'members': ('회원 정보', '명'),
+        'products': ('상품 정보', '개'),
+        'voucher_products': ('금액권 상품', '개'),
+        'subscription_products': ('구독 상품', '개'),
+        'member_vouchers': ('회원 금액권', '개'),
+        'member_subscriptions': ('회원 구독권', '개'),
+    }
+    
+    # device_status 시트 컬럼
+    DEVICE_STATUS_HEADERS = [
+        'device_uuid', 'mac_address', 'device_name', 'category',
+        'size', 'stock', 'status', 'wifi_rssi',
+        'last_heartbeat', 'ip_address', 'firmware_version',
+        'first_seen_at', 'updated_at'
+    ]
+    
+    # heartbeat마다 바뀌는 컬럼 (device_volatile_interval 주기로만 기록)
+    DEVICE_VOLATILE_COLUMNS = ('wifi_rssi', 'last_heartbeat', 'updated_at')
+    
+    def __init__(self, credentials_path: str, spreadsheet_name: str = 'F-BOX-DB-TEST',
+                 download_workers: int = 6, backend: Optional[SpreadsheetBackend] = None):
         """
         초기화
         
         Args:
-            credentials_path: Google 서비스 계정 JSON 키 파일 경로
+            credentials_path: Google 서비스 계정 JSON 키 파일 경로 (또는 fake:// URL)
             spreadsheet_name: 스프레드시트 이름
+            download_workers: 참조 시트 병렬 다운로드 스레드 수
+            backend: 스프레드시트 백엔드 (None이면 credentials_path로 결정)
         """
         self.credentials_path = credentials_path
         self.spreadsheet_name = spreadsheet_name
+        self.backend = backend or create_backend(credentials_path)
         
         self.client = None
         self.spreadsheet = None
         
-        # API 호출 제한 관리
-        self.last_api_call = 0
-        self.min_interval = 1.0  # 최소 1초 간격
+        self.download_workers = download_workers
+        
+        # API 호출 제한 관리 (토큰 버킷, 스레드 간 공유)
+        # - rate_burst개까지는 바로 호출 (병렬 다운로드가 한 번에 시작)
+        # - 이후 min_interval마다 1개씩 보충
+        # 어느 60초 구간에서도 rate_burst + 60/min_interval ≤ quota_per_minute (Sheets 읽기 할당량 분당 60회)
+        self.quota_per_minute = 60
+        self.rate_burst = max(1, min(download_workers, self.quota_per_minute // 2))
+        self.min_interval = 60.0 / (self.quota_per_minute - self.rate_burst)
+        self._rate_tokens = float(self.rate_burst)
+        self._rate_updated = time.time()
+        self._rate_lock = threading.Lock()
+        self.last_download_failed: Dict[str, str] = {}  # 마지막 전체 다운로드에서 실패한 시트 {이름: 사유}
+        
+        # 테이블별 업로드 지표 (GET /api/sync/status)
+        self.metrics = SyncMetrics()
+        
+        # device_status 변경분 기록 상태
+        self.device_volatile_interval = 300  # RSSI/heartbeat 반영 간격 (초)
+        self.device_full_refresh_interval = 3600  # 전체 재작성 간격 (초, 시트 수동 편집 복구)
+        self._device_status_sheet = None
+        self._device_status_rows = None  # 마지막으로 시트에 쓴 데이터 행
+        self._device_status_hash = None
+        self._device_volatile_written_at = 0
+        self._device_full_written_at = 0
         
-        print(f"[Sheets] 초기화: {spreadsheet_name}")
+        logger.info(f"[Sheets] 초기화: {spreadsheet_name}")
     
     def connect(self) -> bool:
         """Google Sheets API 연결"""
         try:
-            scope = [
-                'https://spreadsheets.google.com/feeds',
-                'https://www.googleapis.com/auth/drive'
-            ]
-            
-            creds = ServiceAccountCredentials.from_json_keyfile_name(
-                self.credentials_path, scope
-            )
+            self.spreadsheet = self.backend.open(self.spreadsheet_name)
+            self.client = getattr(self.backend, 'client', None)
             
-            self.client = gspread.authorize(creds)
-            self.spreadsheet = self.client.open(self.spreadsheet_name)
-            
-            print(f"[Sheets] ✓ 연결 성공: {self.spreadsheet_name}")
+            logger.info(f"[Sheets] ✓ 연결 성공: {self.spreadsheet_name}")
             return True
             
         except Exception as e:
-            print(f"[Sheets] ✗ 연결 실패: {e}")
+            logger.error(f"[Sheets] ✗ 연결 실패: {e}")
             return False
     
     def _rate_limit(self):
-        """API 호출 제한 관리"""
-        now = time.time()
-        elapsed = now - self.last_api_call
+        """
+        API 호출 제한 관리 (토큰 버킷)
         
-        if elapsed < self.min_interval:
-            time.sleep(self.min_interval - elapsed)
+        토큰이 있으면 바로 반환, 없으면 자기 차례 토큰이 보충될 때까지 대기
+        (토큰을 음수로 미리 예약하므로 대기 중인 스레드끼리도 순서대로 min_interval 간격)
+        """
+        with self._rate_lock:
+            now = time.time()
+            if self.min_interval > 0:
+                refill = (now - self._rate_updated) / self.min_interval
+                self._rate_tokens = min(float(self.rate_burst), self._rate_tokens + refill)
+            else:
+                self._rate_tokens = float(self.rate_burst)
+            self._rate_updated = now
+            self._rate_tokens -= 1
+            wait = -self._rate_tokens * self.min_interval if self._rate_tokens < 0 else 0.0
         
-        self.last_api_call = time.time()
+        if wait > 0:
+            time.sleep(wait)
     
     def _get_or_create_sheet(self, sheet_name: str, headers: List[str]) -> gspread.Worksheet:
         """시트 가져오기 (없으면 생성)"""
         try:
             sheet = self.spreadsheet.worksheet(sheet_name)
-        except gspread.WorksheetNotFound:
+        except WorksheetNotFound:
             sheet = self.spreadsheet.add_worksheet(title=sheet_name, rows=1000, cols=len(headers))
             sheet.append_row(headers)
             sheet.format(f'A1:{chr(64 + len(headers))}1', {
@@ -82,6 +156,151 @@ class SheetsSync:
             })
         return sheet
     
+    def _drain_outbox(self, local_cache, table: str, sheet_name: str,
+                      headers: List[str], build_row: Callable[[Dict], list],
+                      page_size: int = 500, max_pages: int = 10) -> int:
+        """
+        로그 테이블을 id 커서 순서대로 페이지 단위 업로드
+        
+        가장 오래된 행부터 page_size씩 append 후 커서를 한 번에 전진.
+        append 직전에 배치 id 범위를 기록해 두고, 응답 전에 중단된 배치는
+        다음 호출에서 시트 끝부분만 읽어 반영 여부를 확인 (중복 append 방지).
+        
+        Args:
+            local_cache: LocalCache 인스턴스
+            table: LocalCache.OUTBOX_TABLES 중 하나
+            sheet_name: 업로드 대상 시트 이름 (A열 = 원본 행 id)
+            headers: 시트 헤더 (시트 생성 시 사용)
+            build_row: DB 행(dict) → 시트 행(list) 변환 함수
+            page_size: 페이지당 최대 행 수
+            max_pages: 한 번 호출에서 처리할 최대 페이지 수
+        
+        Returns:
+            업로드한 행 수
+        """
+        total = 0
+        sheet = None
+        
+        with self.metrics.track(table) as cycle:
+            state = local_cache.get_outbox_state(table)
+            end_row = state['sheet_end_row']
+            
+            # 이전 주기에 응답 없이 끝난 배치 확인
+            if state['pending_last_id'] is not None:
+                self._rate_limit()
+                sheet = self._get_or_create_sheet(sheet_name, headers)
+                cycle.record_call()
+                end_row = self._recover_outbox_batch(local_cache, table, sheet, state, cycle)
+            
+            for _ in range(max_pages):
+                batch = local_cache.get_outbox_batch(table, page_size)
+                if not batch:
+                    break
+                
+                self._rate_limit()
+                if sheet is None:
+                    sheet = self._get_or_create_sheet(sheet_name, headers)
+                    cycle.record_call()
+                
+                # 시트 끝 행을 모르면(마이그레이션 후 첫 업로드) 전송 전에 찾아 둠
+                # → 응답 없이 끊겨도 복구는 항상 끝부분만 읽음
+                if not end_row:
+                    end_row = self._find_sheet_end_row(sheet, cycle)
+                
+                rows = [build_row(row) for row in batch]
+                local_cache.begin_outbox_batch(table, batch[0]['id'], batch[-1]['id'], sheet_end_row=end_row)
+                response = sheet.append_rows(rows)
+                cycle.record_call(rows)
+                
+                end_row = self._appended_end_row(response) or (end_row + len(rows) if end_row else None)
+                local_cache.advance_sync_cursor(table, batch[-1]['id'], sheet_end_row=end_row)
+                total += len(batch)
+                
+                if len(batch) < page_size:
+                    break
+        
+        return total
+    
+    @staticmethod
+    def _appended_end_row(response) -> Optional[int]:
+        """append 응답의 updatedRange('시트'!A12:K20)에서 마지막 행 번호 추출"""
+        try:
+            updated_range = response['updates']['updatedRange']
+        except (TypeError, KeyError):
+            return None
+        match = re.search(r'(\d+)$', updated_range.rpartition('!')[2])
+        return int(match.group(1)) if match else None
+    
+    def _find_sheet_end_row(self, sheet, cycle) -> int:
+        """
+        A열 마지막 데이터 행 번호 찾기 (셀 하나씩 이진 탐색, 열 전체는 읽지 않음)
+        
+        로그 시트는 append만 하므로 1행(헤더)부터 빈 칸 없이 이어진다고 가정.
+        append가 격자를 늘린 시트는 마지막 행(row_count)이 차 있어 한 번에 끝남.
+        """
+        def filled(row: int) -> bool:
+            self._rate_limit()
+            values = sheet.get(f'A{row}')
+            cycle.record_call()
+            return bool(values and values[0] and str(values[0][0]) != '')
+        
+        high = max(1, sheet.row_count)
+        if filled(high):
+            return high
+        
+        low = 0  # low: 차 있는 행 (0 = 헤더도 없음), high: 빈 행
+        while high - low > 1:
+            mid = (low + high) // 2
+            if filled(mid):
+                low = mid
+            else:
+                high = mid
+        return low
+    
+    def _recover_outbox_batch(self, local_cache, table: str, sheet, state: Dict, cycle) -> Optional[int]:
+        """
+        응답 없이 끝난 배치가 시트에 들어갔는지 끝부분만 읽어 판단
+        
+        마지막으로 확인된 행(sheet_end_row) 바로 뒤의 A열을 배치 크기만큼만 조회.
+        - 배치 id가 있으면 → 커서 전진 (재전송 안 함)
+        - 없으면 → 배치 해제 (다음 페이지에서 재전송)
+        sheet_end_row는 전송 전에 기록되므로 보통 항상 있음. 없으면(이전 버전에서 남은 배치)
+        현재 끝 행을 이진 탐색으로 찾고 그 앞 배치 크기만큼만 조회.
+        
+        Returns:
+            확인된 시트 마지막 데이터 행 번호
+        """
+        first_id = state['pending_first_id']
+        last_id = state['pending_last_id']
+        end_row = state['sheet_end_row']
+        span = last_id - first_id + 1
+        
+        if end_row:
+            self._rate_limit()
+            tail = sheet.get(f'A{end_row + 1}:A{end_row + span}')
+            cycle.record_call()
+            ids = [row[0] for row in tail if row]
+            new_end_row = end_row + len(ids)
+        else:
+            new_end_row = self._find_sheet_end_row(sheet, cycle)
+            ids = []
+            if new_end_row > 1:
+                self._rate_limit()
+                tail = sheet.get(f'A{max(2, new_end_row - span + 1)}:A{new_end_row}')
+                cycle.record_call()
+                ids = [row[0] for row in tail if row]
+        
+        landed = [int(v) for v in ids if str(v).isdigit() and first_id <= int(v) <= last_id]
+        
+        if landed:
+            local_cache.advance_sync_cursor(table, max(landed), sheet_end_row=new_end_row)
+            logger.info(f"[Sheets] {table} 배치 {first_id}-{last_id}: 시트 반영 확인, 재전송 생략 ({len(landed)}건)")
+        else:
+            local_cache.clear_outbox_batch(table, sheet_end_row=new_end_row)
+            logger.warning(f"[Sheets] {table} 배치 {first_id}-{last_id}: 시트에 없음, 재전송")
+        
+        return new_end_row
+    
     # =============================
     # 다운로드 (Sheets → SQLite)
     # =============================
@@ -106,351 +325,321 @@ class SheetsSync:
                     except (ValueError, TypeError):
                         config[key] = value
             
-            print(f"[Sheets] 설정 다운로드 완료: {len(config)}개")
+            logger.info(f"[Sheets] 설정 다운로드 완료: {len(config)}개")
             return config
             
         except Exception as e:
-            print(f"[Sheets] 설정 다운로드 오류: {e}")
+            logger.error(f"[Sheets] 설정 다운로드 오류: {e}")
             return {}
     
-    def download_members(self, local_cache) -> int:
-        """회원 정보 다운로드 (금액권/구독권 기반 - 잔여 횟수 없음)"""
+    def _fetch_records(self, sheet_name: str) -> List[Dict]:
+        """시트 전체 레코드 조회 (네트워크 구간, DB 접근 없음)"""
+        self._rate_limit()
+        sheet = self.spreadsheet.worksheet(sheet_name)
+        return sheet.get_all_records()
+    
+    def _download_reference(self, local_cache, sheet_name: str) -> int:
+        """참조 시트 하나를 내려받아 SQLite에 반영"""
+        label, unit = self.REFERENCE_LABELS[sheet_name]
         try:
-            self._rate_limit()
-            sheet = self.spreadsheet.worksheet('members')
-            records = sheet.get_all_records()
+            records = self._fetch_records(sheet_name)
             
-            count = 0
-            conn = local_cache.conn
-            cursor = conn.cursor()
-            
-            for record in records:
-                phone = record.get('phone', '')
-                if phone:
-                    phone = str(phone).replace('-', '').replace(' ', '')
-                    # 전화번호가 0으로 시작하지 않으면 앞에 0 추가
-                    if phone and not phone.startswith('0'):
-                        phone = '0' + phone
-                
-                # 결제 비밀번호 (6자리 숫자, 문자열로 저장)
-                payment_password = record.get('payment_password', '')
-                if payment_password:
-                    payment_password = str(payment_password).strip()
-                
-                cursor.execute('''
-                    INSERT OR REPLACE INTO members 
-                    (member_id, name, phone, payment_password, status, synced_at, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    record.get('member_id'),
-                    record.get('name'),
-                    phone,
-                    payment_password or None,
-                    record.get('status', 'active'),
-                    datetime.now().isoformat(),
-                    datetime.now().isoformat()
-                ))
-                count += 1
+            with local_cache.lock:
+                conn = local_cache.conn
+                try:
+                    count = self._apply_reference(conn.cursor(), sheet_name, records)
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
             
-            conn.commit()
-            local_cache.reload_members()
+            self._reload_reference(local_cache, sheet_name)
             
-            print(f"[Sheets] 회원 정보 다운로드 완료: {count}명")
+            logger.info(f"[Sheets] {label} 다운로드 완료: {count}{unit}")
             return count
             
         except Exception as e:
-            print(f"[Sheets] 회원 다운로드 오류: {e}")
+            logger.error(f"[Sheets] {label} 다운로드 오류: {e}")
             return 0
     
-    def download_products(self, local_cache) -> int:
-        """상품 정보 다운로드 (가격 포함)"""
-        try:
-            self._rate_limit()
-            sheet = self.spreadsheet.worksheet('products')
-            records = sheet.get_all_records()
+    def _apply_reference(self, cursor, sheet_name: str, records: List[Dict]) -> int:
+        """시트 이름에 맞는 반영 함수 실행 (커밋은 호출자가 담당)"""
+        appliers = {
+            'members': self._apply_members,
+            'products': self._apply_products,
+            'voucher_products': self._apply_voucher_products,
+            'subscription_products': self._apply_subscription_products,
+            'member_vouchers': self._apply_member_vouchers,
+            'member_subscriptions': self._apply_member_subscriptions,
+        }
+        return appliers[sheet_name](cursor, records)
+    
+    def _reload_reference(self, local_cache, sheet_name: str):
+        """반영 후 LocalCache 메모리 캐시 재로드 (캐시 없는 테이블은 생략)"""
+        reloaders = {
+            'members': local_cache.reload_members,
+            'products': local_cache.reload_products,
+            'voucher_products': local_cache.reload_voucher_products,
+            'subscription_products': local_cache.reload_subscription_products,
+        }
+        if sheet_name in reloaders:
+            reloaders[sheet_name]()
+    
+    def _apply_members(self, cursor, records: List[Dict]) -> int:
+        """회원 정보 반영 (금액권/구독권 기반 - 잔여 횟수 없음)"""
+        count = 0
+        
+        for record in records:
+            phone = record.get('phone', '')
+            if phone:
+                phone = str(phone).replace('-', '').replace(' ', '')
+                # 전화번호가 0으로 시작하지 않으면 앞에 0 추가
+                if phone and not phone.startswith('0'):
+                    phone = '0' + phone
+            
+            # 결제 비밀번호 (6자리 숫자, 문자열로 저장)
+            payment_password = record.get('payment_password', '')
+            if payment_password:
+                payment_password = str(payment_password).strip()
             
-            count = 0
-            conn = local_cache.conn
-            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT OR REPLACE INTO members 
+                (member_id, name, phone, payment_password, status, synced_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                record.get('member_id'),
+                record.get('name'),
+                phone,
+                payment_password or None,
+                record.get('status', 'active'),
+                datetime.now().isoformat(),
+                datetime.now().isoformat()
+            ))
+            count += 1
+        
+        return count
+    
+    def _apply_products(self, cursor, records: List[Dict]) -> int:
+        """상품 정보 반영 (가격 포함)"""
+        count = 0
+        
+        for record in records:
+            device_uuid = record.get('device_uuid', '')
+            if not device_uuid:
+                continue
             
-            for record in records:
-                device_uuid = record.get('device_uuid', '')
-                if not device_uuid:
-                    continue
-                
-                price = record.get('price', 1000)
-                try:
-                    price = int(price)
-                except (ValueError, TypeError):
-                    price = 1000
-                
-                cursor.execute('''
-                    INSERT OR REPLACE INTO products 
-                    (product_id, gym_id, category, size, name, price, device_uuid, 
-                     stock, enabled, display_order, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    record.get('product_id'),
-                    record.get('gym_id', 'GYM001'),
-                    record.get('category'),
-                    record.get('size', ''),
-                    record.get('name'),
-                    price,
-                    device_uuid,
-                    record.get('stock', 0),
-                    1 if record.get('enabled') == 'TRUE' else 0,
-                    record.get('display_order', 0),
-                    datetime.now().isoformat()
-                ))
-                count += 1
+            price = record.get('price', 1000)
+            try:
+                price = int(price)
+            except (ValueError, TypeError):
+                price = 1000
             
-            conn.commit()
-            local_cache.reload_products()
+            cursor.execute('''
+                INSERT OR REPLACE INTO products 
+                (product_id, gym_id, category, size, name, price, device_uuid, 
+                 stock, enabled, display_order, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                record.get('product_id'),
+                record.get('gym_id', 'GYM001'),
+                record.get('category'),
+                record.get('size', ''),
+                record.get('name'),
+                price,
+                device_uuid,
+                record.get('stock', 0),
+                1 if record.get('enabled') == 'TRUE' else 0,
+                record.get('display_order', 0),
+                datetime.now().isoformat()
+            ))
+            count += 1
+        
+        return count
+    
+    def _apply_voucher_products(self, cursor, records: List[Dict]) -> int:
+        """금액권 상품 반영"""
+        count = 0
+        
+        for record in records:
+            cursor.execute('''
+                INSERT OR REPLACE INTO voucher_products 
+                (product_id, name, price, charge_amount, validity_days,
+                 bonus_product_id, is_bonus, enabled, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                record.get('product_id'),
+                record.get('name'),
+                int(record.get('price', 0)),
+                int(record.get('charge_amount', 0)),
+                int(record.get('validity_days', 365)),
+                record.get('bonus_product_id') or None,
+                1 if record.get('is_bonus') in ('TRUE', True, 1) else 0,
+                1 if record.get('enabled') in ('TRUE', True, 1) else 0,
+                datetime.now().isoformat()
+            ))
+            count += 1
+        
+        return count
+    
+    def _apply_subscription_products(self, cursor, records: List[Dict]) -> int:
+        """구독 상품 반영"""
+        count = 0
+        
+        for record in records:
+            daily_limits = record.get('daily_limits', '{}')
+            if isinstance(daily_limits, str):
+                try:
+                    json.loads(daily_limits)
+                except:
+                    daily_limits = '{}'
+            else:
+                daily_limits = json.dumps(daily_limits)
             
-            print(f"[Sheets] 상품 정보 다운로드 완료: {count}개")
-            return count
+            cursor.execute('''
+                INSERT OR REPLACE INTO subscription_products 
+                (product_id, name, price, validity_days, daily_limits, enabled, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                record.get('product_id'),
+                record.get('name'),
+                int(record.get('price', 0)),
+                int(record.get('validity_days', 30)),
+                daily_limits,
+                1 if record.get('enabled') in ('TRUE', True, 1) else 0,
+                datetime.now().isoformat()
+            ))
+            count += 1
+        
+        return count
+    
+    def _apply_member_vouchers(self, cursor, records: List[Dict]) -> int:
+        """회원 금액권 반영"""
+        count = 0
+        
+        for record in records:
+            cursor.execute('''
+                INSERT OR REPLACE INTO member_vouchers 
+                (voucher_id, member_id, voucher_product_id, original_amount, remaining_amount,
+                 parent_voucher_id, valid_from, valid_until, status, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                int(record.get('voucher_id')),
+                record.get('member_id'),
+                record.get('voucher_product_id'),
+                int(record.get('original_amount', 0)),
+                int(record.get('remaining_amount', 0)),
+                int(record.get('parent_voucher_id')) if record.get('parent_voucher_id') else None,
+                record.get('valid_from') or None,
+                record.get('valid_until') or None,
+                record.get('status', 'active'),
+                datetime.now().isoformat()
+            ))
+            count += 1
+        
+        return count
+    
+    def _apply_member_subscriptions(self, cursor, records: List[Dict]) -> int:
+        """회원 구독권 반영"""
+        count = 0
+        
+        for record in records:
+            daily_limits = record.get('daily_limits', '{}')
+            if isinstance(daily_limits, str):
+                try:
+                    json.loads(daily_limits)
+                except:
+                    daily_limits = '{}'
+            else:
+                daily_limits = json.dumps(daily_limits)
             
-        except Exception as e:
-            print(f"[Sheets] 상품 다운로드 오류: {e}")
-            return 0
+            cursor.execute('''
+                INSERT OR REPLACE INTO member_subscriptions 
+                (subscription_id, member_id, subscription_product_id, 
+                 valid_from, valid_until, daily_limits, status, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                int(record.get('subscription_id')),
+                record.get('member_id'),
+                record.get('subscription_product_id'),
+                record.get('valid_from'),
+                record.get('valid_until'),
+                daily_limits,
+                record.get('status', 'active'),
+                datetime.now().isoformat()
+            ))
+            count += 1
+        
+        return count
+    
+    def download_members(self, local_cache) -> int:
+        """회원 정보 다운로드 (금액권/구독권 기반 - 잔여 횟수 없음)"""
+        return self._download_reference(local_cache, 'members')
+    
+    def download_products(self, local_cache) -> int:
+        """상품 정보 다운로드 (가격 포함)"""
+        return self._download_reference(local_cache, 'products')
     
     def download_voucher_products(self, local_cache) -> int:
         """금액권 상품 다운로드"""
-        try:
-            self._rate_limit()
-            sheet = self.spreadsheet.worksheet('voucher_products')
-            records = sheet.get_all_records()
-            
-            count = 0
-            conn = local_cache.conn
-            cursor = conn.cursor()
-            
-            for record in records:
-                cursor.execute('''
-                    INSERT OR REPLACE INTO voucher_products 
-                    (product_id, name, price, charge_amount, validity_days,
-                     bonus_product_id, is_bonus, enabled, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    record.get('product_id'),
-                    record.get('name'),
-                    int(record.get('price', 0)),
-                    int(record.get('charge_amount', 0)),
-                    int(record.get('validity_days', 365)),
-                    record.get('bonus_product_id') or None,
-                    1 if record.get('is_bonus') in ('TRUE', True, 1) else 0,
-                    1 if record.get('enabled') in ('TRUE', True, 1) else 0,
-                    datetime.now().isoformat()
-                ))
-                count += 1
-            
-            conn.commit()
-            local_cache.reload_voucher_products()
-            
-            print(f"[Sheets] 금액권 상품 다운로드 완료: {count}개")
-            return count
-            
-        except Exception as e:
-            print(f"[Sheets] 금액권 상품 다운로드 오류: {e}")
-            return 0
+        return self._download_reference(local_cache, 'voucher_products')
     
     def download_subscription_products(self, local_cache) -> int:
         """구독 상품 다운로드"""
-        try:
-            self._rate_limit()
-            sheet = self.spreadsheet.worksheet('subscription_products')
-            records = sheet.get_all_records()
-            
-            count = 0
-            conn = local_cache.conn
-            cursor = conn.cursor()
-            
-            for record in records:
-                daily_limits = record.get('daily_limits', '{}')
-                if isinstance(daily_limits, str):
-                    try:
-                        json.loads(daily_limits)
-                    except:
-                        daily_limits = '{}'
-                else:
-                    daily_limits = json.dumps(daily_limits)
-                
-                cursor.execute('''
-                    INSERT OR REPLACE INTO subscription_products 
-                    (product_id, name, price, validity_days, daily_limits, enabled, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    record.get('product_id'),
-                    record.get('name'),
-                    int(record.get('price', 0)),
-                    int(record.get('validity_days', 30)),
-                    daily_limits,
-                    1 if record.get('enabled') in ('TRUE', True, 1) else 0,
-                    datetime.now().isoformat()
-                ))
-                count += 1
-            
-            conn.commit()
-            local_cache.reload_subscription_products()
-            
-            print(f"[Sheets] 구독 상품 다운로드 완료: {count}개")
-            return count
-            
-        except Exception as e:
-            print(f"[Sheets] 구독 상품 다운로드 오류: {e}")
-            return 0
+        return self._download_reference(local_cache, 'subscription_products')
     
     def download_member_vouchers(self, local_cache) -> int:
         """회원 금액권 다운로드"""
-        try:
-            self._rate_limit()
-            sheet = self.spreadsheet.worksheet('member_vouchers')
-            records = sheet.get_all_records()
-            
-            count = 0
-            conn = local_cache.conn
-            cursor = conn.cursor()
-            
-            for record in records:
-                cursor.execute('''
-                    INSERT OR REPLACE INTO member_vouchers 
-                    (voucher_id, member_id, voucher_product_id, original_amount, remaining_amount,
-                     parent_voucher_id, valid_from, valid_until, status, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    int(record.get('voucher_id')),
-                    record.get('member_id'),
-                    record.get('voucher_product_id'),
-                    int(record.get('original_amount', 0)),
-                    int(record.get('remaining_amount', 0)),
-                    int(record.get('parent_voucher_id')) if record.get('parent_voucher_id') else None,
-                    record.get('valid_from') or None,
-                    record.get('valid_until') or None,
-                    record.get('status', 'active'),
-                    datetime.now().isoformat()
-                ))
-                count += 1
-            
-            conn.commit()
-            print(f"[Sheets] 회원 금액권 다운로드 완료: {count}개")
-            return count
-            
-        except Exception as e:
-            print(f"[Sheets] 회원 금액권 다운로드 오류: {e}")
-            return 0
+        return self._download_reference(local_cache, 'member_vouchers')
     
     def download_member_subscriptions(self, local_cache) -> int:
         """회원 구독권 다운로드"""
-        try:
-            self._rate_limit()
-            sheet = self.spreadsheet.worksheet('member_subscriptions')
-            records = sheet.get_all_records()
-            
-            count = 0
-            conn = local_cache.conn
-            cursor = conn.cursor()
-            
-            for record in records:
-                daily_limits = record.get('daily_limits', '{}')
-                if isinstance(daily_limits, str):
-                    try:
-                        json.loads(daily_limits)
-                    except:
-                        daily_limits = '{}'
-                else:
-                    daily_limits = json.dumps(daily_limits)
-                
-                cursor.execute('''
-                    INSERT OR REPLACE INTO member_subscriptions 
-                    (subscription_id, member_id, subscription_product_id, 
-                     valid_from, valid_until, daily_limits, status, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    int(record.get('subscription_id')),
-                    record.get('member_id'),
-                    record.get('subscription_product_id'),
-                    record.get('valid_from'),
-                    record.get('valid_until'),
-                    daily_limits,
-                    record.get('status', 'active'),
-                    datetime.now().isoformat()
-                ))
-                count += 1
-            
-            conn.commit()
-            print(f"[Sheets] 회원 구독권 다운로드 완료: {count}개")
-            return count
-            
-        except Exception as e:
-            print(f"[Sheets] 회원 구독권 다운로드 오류: {e}")
-            return 0
+        return self._download_reference(local_cache, 'member_subscriptions')
     
     # =============================
     # 업로드 (SQLite → Sheets)
     # =============================
     
-    def upload_rentals(self, local_cache) -> int:
+    def upload_rentals(self, local_cache, page_size: int = 500) -> int:
         """대여 이력 업로드 (금액권/구독권 기반)"""
         try:
-            rentals = local_cache.get_unsynced_rentals()
-            
-            if not rentals:
-                return 0
-            
-            self._rate_limit()
-            
             headers = ['rental_id', 'member_id', 'locker_number', 'product_id', 'product_name',
                       'device_uuid', 'quantity', 'payment_type', 'subscription_id', 'amount', 'created_at']
-            sheet = self._get_or_create_sheet('rental_history', headers)
             
-            rows = []
-            rental_ids = []
-            
-            for rental in rentals:
-                rows.append([
+            count = self._drain_outbox(
+                local_cache, 'rental_logs', 'rental_history', headers,
+                lambda rental: [
                     rental['id'],
                     rental['member_id'],
-                    rental.get('locker_number', ''),
+                    rental.get('locker_number') or '',
                     rental['product_id'],
-                    rental.get('product_name', ''),
-                    rental.get('device_uuid', ''),
+                    rental.get('product_name') or '',
+                    rental.get('device_uuid') or '',
                     rental['quantity'],
                     rental['payment_type'],
-                    rental.get('subscription_id', ''),
+                    rental.get('subscription_id') or '',
                     rental.get('amount', 0),
                     rental['created_at']
-                ])
-                rental_ids.append(rental['id'])
-            
-            sheet.append_rows(rows)
-            local_cache.mark_rentals_synced(rental_ids)
+                ],
+                page_size=page_size
+            )
             
-            print(f"[Sheets] 대여 이력 업로드 완료: {len(rows)}건")
-            return len(rows)
+            if count:
+                logger.info(f"[Sheets] 대여 이력 업로드 완료: {count}건")
+            return count
             
         except Exception as e:
-            print(f"[Sheets] 대여 업로드 오류: {e}")
+            logger.error(f"[Sheets] 대여 업로드 오류: {e}")
             return 0
     
-    def upload_voucher_transactions(self, local_cache) -> int:
+    def upload_voucher_transactions(self, local_cache, page_size: int = 500) -> int:
         """금액권 거래 내역 업로드"""
         try:
-            transactions = local_cache.get_unsynced_voucher_transactions()
-            
-            if not transactions:
-                return 0
-            
-            self._rate_limit()
-            
             headers = ['id', 'voucher_id', 'member_id', 'amount', 'balance_before',
                       'balance_after', 'transaction_type', 'rental_log_id', 'created_at']
-            sheet = self._get_or_create_sheet('voucher_transactions', headers)
-            
-            rows = []
-            transaction_ids = []
             
-            for tx in transactions:
-                rows.append([
+            count = self._drain_outbox(
+                local_cache, 'voucher_transactions', 'voucher_transactions', headers,
+                lambda tx: [
                     tx['id'],
                     tx['voucher_id'],
                     tx['member_id'],
@@ -458,23 +647,23 @@ class SheetsSync:
                     tx['balance_before'],
                     tx['balance_after'],
                     tx['transaction_type'],
-                    tx.get('rental_log_id', ''),
+                    tx.get('rental_log_id') or '',
                     tx['created_at']
-                ])
-                transaction_ids.append(tx['id'])
-            
-            sheet.append_rows(rows)
-            local_cache.mark_voucher_transactions_synced(transaction_ids)
+                ],
+                page_size=page_size
+            )
             
-            print(f"[Sheets] 금액권 거래 업로드 완료: {len(rows)}건")
-            return len(rows)
+            if count:
+                logger.info(f"[Sheets] 금액권 거래 업로드 완료: {count}건")
+            return count
             
         except Exception as e:
-            print(f"[Sheets] 금액권 거래 업로드 오류: {e}")
+            logger.error(f"[Sheets] 금액권 거래 업로드 오류: {e}")
             return 0
     
     def upload_member_vouchers(self, local_cache) -> int:
         """회원 금액권 전체 업로드 (상태 동기화)"""
+        started = time.time()
         try:
             conn = local_cache.conn
             cursor = conn.cursor()
@@ -519,11 +708,14 @@ class SheetsSync:
                 'backgroundColor': {'red': 0.9, 'green': 0.9, 'blue': 0.9}
             })
             
-            print(f"[Sheets] 회원 금액권 업로드 완료: {len(vouchers)}개")
+            # worksheet + clear + update + format
+            self.metrics.record('member_vouchers', rows=rows[1:], api_calls=4, started=started)
+            logger.info(f"[Sheets] 회원 금액권 업로드 완료: {len(vouchers)}개")
             return len(vouchers)
             
         except Exception as e:
-            print(f"[Sheets] 회원 금액권 업로드 오류: {e}")
+            self.metrics.record('member_vouchers', started=started, error=e)
+            logger.error(f"[Sheets] 회원 금액권 업로드 오류: {e}")
             return 0
     
     def upload_member_subscriptions(self, local_cache) -> int:
@@ -570,80 +762,187 @@ class SheetsSync:
                 'backgroundColor': {'red': 0.9, 'green': 0.9, 'blue': 0.9}
             })
             
-            print(f"[Sheets] 회원 구독권 업로드 완료: {len(subscriptions)}개")
+            logger.info(f"[Sheets] 회원 구독권 업로드 완료: {len(subscriptions)}개")
             return len(subscriptions)
             
         except Exception as e:
-            print(f"[Sheets] 회원 구독권 업로드 오류: {e}")
+            logger.error(f"[Sheets] 회원 구독권 업로드 오류: {e}")
             return 0
     
-    def update_device_status(self, local_cache) -> int:
-        """기기 상태 업데이트"""
-        try:
-            devices = local_cache.get_all_devices()
-            registry = {d['device_uuid']: d for d in local_cache.get_all_registered_devices()}
+    def _build_device_status_rows(self, local_cache) -> List[list]:
+        """device_status 시트 데이터 행 생성 (헤더 제외, device_uuid 순 정렬)"""
+        devices = local_cache.get_all_devices()
+        registry = {d['device_uuid']: d for d in local_cache.get_all_registered_devices()}
+        cache_by_uuid = {d.get('device_uuid'): d for d in devices}
+        
+        rows = []
+        all_uuids = set(cache_by_uuid.keys()) | set(registry.keys())
+        
+        for device_uuid in sorted(all_uuids, key=str):
+            cache = cache_by_uuid.get(device_uuid, {})
+            reg = registry.get(device_uuid, {})
             
-            if not devices and not registry:
-                return 0
+            last_heartbeat = cache.get('last_heartbeat')
+            if last_heartbeat:
+                try:
+                    heartbeat_time = datetime.fromisoformat(last_heartbeat.replace('Z', '+00:00'))
+                    if heartbeat_time.tzinfo:
+                        heartbeat_time = heartbeat_time.replace(tzinfo=None)
+                    diff = (datetime.now() - heartbeat_time).total_seconds()
+                    status = 'online' if diff < 120 else 'offline'
+                except:
+                    status = 'offline'
+            else:
+                status = 'offline'
+            
+            rows.append([
+                device_uuid,
+                reg.get('mac_address', ''),
+                reg.get('device_name', ''),
+                reg.get('category', ''),
+                cache.get('size') or reg.get('size', ''),
+                cache.get('stock', 0),
+                status,
+                cache.get('wifi_rssi', ''),
+                last_heartbeat or '',
+                reg.get('ip_address', ''),
+                reg.get('firmware_version', ''),
+                reg.get('first_seen_at', ''),
+                cache.get('updated_at') or reg.get('updated_at', '')
+            ])
+        
+        return rows
+    
+    def _device_volatile_indexes(self) -> set:
+        """volatile 컬럼 인덱스"""
+        return {self.DEVICE_STATUS_HEADERS.index(c) for c in self.DEVICE_VOLATILE_COLUMNS}
+    
+    def _device_stable_hash(self, rows: List[list]) -> str:
+        """volatile 컬럼을 제외한 내용 해시"""
+        volatile = self._device_volatile_indexes()
+        stable = [[v for i, v in enumerate(row) if i not in volatile] for row in rows]
+        return hashlib.sha1(json.dumps(stable, ensure_ascii=False, default=str).encode('utf-8')).hexdigest()
+    
+    def _diff_device_status(self, previous: List[list], rows: List[list],
+                            include_volatile: bool) -> List[Dict]:
+        """
+        이전에 쓴 행과 비교해 바뀐 셀만 batch_update 범위로 변환
+        
+        같은 행에서 연속으로 바뀐 셀은 하나의 범위로 묶음 (예: 'F3:H3').
+        include_volatile=False면 volatile 컬럼 변경은 다음 기회로 미룸.
+        """
+        volatile = self._device_volatile_indexes()
+        updates = []
+        
+        for r, (old, new) in enumerate(zip(previous, rows)):
+            changed = [
+                c for c in range(len(new))
+                if (include_volatile or c not in volatile) and old[c] != new[c]
+            ]
             
-            self._rate_limit()
-            sheet = self.spreadsheet.worksheet('device_status')
-            sheet.clear()
+            runs = []
+            for c in changed:
+                if runs and runs[-1][-1] == c - 1:
+                    runs[-1].append(c)
+                else:
+                    runs.append([c])
             
-            headers = ['device_uuid', 'mac_address', 'device_name', 'category',
-                      'size', 'stock', 'status', 'wifi_rssi',
-                      'last_heartbeat', 'ip_address', 'firmware_version',
-                      'first_seen_at', 'updated_at']
-            rows = [headers]
+            for run in runs:
+                a1 = f'{chr(65 + run[0])}{r + 2}'  # 1행은 헤더
+                if len(run) > 1:
+                    a1 += f':{chr(65 + run[-1])}{r + 2}'
+                updates.append({'range': a1, 'values': [[new[c] for c in run]], 'row': r, 'cols': run})
+        
+        return updates
+    
+    def update_device_status(self, local_cache, force: bool = False) -> int:
+        """
+        기기 상태 업데이트 (변경분만 기록)
+        
+        - 기기 구성(device_uuid 목록)이 바뀌었거나 device_full_refresh_interval 경과 시 시트 전체 재작성
+        - 안정 컬럼(재고, 상태, IP 등) 해시가 같으면 API 호출 없이 건너뜀
+        - 바뀐 셀만 batch_update 한 번으로 기록
+        - volatile 컬럼(RSSI, heartbeat)은 device_volatile_interval마다만 반영
+        
+        Args:
+            local_cache: LocalCache 인스턴스
+            force: True면 변경 여부와 관계없이 전체 재작성
+        
+        Returns:
+            시트에 기록한 기기 수 (변경 없으면 0)
+        """
+        started = time.time()
+        try:
+            rows = self._build_device_status_rows(local_cache)
             
-            all_uuids = set(d.get('device_uuid') for d in devices) | set(registry.keys())
+            if not rows:
+                return 0
             
-            for device_uuid in all_uuids:
-                cache = next((d for d in devices if d.get('device_uuid') == device_uuid), {})
-                reg = registry.get(device_uuid, {})
+            now = time.time()
+            stable_hash = self._device_stable_hash(rows)
+            previous = self._device_status_rows
+            
+            layout_changed = previous is None or [r[0] for r in previous] != [r[0] for r in rows]
+            refresh_due = now - self._device_full_written_at >= self.device_full_refresh_interval
+            
+            # 1. 전체 재작성
+            if force or layout_changed or refresh_due:
+                self._rate_limit()
+                sheet = self.spreadsheet.worksheet('device_status')
+                sheet.clear()
+                sheet.update('A1', [self.DEVICE_STATUS_HEADERS] + rows)
+                sheet.format('A1:M1', {
+                    'textFormat': {'bold': True},
+                    'backgroundColor': {'red': 0.9, 'green': 0.9, 'blue': 0.9}
+                })
                 
-                last_heartbeat = cache.get('last_heartbeat')
-                if last_heartbeat:
-                    try:
-                        heartbeat_time = datetime.fromisoformat(last_heartbeat.replace('Z', '+00:00'))
-                        if heartbeat_time.tzinfo:
-                            heartbeat_time = heartbeat_time.replace(tzinfo=None)
-                        diff = (datetime.now() - heartbeat_time).total_seconds()
-                        status = 'online' if diff < 120 else 'offline'
-                    except:
-                        status = 'offline'
-                else:
-                    status = 'offline'
+                self._device_status_sheet = sheet
+                self._device_status_rows = [list(row) for row in rows]
+                self._device_status_hash = stable_hash
+                self._device_volatile_written_at = now
+                self._device_full_written_at = now
                 
-                rows.append([
-                    device_uuid,
-                    reg.get('mac_address', ''),
-                    reg.get('device_name', ''),
-                    reg.get('category', ''),
-                    cache.get('size') or reg.get('size', ''),
-                    cache.get('stock', 0),
-                    status,
-                    cache.get('wifi_rssi', ''),
-                    last_heartbeat or '',
-                    reg.get('ip_address', ''),
-                    reg.get('firmware_version', ''),
-                    reg.get('first_seen_at', ''),
-                    cache.get('updated_at') or reg.get('updated_at', '')
-                ])
+                # worksheet + clear + update + format
+                self.metrics.record('device_status', rows=rows, api_calls=4, started=started)
+                logger.info(f"[Sheets] 기기 상태 업데이트 완료: {len(rows)}개")
+                return len(rows)
+            
+            # 2. 변경 없음 → API 호출 생략
+            volatile_due = now - self._device_volatile_written_at >= self.device_volatile_interval
+            if stable_hash == self._device_status_hash and not volatile_due:
+                self.metrics.record('device_status', started=started)
+                return 0
             
-            sheet.update('A1', rows)
-            sheet.format('A1:M1', {
-                'textFormat': {'bold': True},
-                'backgroundColor': {'red': 0.9, 'green': 0.9, 'blue': 0.9}
-            })
+            # 3. 바뀐 셀만 기록
+            updates = self._diff_device_status(previous, rows, include_volatile=volatile_due)
+            
+            if updates:
+                self._rate_limit()
+                self._device_status_sheet.batch_update(
+                    [{'range': u['range'], 'values': u['values']} for u in updates]
+                )
+                for u in updates:
+                    for c in u['cols']:
+                        previous[u['row']][c] = rows[u['row']][c]
             
-            print(f"[Sheets] 기기 상태 업데이트 완료: {len(rows) - 1}개")
-            return len(rows) - 1
+            self._device_status_hash = stable_hash
+            if volatile_due:
+                self._device_volatile_written_at = now
+            
+            changed_devices = len({u['row'] for u in updates})
+            self.metrics.record('device_status', rows=[u['values'][0] for u in updates],
+                                api_calls=1 if updates else 0, started=started)
+            
+            if updates:
+                logger.info(f"[Sheets] 기기 상태 변경분 업데이트: {changed_devices}개 기기, {len(updates)}개 범위")
+            return changed_devices
             
         except Exception as e:
-            print(f"[Sheets] 기기 상태 업데이트 오류: {e}")
+            # 시트와 기록 상태가 어긋났을 수 있으므로 다음 주기에 전체 재작성
+            self._device_status_rows = None
+            self.metrics.record('device_status', started=started, error=e)
+            logger.error(f"[Sheets] 기기 상태 업데이트 오류: {e}")
             return 0
-    
     def upload_products(self, local_cache) -> int:
         """상품 정보 업로드 (가격 포함)"""
         try:
@@ -689,77 +988,41 @@ class SheetsSync:
                 'backgroundColor': {'red': 0.9, 'green': 0.9, 'blue': 0.9}
             })
             
-            print(f"[Sheets] 상품 정보 업로드 완료: {len(products)}개")
+            logger.info(f"[Sheets] 상품 정보 업로드 완료: {len(products)}개")
             return len(products)
             
         except Exception as e:
-            print(f"[Sheets] 상품 업로드 오류: {e}")
+            logger.error(f"[Sheets] 상품 업로드 오류: {e}")
             return 0
     
     def upload_mqtt_events(self, local_cache, limit: int = 100) -> int:
-        """MQTT 이벤트 업로드"""
+        """MQTT 이벤트 업로드 (오래된 것부터)"""
         try:
-            conn = local_cache.conn
-            cursor = conn.cursor()
-            
-            # synced_to_sheets 컬럼이 없으면 추가
-            try:
-                cursor.execute('ALTER TABLE mqtt_events ADD COLUMN synced_to_sheets INTEGER DEFAULT 0')
-                conn.commit()
-            except:
-                pass  # 이미 존재함
-            
-            cursor.execute('''
-                SELECT id, device_id, event_type, payload, created_at
-                FROM mqtt_events 
-                WHERE synced_to_sheets = 0 
-                ORDER BY created_at DESC
-                LIMIT ?
-            ''', (limit,))
-            
-            events = cursor.fetchall()
-            
-            if not events:
-                return 0
-            
-            self._rate_limit()
-            
             headers = ['id', 'device_uuid', 'event_type', 'payload', 'created_at']
-            sheet = self._get_or_create_sheet('mqtt_events', headers)
-            
-            rows = []
-            event_ids = []
-            
-            for event in events:
-                event_id, device_id, event_type, payload, created_at = event
-                rows.append([
-                    event_id,
-                    device_id or '',
-                    event_type or '',
-                    payload or '',
-                    created_at or ''
-                ])
-                event_ids.append(event_id)
-            
-            sheet.append_rows(rows)
             
-            placeholders = ', '.join(['?' for _ in event_ids])
-            cursor.execute(f'''
-                UPDATE mqtt_events 
-                SET synced_to_sheets = 1 
-                WHERE id IN ({placeholders})
-            ''', event_ids)
-            conn.commit()
+            count = self._drain_outbox(
+                local_cache, 'mqtt_events', 'mqtt_events', headers,
+                lambda event: [
+                    event['id'],
+                    event.get('device_id') or '',
+                    event.get('event_type') or '',
+                    event.get('payload') or '',
+                    event.get('created_at') or ''
+                ],
+                page_size=limit
+            )
             
-            print(f"[Sheets] MQTT 이벤트 업로드 완료: {len(rows)}건")
-            return len(rows)
+            if count:
+                logger.info(f"[Sheets] MQTT 이벤트 업로드 완료: {count}건")
+            return count
             
         except Exception as e:
-            print(f"[Sheets] MQTT 이벤트 업로드 오류: {e}")
+            logger.error(f"[Sheets] MQTT 이벤트 업로드 오류: {e}")
             return 0
     
     def upload_subscription_usage(self, local_cache) -> int:
         """구독권 사용량 업로드"""
+        started = time.time()
         try:
             conn = local_cache.conn
             cursor = conn.cursor()
@@ -815,71 +1078,43 @@ class SheetsSync:
             ''', usage_ids)
             conn.commit()
             
-            print(f"[Sheets] 구독권 사용량 업로드 완료: {len(rows)}건")
+            # worksheet + append_rows
+            self.metrics.record('subscription_usage', rows=rows, api_calls=2, started=started)
+            logger.info(f"[Sheets] 구독권 사용량 업로드 완료: {len(rows)}건")
             return len(rows)
             
         except Exception as e:
-            print(f"[Sheets] 구독권 사용량 업로드 오류: {e}")
+            self.metrics.record('subscription_usage', started=started, error=e)
+            logger.error(f"[Sheets] 구독권 사용량 업로드 오류: {e}")
             return 0
     
     def upload_event_logs(self, local_cache, limit: int = 100) -> int:
         """비즈니스 이벤트 로그 업로드"""
         try:
-            conn = local_cache.conn
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                SELECT id, event_type, severity, device_uuid, member_id, 
-                       product_id, details, created_at
-                FROM event_logs 
-                WHERE synced_to_sheets = 0 
-                ORDER BY created_at
-                LIMIT ?
-            ''', (limit,))
-            
-            events = cursor.fetchall()
-            
-            if not events:
-                return 0
-            
-            self._rate_limit()
-            
             headers = ['log_id', 'timestamp', 'event_type', 'severity', 
                       'device_uuid', 'member_id', 'product_id', 'details']
-            sheet = self._get_or_create_sheet('event_logs', headers)
-            
-            rows = []
-            event_ids = []
             
-            for event in events:
-                event_id, event_type, severity, device_uuid, member_id, product_id, details, created_at = event
-                rows.append([
-                    event_id,
-                    created_at,
-                    event_type,
-                    severity,
-                    device_uuid or '',
-                    member_id or '',
-                    product_id or '',
-                    details or ''
-                ])
-                event_ids.append(event_id)
-            
-            sheet.append_rows(rows)
-            
-            placeholders = ', '.join(['?' for _ in event_ids])
-            cursor.execute(f'''
-                UPDATE event_logs 
-                SET synced_to_sheets = 1 
-                WHERE id IN ({placeholders})
-            ''', event_ids)
-            conn.commit()
+            count = self._drain_outbox(
+                local_cache, 'event_logs', 'event_logs', headers,
+                lambda event: [
+                    event['id'],
+                    event['created_at'],
+                    event['event_type'],
+                    event['severity'],
+                    event.get('device_uuid') or '',
+                    event.get('member_id') or '',
+                    event.get('product_id') or '',
+                    event.get('details') or ''
+                ],
+                page_size=limit
+            )
             
-            print(f"[Sheets] 이벤트 로그 업로드 완료: {len(rows)}건")
-            return len(rows)
+            if count:
+                logger.info(f"[Sheets] 이벤트 로그 업로드 완료: {count}건")
+            return count
             
         except Exception as e:
-            print(f"[Sheets] 이벤트 로그 업로드 오류: {e}")
+            logger.error(f"[Sheets] 이벤트 로그 업로드 오류: {e}")
             return 0
     
     # =============================
@@ -887,15 +1122,76 @@ class SheetsSync:
     # =============================
     
     def sync_all_downloads(self, local_cache) -> Dict[str, int]:
-        """모든 다운로드 동기화 실행"""
-        result = {
-            'members': self.download_members(local_cache),
-            'products': self.download_products(local_cache),
-            'voucher_products': self.download_voucher_products(local_cache),
-            'subscription_products': self.download_subscription_products(local_cache),
-            'member_vouchers': self.download_member_vouchers(local_cache),
-            'member_subscriptions': self.download_member_subscriptions(local_cache),
-        }
+        """
+        모든 다운로드 동기화 실행
+        
+        1단계: 참조 시트를 스레드 풀에서 병렬 조회 (공유 rate limiter 준수)
+        2단계: 조회 결과를 FK 순서대로 하나의 트랜잭션(BEGIN … COMMIT)에서 SQLite에 반영
+        
+        조회에 실패한 시트는 기존 데이터를 유지하고 0으로 보고
+        (그 시트를 참조하는 시트도 옛 데이터와 섞이지 않도록 이번에는 반영하지 않음).
+        반영 중 오류가 나면 전체 롤백.
+        실패한 시트 이름과 사유는 로그와 self.last_download_failed에 기록.
+        """
+        result = {name: 0 for name in self.REFERENCE_SHEETS}
+        failed = {}
+        fetched = {}
+        started = time.time()
+        
+        with ThreadPoolExecutor(max_workers=self.download_workers,
+                                thread_name_prefix='sheets-download') as pool:
+            futures = {
+                pool.submit(self._fetch_records, name): name
+                for name in self.REFERENCE_SHEETS
+            }
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    fetched[name] = future.result()
+                except Exception as e:
+                    label, _ = self.REFERENCE_LABELS[name]
+                    logger.error(f"[Sheets] {label} 다운로드 오류: {e}")
+                    failed[name] = f"조회 실패: {e}"
+        
+        # 조회 실패한 시트에 의존하는 시트는 건너뜀 (FK 순서라 부모가 먼저 나옴)
+        for name in self.REFERENCE_SHEETS:
+            missing = [parent for parent in self.REFERENCE_DEPENDS.get(name, ()) if parent in failed]
+            if name in fetched and missing:
+                del fetched[name]
+                failed[name] = f"의존 시트 실패로 건너뜀: {', '.join(missing)}"
+        
+        self.last_download_failed = failed
+        if not fetched:
+            if failed:
+                logger.warning(f"[Sheets] 다운로드 실패 시트: {sorted(failed)}")
+            return result
+        
+        with local_cache.lock:
+            conn = local_cache.conn
+            cursor = conn.cursor()
+            current = None
+            try:
+                if not conn.in_transaction:
+                    cursor.execute('BEGIN')
+                for name in self.REFERENCE_SHEETS:
+                    if name in fetched:
+                        current = name
+                        result[name] = self._apply_reference(cursor, name, fetched[name])
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                label, _ = self.REFERENCE_LABELS[current] if current else ('-', '')
+                logger.error(f"[Sheets] 다운로드 반영 오류 ({label}, 전체 롤백): {e}")
+                failed[current] = f"반영 실패 (전체 롤백): {e}"
+                return {name: 0 for name in self.REFERENCE_SHEETS}
+        
+        for name in self.REFERENCE_SHEETS:
+            if name in fetched:
+                self._reload_reference(local_cache, name)
+        
+        if failed:
+            logger.warning(f"[Sheets] 다운로드 실패 시트: {sorted(failed)}")
+        logger.info(f"[Sheets] 전체 다운로드 완료 ({time.time() - started:.1f}초): {result}")
         return result
     
     def sync_all_uploads(self, local_cache) -> Dict[str, int]:
@@ -935,12 +1231,12 @@ class SyncScheduler:
     def start(self):
         """스케줄러 시작"""
         self.running = True
-        print(f"[SyncScheduler] 시작 (다운로드: {self.download_interval}초, 업로드: {self.upload_interval}초)")
+        logger.info(f"[SyncScheduler] 시작 (다운로드: {self.download_interval}초, 업로드: {self.upload_interval}초)")
     
     def stop(self):
         """스케줄러 중지"""
         self.running = False
-        print("[SyncScheduler] 중지")
+        logger.info("[SyncScheduler] 중지")
     
     def tick(self):
         """스케줄러 틱 (메인 루프에서 호출)"""
@@ -951,16 +1247,16 @@ class SyncScheduler:
         
         # 다운로드 주기 확인
         if now - self.last_download >= self.download_interval:
-            print("[SyncScheduler] 다운로드 동기화 시작...")
+            logger.info("[SyncScheduler] 다운로드 동기화 시작...")
             result = self.sheets_sync.sync_all_downloads(self.local_cache)
-            print(f"[SyncScheduler] 다운로드 완료: {result}")
+            logger.info(f"[SyncScheduler] 다운로드 완료: {result}")
             self.last_download = now
         
         # 업로드 주기 확인
         if now - self.last_upload >= self.upload_interval:
             result = self.sheets_sync.sync_all_uploads(self.local_cache)
             if any(result.values()):
-                print(f"[SyncScheduler] 업로드 완료: {result}")
+                logger.info(f"[SyncScheduler] 업로드 완료: {result}")
             self.last_upload = now
 
 
@@ -0,0 +1,153 @@
+"""
+앱 시작 순서 관리
+
+네트워크/하드웨어 연결이 필요한 서브시스템(MQTT, Google Sheets, 락카키 대여기 API, NFC 리더)을
+백그라운드 스레드에서 동시에 시작하고 서브시스템별 준비 상태를 기록
+- 화면은 디스크의 LocalCache로 바로 제공 (외부 연결을 기다리지 않음)
+- after로 지정한 서브시스템이 끝난 뒤(성공/실패 무관) 시작
+- 상태: pending → starting → ready / degraded(동작하지만 연결 실패) / failed(예외)
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional
+
+from app.services.local_cache import get_kst_now
+
+logger = logging.getLogger(__name__)
+
+PENDING = 'pending'
+STARTING = 'starting'
+READY = 'ready'
+DEGRADED = 'degraded'
+FAILED = 'failed'
+
+FINISHED = (READY, DEGRADED, FAILED)
+
+
+class StartupOrchestrator:
+    """서브시스템 병렬 시작 + 준비 상태 조회"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tasks: Dict[str, Dict] = {}
+        self._done: Dict[str, threading.Event] = {}
+        self._started_at: Optional[float] = None
+    
+    def mark(self, name: str, state: str, detail: str = None):
+        """앱 스레드에서 직접 처리한 서브시스템 상태 기록 (예: LocalCache)"""
+        with self._lock:
+            self._tasks[name] = {'func': None, 'after': (), 'state': state, 'detail': detail,
+                                 'seconds': 0.0, 'finished_at': get_kst_now().isoformat()}
+            self._done[name] = threading.Event()
+            self._done[name].set()
+    
+    def add(self, name: str, func: Callable[[], Optional[bool]], after: Iterable[str] = ()):
+        """
+        백그라운드 시작 작업 등록
+        
+        Args:
+            name: 서브시스템 이름 (상태 조회 키)
+            func: 시작 함수 (False 반환 시 degraded, 예외 시 failed, 그 외 ready)
+            after: 먼저 끝나야 하는 서브시스템 이름
+        """
+        with self._lock:
+            self._tasks[name] = {'func': func, 'after': tuple(after), 'state': PENDING, 'detail': None,
+                                 'seconds': None, 'finished_at': None}
+            self._done[name] = threading.Event()
+    
+    def start(self):
+        """등록된 작업을 각각의 스레드에서 시작 (즉시 반환)"""
+        self._started_at = time.monotonic()
+        with self._lock:
+            pending = [name for name, task in self._tasks.items() if task['state'] == PENDING]
+        
+        for name in pending:
+            threading.Thread(target=self._run, args=(name,), daemon=True, name=f'startup-{name}').start()
+        
+        if pending:
+            threading.Thread(target=self._report, daemon=True, name='startup-report').start()
+    
+    def _run(self, name: str):
+        """의존 작업 대기 후 시작 함수 실행"""
+        task = self._tasks[name]
+        for dependency in task['after']:
+            if dependency in self._done:
+                self._done[dependency].wait()
+        
+        with self._lock:
+            task['state'] = STARTING
+        
+        started = time.monotonic()
+        try:
+            result = task['func']()
+            state, detail = (DEGRADED, '연결 실패') if result is False else (READY, None)
+        except Exception as e:
+            state, detail = FAILED, str(e)
+            logger.warning(f"[Startup] {name} 시작 실패: {e}")
+        
+        with self._lock:
+            task['state'] = state
+            task['detail'] = detail
+            task['seconds'] = round(time.monotonic() - started, 2)
+            task['finished_at'] = get_kst_now().isoformat()
+        self._done[name].set()
+    
+    def _report(self):
+        """모든 작업이 끝나면 서브시스템별 소요 시간 한 줄 기록"""
+        self.wait()
+        elapsed = time.monotonic() - self._started_at
+        with self._lock:
+            summary = ', '.join(f"{name} {task['state']} {task['seconds']}s"
+                                for name, task in self._tasks.items() if task['func'])
+        logger.info(f"[Startup] 시작 완료 ({elapsed:.1f}초): {summary}")
+    
+    def wait(self, names: Iterable[str] = None, timeout: float = None) -> bool:
+        """
+        서브시스템 시작 완료 대기
+        
+        Args:
+            names: 기다릴 이름 (None이면 전체)
+            timeout: 최대 대기 시간 (초, None이면 무제한)
+        
+        Returns:
+            모두 끝났으면 True
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for name in (names if names is not None else list(self._done)):
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not self._done[name].wait(remaining):
+                return False
+        return True
+    
+    def state(self, name: str) -> Optional[str]:
+        """서브시스템 상태 (등록되지 않았으면 None)"""
+        with self._lock:
+            task = self._tasks.get(name)
+            return task['state'] if task else None
+    
+    def snapshot(self) -> Dict:
+        """
+        전체 준비 상태
+        
+        Returns:
+            {'status': 'starting'|'ready'|'degraded', 'uptime_seconds': ...,
+             'subsystems': {name: {'state', 'detail', 'seconds', 'finished_at'}}}
+        """
+        with self._lock:
+            subsystems = {
+                name: {k: task[k] for k in ('state', 'detail', 'seconds', 'finished_at')}
+                for name, task in self._tasks.items()
+            }
+        
+        states = [s['state'] for s in subsystems.values()]
+        if any(state not in FINISHED for state in states):
+            status = 'starting'
+        elif all(state == READY for state in states):
+            status = 'ready'
+        else:
+            status = 'degraded'
+        
+        uptime = time.monotonic() - self._started_at if self._started_at else 0.0
+        return {'status': status, 'uptime_seconds': round(uptime, 1), 'subsystems': subsystems}
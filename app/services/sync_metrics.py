@@ -0,0 +1,183 @@
+"""
+Google Sheets 동기화 지표
+
+테이블별 업로드 현황을 메모리에 보관
+- 주기별: 처리 행 수, 소요 시간, API 호출/오류 수, 전송 바이트
+- 누적: 마지막 성공 시각, 마지막 오류, 합계
+- 백로그: 미업로드 행 수, 가장 오래된 미업로드 행 경과 시간 (LocalCache 커서 기준)
+"""
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import pytz
+
+KST = pytz.timezone('Asia/Seoul')
+
+
+def payload_size(rows: List[list]) -> int:
+    """시트로 보내는 행 목록의 대략적인 전송 크기 (JSON 바이트)"""
+    return len(json.dumps(rows, ensure_ascii=False, default=str).encode('utf-8'))
+
+
+def _age_seconds(timestamp: Optional[str]) -> Optional[float]:
+    """created_at 문자열의 현재 기준 경과 시간 (초, 시간대 없으면 KST로 간주)"""
+    if not timestamp:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(timestamp).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = KST.localize(parsed)
+    return max(0.0, (datetime.now(KST) - parsed).total_seconds())
+
+
+class SyncCycle:
+    """한 번의 업로드 주기 측정값 (SyncMetrics.track에서 생성)"""
+    
+    def __init__(self, table: str):
+        self.table = table
+        self.rows = 0
+        self.api_calls = 0
+        self.errors = 0
+        self.bytes_sent = 0
+        self.started = time.time()
+    
+    def record_call(self, rows: List[list] = None):
+        """API 호출 1회 기록 (전송한 행이 있으면 행 수/바이트 누적)"""
+        self.api_calls += 1
+        if rows:
+            self.rows += len(rows)
+            self.bytes_sent += payload_size(rows)
+
+
+class SyncMetrics:
+    """테이블별 동기화 지표 저장소 (스레드 안전)"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tables: Dict[str, Dict] = {}
+    
+    def _entry(self, table: str) -> Dict:
+        """테이블 지표 조회 (없으면 생성, _lock 안에서 호출)"""
+        if table not in self._tables:
+            self._tables[table] = {
+                'last_success_at': None,
+                'last_error': None,
+                'last_error_at': None,
+                'last_cycle': None,
+                'total_rows': 0,
+                'total_api_calls': 0,
+                'total_errors': 0,
+                'total_bytes_sent': 0,
+                'cycles': 0,
+            }
+        return self._tables[table]
+    
+    @contextmanager
+    def track(self, table: str):
+        """
+        업로드 주기 측정
+        
+        with metrics.track('rental_logs') as cycle:
+            sheet.append_rows(rows)
+            cycle.record_call(rows)
+        
+        예외가 나면 오류로 기록한 뒤 그대로 다시 발생시킴.
+        """
+        cycle = SyncCycle(table)
+        error = None
+        try:
+            yield cycle
+        except Exception as e:
+            error = e
+            cycle.errors += 1
+            raise
+        finally:
+            self._finish(cycle, error)
+    
+    def record(self, table: str, rows: List[list] = None, api_calls: int = 0,
+               started: float = None, error: Optional[Exception] = None):
+        """
+        track 블록 없이 주기 결과 한 번에 기록 (전체 덮어쓰기 업로드용)
+        
+        Args:
+            table: 테이블(시트) 이름
+            rows: 전송한 행 목록
+            api_calls: API 호출 수
+            started: 시작 시각 (time.time(), 없으면 0초로 기록)
+            error: 실패 시 예외
+        """
+        cycle = SyncCycle(table)
+        if started is not None:
+            cycle.started = started
+        if rows:
+            cycle.rows = len(rows)
+            cycle.bytes_sent = payload_size(rows)
+        cycle.api_calls = api_calls
+        if error is not None:
+            cycle.errors += 1
+        self._finish(cycle, error)
+    
+    def _finish(self, cycle: SyncCycle, error: Optional[Exception]):
+        """주기 결과 반영"""
+        elapsed = time.time() - cycle.started
+        now = datetime.now(KST).isoformat()
+        
+        with self._lock:
+            entry = self._entry(cycle.table)
+            entry['cycles'] += 1
+            entry['total_rows'] += cycle.rows
+            entry['total_api_calls'] += cycle.api_calls
+            entry['total_errors'] += cycle.errors
+            entry['total_bytes_sent'] += cycle.bytes_sent
+            entry['last_cycle'] = {
+                'at': now,
+                'rows': cycle.rows,
+                'seconds': round(elapsed, 3),
+                'rows_per_second': round(cycle.rows / elapsed, 1) if elapsed > 0 else None,
+                'api_calls': cycle.api_calls,
+                'errors': cycle.errors,
+                'bytes_sent': cycle.bytes_sent,
+            }
+            if error is None:
+                entry['last_success_at'] = now
+            else:
+                entry['last_error'] = str(error)
+                entry['last_error_at'] = now
+    
+    def snapshot(self, local_cache=None) -> Dict[str, Dict]:
+        """
+        테이블별 지표 스냅샷
+        
+        Args:
+            local_cache: 주어지면 OUTBOX_TABLES 백로그(미업로드 수, 최대 지연) 포함
+        
+        Returns:
+            {table: {...지표}}
+        """
+        with self._lock:
+            result = {
+                table: dict(entry, last_cycle=dict(entry['last_cycle']) if entry['last_cycle'] else None)
+                for table, entry in self._tables.items()
+            }
+        
+        if local_cache is not None:
+            for table in local_cache.OUTBOX_TABLES:
+                entry = result.setdefault(table, {'last_success_at': None, 'cycles': 0})
+                try:
+                    backlog = local_cache.get_outbox_backlog(table)
+                except Exception as e:
+                    entry['backlog_error'] = str(e)
+                    continue
+                entry['cursor'] = backlog['last_id']
+                entry['unsynced'] = backlog['unsynced']
+                entry['oldest_unsynced_at'] = backlog['oldest_unsynced_at']
+                entry['oldest_unsynced_age_seconds'] = _age_seconds(backlog['oldest_unsynced_at'])
+        
+        return result
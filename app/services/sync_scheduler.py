@@ -8,12 +8,15 @@
 - members 다운로드: 5분마다
 """
 
+import logging
 import threading
 import time
 from datetime import datetime
 from typing import Optional
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
 
 class SyncScheduler:
     """동기화 스케줄러"""
@@ -40,42 +43,55 @@ class SyncScheduler:
         self.member_interval = member_interval
         
         self._running = False
+        self._stop = threading.Event()  # 대기 중인 루프를 바로 깨움
         self._threads = []
         
-        print(f"[SyncScheduler] 초기화 완료")
-        print(f"  - 이벤트/대여: {event_interval}초")
-        print(f"  - 기기 상태: {device_interval}초")
-        print(f"  - 회원 정보: {member_interval}초")
+        logger.info(f"[SyncScheduler] 초기화 완료 (이벤트/대여: {event_interval}초, "
+                    f"기기 상태: {device_interval}초, 회원 정보: {member_interval}초)")
     
     def start(self):
         """스케줄러 시작"""
         if self._running:
-            print("[SyncScheduler] 이미 실행 중")
+            logger.info("[SyncScheduler] 이미 실행 중")
             return
         
         self._running = True
+        self._stop.clear()
+        self._threads = []
         
         # 이벤트/대여 동기화 스레드
-        t1 = threading.Thread(target=self._event_sync_loop, daemon=True)
+        t1 = threading.Thread(target=self._event_sync_loop, daemon=True, name='sync-events')
         t1.start()
         self._threads.append(t1)
         
         # 기기 상태 동기화 스레드
-        t2 = threading.Thread(target=self._device_sync_loop, daemon=True)
+        t2 = threading.Thread(target=self._device_sync_loop, daemon=True, name='sync-devices')
         t2.start()
         self._threads.append(t2)
         
         # 회원 정보 동기화 스레드
-        t3 = threading.Thread(target=self._member_sync_loop, daemon=True)
+        t3 = threading.Thread(target=self._member_sync_loop, daemon=True, name='sync-members')
         t3.start()
         self._threads.append(t3)
         
-        print("[SyncScheduler] ✓ 시작됨")
+        logger.info("[SyncScheduler] ✓ 시작됨")
     
-    def stop(self):
-        """스케줄러 중지"""
+    def stop(self, timeout: float = 10.0):
+        """
+        스케줄러 중지 (진행 중인 동기화가 끝날 때까지 스레드별 최대 timeout초 대기)
+        
+        종료 순서상 이후 EventLogger/LocalCache를 닫으므로 local_cache.conn 사용이 끝난 뒤 반환
+        """
         self._running = False
-        print("[SyncScheduler] 중지됨")
+        self._stop.set()
+        
+        deadline = time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(timeout=max(0.0, deadline - time.monotonic()))
+            if thread.is_alive():
+                logger.warning(f"[SyncScheduler] {thread.name} 스레드가 {timeout:.0f}초 안에 끝나지 않음")
+        self._threads = []
+        logger.info("[SyncScheduler] 중지됨")
     
     def _event_sync_loop(self):
         """이벤트/대여 동기화 루프"""
@@ -83,9 +99,10 @@ class SyncScheduler:
             try:
                 self._sync_events()
             except Exception as e:
-                print(f"[SyncScheduler] 이벤트 동기화 오류: {e}")
+                logger.error(f"[SyncScheduler] 이벤트 동기화 오류: {e}")
             
-            time.sleep(self.event_interval)
+            if self._stop.wait(self.event_interval):
+                break
     
     def _device_sync_loop(self):
         """기기 상태 동기화 루프"""
@@ -93,9 +110,10 @@ class SyncScheduler:
             try:
                 self._sync_device_status()
             except Exception as e:
-                print(f"[SyncScheduler] 기기 상태 동기화 오류: {e}")
+                logger.error(f"[SyncScheduler] 기기 상태 동기화 오류: {e}")
             
-            time.sleep(self.device_interval)
+            if self._stop.wait(self.device_interval):
+                break
     
     def _member_sync_loop(self):
         """회원 정보 동기화 루프"""
@@ -103,9 +121,10 @@ class SyncScheduler:
             try:
                 self._sync_members()
             except Exception as e:
-                print(f"[SyncScheduler] 회원 동기화 오류: {e}")
+                logger.error(f"[SyncScheduler] 회원 동기화 오류: {e}")
             
-            time.sleep(self.member_interval)
+            if self._stop.wait(self.member_interval):
+                break
     
     def _sync_events(self):
         """이벤트 + 대여 + 결제 로그 업로드"""
@@ -128,7 +147,7 @@ class SyncScheduler:
         voucher_balance_count = self.sheets_sync.upload_member_vouchers(self.local_cache)
         
         if event_count > 0 or rental_count > 0 or subscription_count > 0 or voucher_count > 0 or voucher_balance_count > 0:
-            print(f"[SyncScheduler] 업로드: 이벤트 {event_count}건, 대여 {rental_count}건, 구독권 {subscription_count}건, 금액권거래 {voucher_count}건, 금액권잔액 {voucher_balance_count}건")
+            logger.info(f"[SyncScheduler] 업로드: 이벤트 {event_count}건, 대여 {rental_count}건, 구독권 {subscription_count}건, 금액권거래 {voucher_count}건, 금액권잔액 {voucher_balance_count}건")
     
     def _sync_device_status(self):
         """기기 상태 업데이트"""
@@ -147,19 +166,19 @@ class SyncScheduler:
         count = self.sheets_sync.download_members(self.local_cache)
         if count > 0:
             self.local_cache.reload_members()
-            print(f"[SyncScheduler] 회원 정보 동기화: {count}명")
+            logger.info(f"[SyncScheduler] 회원 정보 동기화: {count}명")
     
     def sync_now(self):
         """즉시 전체 동기화 실행"""
-        print("[SyncScheduler] 즉시 동기화 시작...")
+        logger.info("[SyncScheduler] 즉시 동기화 시작...")
         
         try:
             self._sync_events()
             self._sync_device_status()
             self._sync_members()
-            print("[SyncScheduler] 즉시 동기화 완료")
+            logger.info("[SyncScheduler] 즉시 동기화 완료")
         except Exception as e:
-            print(f"[SyncScheduler] 즉시 동기화 오류: {e}")
+            logger.error(f"[SyncScheduler] 즉시 동기화 오류: {e}")
 
 
 # 전역 스케줄러 인스턴스 (앱에서 사용)
@@ -82,59 +82,120 @@ function initLoginPage() {
     const loginBtn = document.getElementById('loginBtn');
     if (loginBtn) loginBtn.addEventListener('click', handleLogin);
     
-    // NFC 이벤트 폴링 (홈 화면에서만)
-    let nfcPollingInterval = setInterval(async () => {
+    // NFC 이벤트 수신 (홈 화면에서만)
+    initNfcListener();
+    
+    console.log('로그인 페이지 초기화 완료');
+}
+
+// ========================================
+// NFC 이벤트 수신 (Socket.IO 푸시 + 롱폴링 대체)
+// ========================================
+
+const NFC_LONG_POLL_WAIT = 25;  // 초 (서버 최대 30초)
+
+function initNfcListener() {
+    const saved = sessionStorage.getItem('nfcSeq');
+    let lastSeq = saved !== null ? Number(saved) : null;
+    // 페이지마다 새 구독자 ID (서버가 화면별 전달 위치를 기억 → 다른 탭과 이벤트를 나눠 갖지 않음)
+    const subscriberId = Math.random().toString(36).slice(2, 10) + Date.now().toString(36);
+    let busy = false;          // 로그인 처리 중에는 새 태그 무시
+    let socketConnected = false;
+    let polling = false;
+    let stopped = false;
+    
+    async function handleNfcEvent(data) {
+        // 같은 이벤트를 Socket.IO와 롱폴링 양쪽에서 받아도 한 번만 처리
+        if (!data || data.seq === undefined || (lastSeq !== null && data.seq <= lastSeq)) return;
+        lastSeq = data.seq;
+        sessionStorage.setItem('nfcSeq', String(lastSeq));
+        
+        if (!data.success) {
+            console.log('[NFC] 오류:', data);
+            showError(data.message || '락카가 배정되어 있지 않습니다.');
+            return;
+        }
+        if (busy) return;
+        
+        console.log('[NFC] 태그 감지:', data);
+        busy = true;
+        showLoading(true);
+        
         try {
-            const response = await fetch('/api/nfc/poll');
-            const data = await response.json();
+            // member_id로 로그인 API 호출
+            const loginResponse = await apiRequest('/api/auth/member_id', {
+                method: 'POST',
+                body: JSON.stringify({ member_id: data.member_id }),
+            });
             
-            if (data.has_event && data.success) {
-                console.log('[NFC] 태그 감지:', data);
-                clearInterval(nfcPollingInterval); // 폴링 중지
-                showLoading(true);
-                
-                try {
-                    // member_id로 로그인 API 호출
-                    const loginResponse = await apiRequest('/api/auth/member_id', {
-                        method: 'POST',
-                        body: JSON.stringify({ member_id: data.member_id }),
-                    });
-                    
-                    if (loginResponse.success) {
-                        console.log('[NFC] 로그인 성공:', loginResponse.member);
-                        sessionStorage.setItem('member', JSON.stringify(loginResponse.member));
-                        window.location.href = '/rental';
-                    } else {
-                        showError(loginResponse.message || 'NFC 로그인에 실패했습니다.');
-                        // 폴링 재시작
-                        nfcPollingInterval = setInterval(arguments.callee, 500);
-                    }
-                } catch (error) {
-                    console.error('[NFC] 로그인 오류:', error);
-                    showError(error.message || 'NFC 로그인 중 오류가 발생했습니다.');
-                    // 폴링 재시작
-                    nfcPollingInterval = setInterval(arguments.callee, 500);
-                } finally {
-                    showLoading(false);
-                }
-            } else if (data.has_event && !data.success) {
-                console.log('[NFC] 오류:', data);
-                showError(data.message || '락카가 배정되어 있지 않습니다.');
+            if (loginResponse.success) {
+                console.log('[NFC] 로그인 성공:', loginResponse.member);
+                sessionStorage.setItem('member', JSON.stringify(loginResponse.member));
+                stopped = true;
+                window.location.href = '/rental';
+                return;
             }
+            showError(loginResponse.message || 'NFC 로그인에 실패했습니다.');
         } catch (error) {
-            // 폴링 오류는 조용히 무시 (서버 다운 등)
-            // console.error('[NFC] 폴링 오류:', error);
+            console.error('[NFC] 로그인 오류:', error);
+            showError(error.message || 'NFC 로그인 중 오류가 발생했습니다.');
+        } finally {
+            showLoading(false);
         }
-    }, 500); // 500ms마다 폴링
+        busy = false;
+    }
     
-    console.log('[NFC] 폴링 시작 (500ms 간격)');
+    // 롱폴링: 이벤트가 올 때까지 서버가 응답을 붙잡음 (대기 중 요청 없음)
+    async function longPoll() {
+        if (polling) return;
+        polling = true;
+        
+        while (!stopped && !socketConnected) {
+            try {
+                if (lastSeq === null) {
+                    const init = await (await fetch(`/api/nfc/poll?after=-1&subscriber=${subscriberId}`)).json();
+                    lastSeq = init.seq !== undefined ? init.seq : 0;
+                    continue;
+                }
+                const response = await fetch(`/api/nfc/poll?after=${lastSeq}&subscriber=${subscriberId}&wait=${NFC_LONG_POLL_WAIT}`);
+                const data = await response.json();
+                if (data.has_event) await handleNfcEvent(data);
+            } catch (error) {
+                // 서버 재시작 등: 잠시 후 재시도
+                await new Promise(resolve => setTimeout(resolve, 2000));
+            }
+        }
+        polling = false;
+    }
     
-    // 페이지 떠날 때 폴링 중지
-    window.addEventListener('beforeunload', () => {
-        clearInterval(nfcPollingInterval);
-    });
+    if (typeof io === 'function') {
+        const socket = io({ transports: ['websocket', 'polling'] });
+        socket.on('connect', () => {
+            socketConnected = true;
+            console.log('[NFC] Socket.IO 연결 (푸시 수신)');
+            // 끊겨 있던 동안의 이벤트 확인
+            if (lastSeq !== null) {
+                fetch(`/api/nfc/poll?after=${lastSeq}&subscriber=${subscriberId}`)
+                    .then(r => r.json())
+                    .then(data => { if (data.has_event) handleNfcEvent(data); })
+                    .catch(() => {});
+            }
+        });
+        socket.on('disconnect', () => {
+            socketConnected = false;
+            console.log('[NFC] Socket.IO 연결 끊김 → 롱폴링');
+            longPoll();
+        });
+        socket.on('nfc_detected', handleNfcEvent);
+        socket.on('nfc_error', handleNfcEvent);
+        window.addEventListener('beforeunload', () => { stopped = true; socket.close(); });
+    } else {
+        window.addEventListener('beforeunload', () => { stopped = true; });
+    }
     
-    console.log('로그인 페이지 초기화 완료');
+    // Socket.IO 연결 전/실패 시에도 바로 수신
+    longPoll();
+    console.log('[NFC] 수신 시작 (Socket.IO 푸시, 롱폴링 대체)');
 }
 
 function handleKeyPress(e) {
@@ -206,6 +267,7 @@ function initRentalPage() {
     updateMemberDisplay();
     loadProducts();
     loadPaymentMethods();
+    initInventoryListener();
     
     document.getElementById('logoutBtn')?.addEventListener('click', handleLogout);
     document.getElementById('checkoutBtn')?.addEventListener('click', handleCheckout);
@@ -275,6 +337,41 @@ async function loadProducts() {
     }
 }
 
+// 재고/기기 상태 실시간 반영 (Socket.IO 'inventory_delta': 변경된 필드만 수신)
+function initInventoryListener() {
+    if (typeof io !== 'function') return;
+    
+    const socket = io({ transports: ['websocket', 'polling'] });
+    let connectedOnce = false;
+    
+    socket.on('connect', () => {
+        // 재연결 시 끊겨 있던 동안의 변경분은 목록을 한 번 다시 받아 맞춤
+        if (connectedOnce) refreshProducts();
+        connectedOnce = true;
+    });
+    socket.on('inventory_delta', applyInventoryDelta);
+    window.addEventListener('beforeunload', () => socket.close());
+}
+
+function applyInventoryDelta(delta) {
+    const product = AppState.products.find(p =>
+        (delta.product_id && p.product_id === delta.product_id) || p.device_uuid === delta.device_uuid);
+    if (!product) return;
+    
+    Object.assign(product, delta.changes);
+    if (product.category === AppState.currentCategory) renderProducts();
+}
+
+async function refreshProducts() {
+    try {
+        const data = await apiRequest('/api/products');
+        AppState.products = data.products || [];
+        renderProducts();
+    } catch (error) {
+        console.error('상품 갱신 오류:', error);
+    }
+}
+
 async function loadPaymentMethods() {
     try {
         const data = await apiRequest(`/api/payment-methods/${AppState.member.member_id}`);
@@ -330,11 +427,12 @@ function renderProducts() {
             .filter(item => item.product_id === product.product_id)
             .reduce((sum, item) => sum + item.quantity, 0);
         const inCart = cartQuantity > 0;
-        const isDisabled = !product.online || product.stock <= 0;
+        const isDisabled = !product.online || product.locked || product.stock <= 0;
         
         let statusText = '';
         if (!product.connected) statusText = '<span class="product-offline">연결 안됨</span>';
         else if (!product.online) statusText = '<span class="product-offline">오프라인</span>';
+        else if (product.locked) statusText = '<span class="product-offline">점검 중</span>';
         
         return `
             <div class="product-card ${isDisabled ? 'disabled' : ''} ${inCart ? 'in-cart' : ''}"
@@ -146,6 +146,7 @@ CREATE TABLE IF NOT EXISTS products (
 CREATE TABLE IF NOT EXISTS locker_mapping (
     locker_number INT PRIMARY KEY,
     member_id TEXT NOT NULL,
+    nfc_uid TEXT,                     -- 배정 시 받은 NFC 태그 UID (없으면 NULL)
     assigned_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (member_id) REFERENCES members(member_id)
 );
@@ -242,7 +243,86 @@ CREATE TABLE IF NOT EXISTS event_logs (
 );
 
 -- =============================
--- 10. 인덱스
+-- 10. Sheets 업로드 커서
+-- =============================
+
+-- 로그 테이블별 마지막 업로드 id (id 오름차순으로 페이지 단위 업로드)
+-- rental_logs, voucher_transactions, event_logs, mqtt_events
+-- pending_*: 전송 직전 기록하는 배치 id 범위 (응답 전 중단 시 시트 끝부분만 확인해 중복 방지)
+-- legacy_synced_until: 커서 도입 전 최신순으로 이미 업로드된 구간 끝 (커서가 지날 때까지 synced_to_sheets = 1 행 건너뜀)
+CREATE TABLE IF NOT EXISTS sync_cursors (
+    table_name TEXT PRIMARY KEY,
+    last_id INTEGER NOT NULL DEFAULT 0,
+    pending_first_id INTEGER,         -- 전송 중 배치 첫 id
+    pending_last_id INTEGER,          -- 전송 중 배치 마지막 id
+    sheet_end_row INTEGER,            -- 시트에서 마지막으로 확인된 데이터 행 번호
+    legacy_synced_until INTEGER,      -- 커서 도입 전 업로드된 마지막 id (지나면 NULL)
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- =============================
+-- 11. 시간별 집계 (Rollup)
+-- =============================
+
+-- 시간별 대여 집계 (add_rental_log와 같은 트랜잭션에서 증분 갱신)
+-- hour: 'YYYY-MM-DDTHH' (created_at 앞 13자리)
+CREATE TABLE IF NOT EXISTS rental_hourly (
+    hour TEXT NOT NULL,
+    product_id TEXT NOT NULL,
+    device_uuid TEXT NOT NULL,
+    payment_type TEXT NOT NULL,
+    rentals INT NOT NULL DEFAULT 0,   -- 대여 건수
+    quantity INT NOT NULL DEFAULT 0,  -- 대여 수량 합계
+    amount INT NOT NULL DEFAULT 0,    -- 차감 금액 합계
+    PRIMARY KEY (hour, product_id, device_uuid, payment_type)
+);
+
+-- 시간별 이벤트 집계 (EventLogger 기록과 같은 트랜잭션에서 증분 갱신)
+-- 기기/상품 없는 이벤트는 '' 로 집계
+CREATE TABLE IF NOT EXISTS event_hourly (
+    hour TEXT NOT NULL,
+    event_type TEXT NOT NULL,
+    severity TEXT NOT NULL,
+    device_uuid TEXT NOT NULL DEFAULT '',
+    product_id TEXT NOT NULL DEFAULT '',
+    count INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (hour, event_type, severity, device_uuid, product_id)
+);
+
+-- =============================
+-- 12. 락카 배정 복제
+-- =============================
+
+-- 락카 배정 변경 이력 (락카키 대여기 측, GET /api/locker/changes?since=seq 로 제공)
+-- 오래된 이력은 잘라내며, 잘린 구간을 요청하면 현재 배정 전체(reset)를 응답
+CREATE TABLE IF NOT EXISTS locker_changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    action TEXT NOT NULL,             -- 'assign' / 'release'
+    locker_number INT NOT NULL,
+    member_id TEXT,                   -- release는 해제 직전 회원
+    nfc_uid TEXT,
+    changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- NFC UID → 회원 복제본 (운동복 대여기 측, 락카 배정 변경분을 받아 갱신)
+CREATE TABLE IF NOT EXISTS nfc_member_map (
+    nfc_uid TEXT PRIMARY KEY,
+    member_id TEXT NOT NULL,
+    name TEXT,
+    locker_number INT,
+    assigned_at TIMESTAMP,
+    seq INTEGER                       -- 마지막으로 반영한 변경 seq
+);
+
+-- 복제 위치 (원본별 마지막 반영 seq)
+CREATE TABLE IF NOT EXISTS replication_cursors (
+    source TEXT PRIMARY KEY,
+    last_seq INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- =============================
+-- 13. 인덱스
 -- =============================
 
 -- 금액권 관련
@@ -269,20 +349,25 @@ CREATE INDEX IF NOT EXISTS idx_device_registry_product ON device_registry(produc
 -- 대여 로그 관련
 CREATE INDEX IF NOT EXISTS idx_rental_logs_member ON rental_logs(member_id);
 CREATE INDEX IF NOT EXISTS idx_rental_logs_created ON rental_logs(created_at);
-CREATE INDEX IF NOT EXISTS idx_rental_logs_sync ON rental_logs(synced_to_sheets);
 CREATE INDEX IF NOT EXISTS idx_rental_logs_device_uuid ON rental_logs(device_uuid);
 CREATE INDEX IF NOT EXISTS idx_rental_logs_payment_type ON rental_logs(payment_type);
 
 -- 기타
 CREATE INDEX IF NOT EXISTS idx_locker_mapping_member ON locker_mapping(member_id);
+CREATE INDEX IF NOT EXISTS idx_nfc_member_map_locker ON nfc_member_map(locker_number);
 CREATE INDEX IF NOT EXISTS idx_mqtt_events_device ON mqtt_events(device_id);
 CREATE INDEX IF NOT EXISTS idx_mqtt_events_created ON mqtt_events(created_at);
 CREATE INDEX IF NOT EXISTS idx_event_logs_type ON event_logs(event_type);
 CREATE INDEX IF NOT EXISTS idx_event_logs_created ON event_logs(created_at);
-CREATE INDEX IF NOT EXISTS idx_event_logs_sync ON event_logs(synced_to_sheets);
+
+-- 이벤트 조회 (기기/타입 + 기간, 키셋 페이지네이션)
+CREATE INDEX IF NOT EXISTS idx_mqtt_events_device_created ON mqtt_events(device_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_mqtt_events_type_created ON mqtt_events(event_type, created_at);
+CREATE INDEX IF NOT EXISTS idx_event_logs_device_created ON event_logs(device_uuid, created_at);
+CREATE INDEX IF NOT EXISTS idx_event_logs_type_created ON event_logs(event_type, created_at);
 
 -- =============================
--- 11. 초기 데이터 (테스트용)
+-- 14. 초기 데이터 (테스트용)
 -- =============================
 
 -- 예시 금액권 상품
@@ -1,38 +1,102 @@
 #!/usr/bin/env python3
 """
 운동복/수건 대여 시스템 - 메인 실행 파일
+
+실행 모드 (SERVER_MODE 환경변수):
+- dev (기본): Flask 개발 서버 (FLASK_DEBUG=true면 자동 재시작)
+- production: gunicorn gthread 워커 1개 + 스레드 풀 (SERVER_THREADS)
+
+production도 프로세스는 1개만 사용 - MQTT 연결, NFC 시리얼 포트, SQLite 캐시는
+프로세스당 하나여야 하므로 워커 수 대신 스레드 수로 동시 요청을 처리.
+eventlet은 paho-mqtt/pyserial 스레드와 충돌하므로 SocketIO는 threading 모드 유지
+(docs/MQTT_TROUBLESHOOTING.md).
+
+SERVER_THREADS는 동시 롱폴링(/api/nfc/poll)·WebSocket 연결 수보다 넉넉하게 잡을 것 -
+연결마다 스레드 하나를 점유하므로 모자라면 일반 요청이 대기열에서 기다림.
 """
+import logging
 import os
+import signal
 import sys
-from app import create_app
+from app import create_app, shutdown_services
+
+
+def run_dev(host, port, debug):
+    """Flask 개발 서버 실행"""
+    app = create_app()
+    
+    # SIGTERM(pkill, systemd stop)도 Ctrl+C처럼 종료 처리
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    
+    try:
+        app.run(
+            host=host,
+            port=port,
+            debug=debug,
+            use_reloader=debug
+        )
+    finally:
+        shutdown_services()
+
+
+def run_production(host, port, threads):
+    """gunicorn(gthread 워커 1개)으로 실행"""
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        print("❌ production 모드에는 gunicorn이 필요합니다: pip install gunicorn")
+        sys.exit(1)
+    
+    class KioskServer(BaseApplication):
+        """앱을 워커 프로세스 안에서 생성하는 gunicorn 애플리케이션"""
+        
+        def load_config(self):
+            self.cfg.set('bind', f'{host}:{port}')
+            self.cfg.set('workers', 1)
+            self.cfg.set('worker_class', 'gthread')
+            self.cfg.set('threads', threads)
+            # 롱폴링(/api/nfc/poll 최대 30초)과 WebSocket 연결이 요청 스레드를 오래 점유
+            self.cfg.set('timeout', int(os.getenv('SERVER_TIMEOUT', 60)))
+            self.cfg.set('graceful_timeout', int(os.getenv('SERVER_GRACEFUL_TIMEOUT', 10)))
+            self.cfg.set('keepalive', 5)
+            self.cfg.set('worker_exit', lambda server, worker: shutdown_services())
+        
+        def load(self):
+            app = create_app()
+            # gunicorn 로그 포맷은 %(process)d 사용 (setup_logging이 끈 pid 수집 복구)
+            logging.logProcesses = True
+            return app
+    
+    KioskServer().run()
+
 
 def main():
     """Flask 애플리케이션 시작"""
     
-    # 애플리케이션 생성
-    app = create_app()
-    
-    # 개발 서버 설정
+    # 서버 설정
     host = os.getenv('FLASK_HOST', '0.0.0.0')
     port = int(os.getenv('FLASK_PORT', 5000))
     debug = os.getenv('FLASK_DEBUG', 'false').lower() == 'true'
+    mode = os.getenv('SERVER_MODE', 'dev').lower()
+    threads = int(os.getenv('SERVER_THREADS', 32))
     
     print("=" * 60)
     print("🏃 운동복/수건 대여 시스템 시작")
     print("=" * 60)
     print(f"📍 주소: http://{host}:{port}")
-    print(f"🔧 디버그 모드: {debug}")
+    if mode == 'production':
+        print(f"🚀 서버: gunicorn (gthread, 스레드 {threads}개)")
+    else:
+        print(f"🔧 디버그 모드: {debug}")
     print("=" * 60)
     print()
     
-    # Flask 서버 실행
+    # 서버 실행
     try:
-        app.run(
-            host=host,
-            port=port,
-            debug=debug,
-            use_reloader=debug
-        )
+        if mode == 'production':
+            run_production(host, port, threads)
+        else:
+            run_dev(host, port, debug)
     except KeyboardInterrupt:
         print("\n\n🛑 서버를 종료합니다...")
         sys.exit(0)
@@ -42,5 +106,3 @@ def main():
 
 if __name__ == '__main__':
     main()
-
-
@@ -75,7 +75,10 @@ def get_db_stats(conn) -> dict:
         cursor.execute('SELECT COUNT(*) FROM event_logs')
         stats['event_logs_total'] = cursor.fetchone()[0]
         
-        cursor.execute('SELECT COUNT(*) FROM event_logs WHERE synced_to_sheets = 0')
+        cursor.execute('''
+            SELECT COUNT(*) FROM event_logs
+            WHERE id > (SELECT COALESCE(MAX(last_id), 0) FROM sync_cursors WHERE table_name = 'event_logs')
+        ''')
         stats['event_logs_unsynced'] = cursor.fetchone()[0]
     except:
         stats['event_logs_total'] = 0
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+락카키 대여기 API 조회 지연시간 벤치마크 (연결 풀 vs 요청마다 새 연결)
+
+로컬 대역 서버(/api/member/by-nfc/<uid>)를 띄우고 태그 → 회원 조회 시간 비교
+- requests.get: 기존 방식 (태그마다 TCP 연결 생성)
+- LockerAPIClient: keep-alive 세션 (캐시는 끄고 HTTP 비용만 측정)
+- --delay: 대역 서버의 연결 수립 지연 (초, 무선 LAN 왕복 시간 흉내)
+
+사용법:
+    python3 scripts/testing/benchmark_locker_api.py
+    python3 scripts/testing/benchmark_locker_api.py --count 500 --delay 0.005
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+# 프로젝트 루트를 PYTHONPATH에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from app.services.locker_api_client import LockerAPIClient
+
+
+class StandInServer(ThreadingHTTPServer):
+    """락카키 대여기 API 대역 (keep-alive 지원, 새 연결마다 accept_delay 지연)"""
+    
+    daemon_threads = True
+    
+    def __init__(self, accept_delay: float):
+        self.accept_delay = accept_delay
+        self.connections = 0
+        super().__init__(('127.0.0.1', 0), MemberHandler)
+    
+    def get_request(self):
+        request = super().get_request()
+        self.connections += 1
+        if self.accept_delay:
+            time.sleep(self.accept_delay)
+        return request
+
+
+class MemberHandler(BaseHTTPRequestHandler):
+    """GET /api/member/by-nfc/<uid> → 고정 회원 응답"""
+    
+    protocol_version = 'HTTP/1.1'
+    wbufsize = -1  # 헤더+본문을 한 번에 전송 (keep-alive에서 Nagle/지연 ACK 대기 방지)
+    
+    def log_message(self, format, *args):
+        pass
+    
+    def do_GET(self):
+        uid = self.path.rsplit('/', 1)[-1]
+        body = json.dumps({
+            'status': 'ok',
+            'member_id': '20240861',
+            'name': '테스트',
+            'locker_number': 'M01',
+            'assigned_at': '2025-12-09 10:33:52',
+            'nfc_uid': uid
+        }).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def measure(name: str, count: int, lookup):
+    """lookup(uid)를 count번 호출하고 지연시간(ms) 통계 출력"""
+    latencies = []
+    for i in range(count):
+        start = time.perf_counter()
+        member = lookup(f'5A41B9145241{i % 100:02d}')
+        latencies.append((time.perf_counter() - start) * 1000)
+        assert member and member['member_id'] == '20240861', member
+    
+    latencies.sort()
+    print(f"  {name:<26} 평균 {statistics.mean(latencies):6.2f}ms  "
+          f"p50 {latencies[len(latencies) // 2]:6.2f}ms  "
+          f"p95 {latencies[int(len(latencies) * 0.95)]:6.2f}ms")
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description='LockerAPIClient 연결 풀 효과 측정')
+    parser.add_argument('--count', type=int, default=300, help='방식별 조회 횟수')
+    parser.add_argument('--delay', type=float, default=0.002, help='새 연결 수립 지연 (초)')
+    args = parser.parse_args()
+    
+    server = StandInServer(args.delay)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f'http://127.0.0.1:{server.server_port}'
+    
+    print(f"[Benchmark] 조회 {args.count}회, 연결 수립 지연 {args.delay * 1000:.1f}ms ({base_url})")
+    
+    # 1. 기존 방식: 태그마다 requests.get
+    def plain_get(uid):
+        response = requests.get(f'{base_url}/api/member/by-nfc/{uid}', timeout=2.0)
+        return response.json()
+    
+    before = server.connections
+    measure('requests.get (매번 새 연결)', args.count, plain_get)
+    plain_connections = server.connections - before
+    
+    # 2. LockerAPIClient 세션 (캐시 끔)
+    client = LockerAPIClient(base_url=base_url, member_ttl=0, negative_ttl=0)
+    before = server.connections
+    measure('LockerAPIClient (연결 풀)', args.count, client.get_member_by_nfc)
+    pooled_connections = server.connections - before
+    client.close()
+    
+    print(f"  TCP 연결 수: 새 연결 {plain_connections}개, 연결 풀 {pooled_connections}개")
+    
+    server.shutdown()
+    server.server_close()
+
+
+if __name__ == '__main__':
+    main()
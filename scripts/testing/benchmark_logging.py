@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+로그 출력 비용 벤치마크
+
+MQTT 수신 로그 한 줄 기준으로 호출 스레드의 메시지당 CPU/경과 시간 비교
+- print: 기존 방식 (stdout 동기 출력)
+- logger.info: logging_service 큐 핸들러 (출력은 별도 스레드)
+- logger.debug: INFO 레벨에서 걸러지는 메시지별 로그
+- logger.info 폭주: 같은 호출 위치 반복 → 속도 제한으로 버려짐
+
+사용법:
+    python3 scripts/testing/benchmark_logging.py > /tmp/bench.log
+    python3 scripts/testing/benchmark_logging.py --count 50000 | cat > /dev/null
+
+결과는 stderr로 출력 (stdout은 측정 대상 로그)
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+# 프로젝트 루트를 PYTHONPATH에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from app.services.logging_service import setup_logging, shutdown_logging
+
+logger = logging.getLogger('benchmark')
+
+PAYLOAD = {'event_type': 'heartbeat', 'stock': 12, 'wifi_rssi': -58, 'door_state': 'closed'}
+
+
+def measure(name: str, count: int, emit):
+    """emit(i)를 count번 호출하고 메시지당 CPU/경과 시간(µs) 반환"""
+    cpu_start = time.thread_time()
+    wall_start = time.perf_counter()
+    for i in range(count):
+        emit(i)
+    cpu = (time.thread_time() - cpu_start) / count * 1e6
+    wall = (time.perf_counter() - wall_start) / count * 1e6
+    print(f"  {name:<28} CPU {cpu:7.2f}µs  경과 {wall:7.2f}µs", file=sys.stderr)
+    return cpu, wall
+
+
+def main():
+    parser = argparse.ArgumentParser(description='print vs logging_service 메시지당 비용')
+    parser.add_argument('--count', type=int, default=20000, help='방식별 메시지 수')
+    args = parser.parse_args()
+    
+    count = args.count
+    uuid = 'FBOX-UPPER-105'
+    
+    print(f"[Benchmark] 메시지 {count:,}건 (stdout: {'tty' if sys.stdout.isatty() else 'file/pipe'})",
+          file=sys.stderr)
+    
+    # 1. 기존 print
+    measure('print (f-string, dict)', count,
+            lambda i: print(f"[MQTT] ← {uuid}: heartbeat {PAYLOAD}", flush=True))
+    
+    # 2. logging_service
+    setup_logging(level='INFO', burst=0)
+    measure('logger.info (큐)', count,
+            lambda i: logger.info("[MQTT] ← %s: heartbeat %s", uuid, PAYLOAD))
+    measure('logger.debug (INFO에서 걸러짐)', count,
+            lambda i: logger.debug("[MQTT] ← %s: heartbeat %s", uuid, PAYLOAD))
+    shutdown_logging()
+    
+    setup_logging(level='INFO', burst=20, window=10)
+    measure('logger.info (속도 제한)', count,
+            lambda i: logger.info("[MQTT] ← %s: heartbeat %s", uuid, PAYLOAD))
+    shutdown_logging()
+
+
+if __name__ == '__main__':
+    main()
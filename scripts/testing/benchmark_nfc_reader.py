@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+NFC 리더 수신 스레드 CPU 사용량 / 지연시간 측정
+
+ESP32 대신 가상 시리얼(pty)을 만들어 NFCReaderService에 연결
+- 유휴: 태그 없이 --idle초 동안 프로세스 CPU 사용률
+- 태그: {"nfc_uid": ...} 한 줄 전송 → 콜백 호출까지 지연시간
+
+사용법 (Linux/라즈베리파이):
+    python3 scripts/testing/benchmark_nfc_reader.py
+    python3 scripts/testing/benchmark_nfc_reader.py --idle 10 --count 200
+"""
+
+import argparse
+import os
+import pty
+import statistics
+import sys
+import time
+import tty
+
+# 프로젝트 루트를 PYTHONPATH에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from app.services.nfc_reader import NFCReaderService
+
+
+def main():
+    parser = argparse.ArgumentParser(description='NFC 리더 유휴 CPU / 태그 지연 측정')
+    parser.add_argument('--idle', type=float, default=5.0, help='유휴 측정 시간 (초)')
+    parser.add_argument('--count', type=int, default=100, help='태그 전송 횟수')
+    args = parser.parse_args()
+    
+    master, slave = pty.openpty()
+    tty.setraw(slave)
+    
+    received = []
+    reader = NFCReaderService(port=os.ttyname(slave))
+    reader.set_callback(lambda nfc_uid: received.append(time.perf_counter()))
+    reader.start()
+    if not reader.serial_conn or not reader.serial_conn.is_open:
+        print("[Benchmark] 가상 시리얼 연결 실패")
+        reader.stop()
+        return 1
+    
+    time.sleep(0.5)
+    
+    # 1. 유휴 CPU
+    cpu_start, wall_start = time.process_time(), time.monotonic()
+    time.sleep(args.idle)
+    cpu = time.process_time() - cpu_start
+    wall = time.monotonic() - wall_start
+    print(f"[Benchmark] 유휴 {wall:.1f}초: CPU {cpu:.3f}초 ({cpu / wall * 100:.1f}%)")
+    
+    # 2. 태그 → 콜백 지연
+    latencies = []
+    for i in range(args.count):
+        sent = time.perf_counter()
+        os.write(master, b'{"nfc_uid":"5A41B91452%04X"}\n' % i)
+        deadline = sent + 1.0
+        while len(received) <= i and time.perf_counter() < deadline:
+            time.sleep(0.0005)
+        if len(received) <= i:
+            print(f"[Benchmark] 태그 {i} 수신 안 됨")
+            break
+        latencies.append((received[i] - sent) * 1000)
+    
+    if latencies:
+        latencies.sort()
+        print(f"[Benchmark] 태그 {len(latencies)}회: 평균 {statistics.mean(latencies):.2f}ms  "
+              f"p95 {latencies[int(len(latencies) * 0.95)]:.2f}ms  최대 {latencies[-1]:.2f}ms")
+    
+    reader.stop()
+    os.close(master)
+    os.close(slave)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
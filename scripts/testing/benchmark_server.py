@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+서버 모드별 부하 벤치마크 (개발 서버 vs production)
+
+run.py를 모드별로 띄우고 같은 부하를 걸어 처리량/지연시간 비교
+- 부하: 동시 클라이언트 N개가 키오스크 조회 API를 반복 호출 (keep-alive)
+- 롱폴링 점유: /api/nfc/poll 대기 요청 K개를 걸어둔 채로 측정 (키오스크 여러 대 상황)
+- 종료: SIGTERM 후 프로세스 종료까지 걸린 시간과 종료 훅 실행 여부
+
+사용법:
+    python3 scripts/testing/benchmark_server.py
+    python3 scripts/testing/benchmark_server.py --clients 32 --duration 10 --pollers 8
+    python3 scripts/testing/benchmark_server.py --modes production --threads 64
+"""
+
+import argparse
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+import requests
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+
+ENDPOINTS = ['/api/products', '/api/inventory', '/api/locker/list']
+
+
+def start_server(mode: str, port: int, threads: int, log_path: str) -> subprocess.Popen:
+    """run.py 실행 (하드웨어/외부 연동은 없는 주소로 빠르게 실패)"""
+    env = dict(
+        os.environ,
+        SERVER_MODE=mode,
+        SERVER_THREADS=str(threads),
+        FLASK_HOST='127.0.0.1',
+        FLASK_PORT=str(port),
+        FLASK_DEBUG='false',
+        MQTT_BROKER_HOST=os.getenv('MQTT_BROKER_HOST', '127.0.0.1'),
+        LOCKER_API_URL=os.getenv('LOCKER_API_URL', 'http://127.0.0.1:9'),
+        NFC_PORT=os.getenv('NFC_PORT', '/dev/null-nfc'),
+    )
+    log = open(log_path, 'w')
+    return subprocess.Popen([sys.executable, 'run.py'], cwd=PROJECT_ROOT, env=env,
+                            stdout=log, stderr=subprocess.STDOUT)
+
+
+def wait_ready(base_url: str, timeout: float = 60.0) -> float:
+    """첫 응답까지 대기 (초 반환)"""
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        try:
+            requests.get(base_url + ENDPOINTS[0], timeout=1)
+            return time.perf_counter() - start
+        except requests.RequestException:
+            time.sleep(0.1)
+    raise RuntimeError(f'서버 응답 없음: {base_url}')
+
+
+def hold_long_polls(base_url: str, count: int, stop: threading.Event):
+    """NFC 롱폴링 대기 요청 count개 유지 (요청 스레드 점유)"""
+    def poller():
+        session = requests.Session()
+        while not stop.is_set():
+            try:
+                session.get(base_url + '/api/nfc/poll', params={'after': 0, 'wait': 5}, timeout=10)
+            except requests.RequestException:
+                time.sleep(0.1)
+    
+    threads = [threading.Thread(target=poller, daemon=True) for _ in range(count)]
+    for t in threads:
+        t.start()
+    return threads
+
+
+def run_load(base_url: str, clients: int, duration: float):
+    """동시 클라이언트로 duration초 동안 부하 (지연시간 목록, 오류 수 반환)"""
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+    
+    def client(index):
+        session = requests.Session()
+        local, failed = [], 0
+        i = index
+        while time.perf_counter() < deadline:
+            url = base_url + ENDPOINTS[i % len(ENDPOINTS)]
+            i += 1
+            start = time.perf_counter()
+            try:
+                response = session.get(url, timeout=10)
+                if response.status_code != 200:
+                    failed += 1
+                    continue
+            except requests.RequestException:
+                failed += 1
+                continue
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+            errors[0] += failed
+    
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return latencies, errors[0]
+
+
+def percentile(values, p):
+    """p 백분위수"""
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def stop_server(proc: subprocess.Popen, log_path: str):
+    """SIGTERM 후 종료 시간과 종료 훅 실행 여부"""
+    start = time.perf_counter()
+    proc.send_signal(signal.SIGTERM)
+    try:
+        proc.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+    elapsed = time.perf_counter() - start
+    
+    with open(log_path) as f:
+        log = f.read()
+    return elapsed, '[App] 종료: LocalCache' in log
+
+
+def bench_mode(mode: str, args, port: int):
+    """모드 하나 측정"""
+    base_url = f'http://127.0.0.1:{port}'
+    log_path = f'/tmp/benchmark_server_{mode}.log'
+    proc = start_server(mode, port, args.threads, log_path)
+    
+    try:
+        startup = wait_ready(base_url)
+        
+        # 예열 (카탈로그 캐시 생성)
+        run_load(base_url, 2, 1.0)
+        
+        stop_polls = threading.Event()
+        hold_long_polls(base_url, args.pollers, stop_polls)
+        time.sleep(0.5)
+        
+        latencies, errors = run_load(base_url, args.clients, args.duration)
+        stop_polls.set()
+    finally:
+        shutdown, hooks_ran = stop_server(proc, log_path)
+    
+    count = len(latencies)
+    print(f"\n[{mode}] (로그: {log_path})")
+    print(f"  시작 {startup:.1f}s, 요청 {count:,}건, 오류 {errors}건")
+    print(f"  처리량   {count / args.duration:8.1f} req/s")
+    if latencies:
+        print(f"  지연시간 평균 {statistics.mean(latencies) * 1000:6.1f}ms  "
+              f"p50 {percentile(latencies, 0.50) * 1000:6.1f}ms  "
+              f"p95 {percentile(latencies, 0.95) * 1000:6.1f}ms  "
+              f"p99 {percentile(latencies, 0.99) * 1000:6.1f}ms")
+    print(f"  SIGTERM 종료 {shutdown:.1f}s, 종료 훅 {'실행됨' if hooks_ran else '실행 안 됨'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='run.py 서버 모드별 부하 비교')
+    parser.add_argument('--modes', default='dev,production', help='측정할 모드 (쉼표 구분)')
+    parser.add_argument('--clients', type=int, default=16, help='동시 클라이언트 수')
+    parser.add_argument('--duration', type=float, default=10.0, help='모드별 측정 시간 (초)')
+    parser.add_argument('--pollers', type=int, default=4, help='걸어둘 NFC 롱폴링 요청 수')
+    parser.add_argument('--threads', type=int, default=32, help='production 스레드 수')
+    parser.add_argument('--port', type=int, default=5600, help='시작 포트 (모드마다 +1)')
+    args = parser.parse_args()
+    
+    print(f"[Benchmark] 클라이언트 {args.clients}개 × {args.duration:.0f}초, "
+          f"롱폴링 {args.pollers}개, 엔드포인트 {', '.join(ENDPOINTS)}")
+    
+    for i, mode in enumerate(args.modes.split(',')):
+        bench_mode(mode.strip(), args, args.port + i)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Google Sheets 동기화 벤치마크
+
+FakeSheetsBackend(메모리 시트)로 SheetsSync 처리량 측정
+- 네트워크/credentials 불필요
+- 지연, 분당 쿼터, 429 확률을 옵션으로 주입
+- 같은 --seed면 같은 조건으로 반복 측정 가능
+
+사용법:
+    python3 scripts/testing/benchmark_sheets_sync.py
+    python3 scripts/testing/benchmark_sheets_sync.py --members 50000 --log-rows 1000000
+    python3 scripts/testing/benchmark_sheets_sync.py --latency 0.3 --quota 60 --error-rate 0.02
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+# 프로젝트 루트를 PYTHONPATH에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from app.services.local_cache import LocalCache
+from app.services.sheets_backend import FakeSheetsBackend
+from app.services.sheets_sync import SheetsSync
+
+SCHEMA_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../database/local_schema.sql'))
+SPREADSHEET_NAME = 'F-BOX-DB-TEST'
+
+
+def create_database(db_path: str, log_rows: int):
+    """스키마 적용 + 미동기화 대여 로그 생성"""
+    conn = sqlite3.connect(db_path)
+    with open(SCHEMA_PATH, 'r', encoding='utf-8') as f:
+        conn.executescript(f.read())
+    
+    chunk = 50000
+    created_at = '2025-01-01T00:00:00+09:00'
+    for start in range(0, log_rows, chunk):
+        size = min(chunk, log_rows - start)
+        conn.executemany('''
+            INSERT INTO rental_logs
+            (member_id, locker_number, product_id, product_name, device_uuid,
+             quantity, payment_type, subscription_id, amount, created_at, synced_to_sheets)
+            VALUES (?, ?, ?, ?, ?, 1, 'voucher', NULL, 1000, ?, 0)
+        ''', [
+            (f'M{(start + i) % 50000:05d}', (start + i) % 200, 'P-TOP-105', '운동복 상의 105',
+             'FBOX-BENCH', created_at)
+            for i in range(size)
+        ])
+    conn.commit()
+    conn.close()
+
+
+def seed_spreadsheet(backend: FakeSheetsBackend, members: int):
+    """참조 시트 적재 (헤더 + 회원 N명)"""
+    spreadsheet = backend.spreadsheet(SPREADSHEET_NAME)
+    
+    member_rows = [['member_id', 'name', 'phone', 'payment_password', 'status']]
+    member_rows += [
+        [f'M{i:05d}', f'회원{i}', f'010{i:08d}', '123456', 'active']
+        for i in range(members)
+    ]
+    spreadsheet.seed_worksheet('members', member_rows)
+    spreadsheet.seed_worksheet('products', [[
+        'product_id', 'gym_id', 'category', 'size', 'name', 'price',
+        'device_uuid', 'stock', 'enabled', 'display_order'
+    ], ['P-TOP-105', 'GYM001', 'top', '105', '운동복 상의 105', 1000, 'FBOX-BENCH', 30, 'TRUE', 1]])
+    spreadsheet.seed_worksheet('voucher_products', [[
+        'product_id', 'name', 'price', 'charge_amount', 'validity_days',
+        'bonus_product_id', 'is_bonus', 'enabled'
+    ]])
+    spreadsheet.seed_worksheet('subscription_products', [[
+        'product_id', 'name', 'price', 'validity_days', 'daily_limits', 'enabled'
+    ]])
+    spreadsheet.seed_worksheet('member_vouchers', [[
+        'voucher_id', 'member_id', 'voucher_product_id', 'original_amount', 'remaining_amount',
+        'parent_voucher_id', 'valid_from', 'valid_until', 'status'
+    ]])
+    spreadsheet.seed_worksheet('member_subscriptions', [[
+        'subscription_id', 'member_id', 'subscription_product_id',
+        'valid_from', 'valid_until', 'daily_limits', 'status'
+    ]])
+    return spreadsheet
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SheetsSync 처리량 벤치마크 (가짜 백엔드)')
+    parser.add_argument('--members', type=int, default=50000, help='members 시트 행 수')
+    parser.add_argument('--log-rows', type=int, default=1000000, help='미동기화 rental_logs 행 수')
+    parser.add_argument('--page-size', type=int, default=500, help='업로드 페이지 크기')
+    parser.add_argument('--latency', type=float, default=0.0, help='API 호출당 지연 (초)')
+    parser.add_argument('--jitter', type=float, default=0.0, help='지연 편차 (초)')
+    parser.add_argument('--quota', type=int, default=0, help='분당 최대 호출 수 (0=무제한)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='무작위 429 확률')
+    parser.add_argument('--min-interval', type=float, default=0.0, help='SheetsSync 호출 간격 (초)')
+    parser.add_argument('--seed', type=int, default=42, help='난수 시드')
+    args = parser.parse_args()
+    
+    print("=" * 60)
+    print("SheetsSync 벤치마크 (FakeSheetsBackend)")
+    print("=" * 60)
+    print(f"  회원: {args.members:,}명, 로그: {args.log_rows:,}건, 페이지: {args.page_size}")
+    print(f"  지연: {args.latency}s ±{args.jitter}s, 쿼터: {args.quota or '무제한'}/분, "
+          f"429: {args.error_rate:.1%}, 호출 간격: {args.min_interval}s")
+    print()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'bench.db')
+        
+        started = time.time()
+        create_database(db_path, args.log_rows)
+        print(f"[준비] DB 생성: {time.time() - started:.1f}초")
+        
+        backend = FakeSheetsBackend(
+            latency=args.latency, jitter=args.jitter,
+            quota_per_minute=args.quota, error_rate=args.error_rate, seed=args.seed
+        )
+        spreadsheet = seed_spreadsheet(backend, args.members)
+        
+        local_cache = LocalCache(db_path)
+        sync = SheetsSync(credentials_path='fake://', backend=backend)
+        sync.min_interval = args.min_interval
+        sync.connect()
+        
+        # 1. 다운로드
+        calls_before = backend.stats['calls']
+        started = time.time()
+        result = sync.sync_all_downloads(local_cache)
+        elapsed = time.time() - started
+        print()
+        print(f"[다운로드] {elapsed:.2f}초, 회원 {result['members']:,}명 "
+              f"({result['members'] / elapsed if elapsed else 0:,.0f}행/초), "
+              f"API {backend.stats['calls'] - calls_before}회")
+        
+        # 2. 업로드 (backlog 전부 소진할 때까지)
+        calls_before = backend.stats['calls']
+        errors_before = backend.stats['errors']
+        uploaded = 0
+        failures = 0
+        started = time.time()
+        while uploaded < args.log_rows and failures < 20:
+            count = sync.upload_rentals(local_cache, page_size=args.page_size)
+            if count:
+                uploaded += count
+                failures = 0
+            else:
+                failures += 1
+        elapsed = time.time() - started
+        
+        history = spreadsheet.peek_worksheet('rental_history')
+        sheet_rows = len(history) if history else 0
+        print()
+        print(f"[업로드] {elapsed:.2f}초, {uploaded:,}건 "
+              f"({uploaded / elapsed if elapsed else 0:,.0f}행/초)")
+        print(f"  - API 호출: {backend.stats['calls'] - calls_before}회, "
+              f"429: {backend.stats['errors'] - errors_before}회")
+        print(f"  - 시트 행 수: {sheet_rows:,} (헤더 포함), 커서: {local_cache.get_sync_cursor('rental_logs'):,}")
+        print(f"  - 메서드별 호출: {backend.stats['by_method']}")
+        
+        local_cache.close()
+    
+    print()
+    print("=" * 60)
+
+
+if __name__ == '__main__':
+    main()
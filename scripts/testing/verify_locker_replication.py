@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+락카 배정 복제 경계 조건 확인
+
+임시 DB 두 개(락카키 대여기 원본 / 운동복 대여기 복제본)로
+LocalCache.get_locker_changes / apply_locker_changes를 직접 호출
+- 이력 정리(prune) 경계: since = min_seq - 1 은 증분, 그보다 작으면 reset
+- 원본 DB 재생성: since > max_seq 이면 reset
+- 페이지(has_more), 재배정/해제 반영, reset 시 남은 UID 제거
+- 반영 중 오류: DB 롤백 + 메모리 복제본/커서 원상태
+
+사용법:
+    python3 scripts/testing/verify_locker_replication.py
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+
+# 프로젝트 루트를 PYTHONPATH에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from app.services.local_cache import LocalCache
+
+SCHEMA_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../database/local_schema.sql'))
+
+failures = []
+
+
+def check(name: str, condition: bool, detail=''):
+    """결과 출력 (실패는 모아서 종료 코드로)"""
+    print(f"  [{'OK' if condition else 'FAIL'}] {name}" + (f" - {detail}" if detail and not condition else ''))
+    if not condition:
+        failures.append(name)
+
+
+def create_cache(db_path: str, members: int = 0) -> LocalCache:
+    """스키마 적용 + 테스트 회원 생성 후 LocalCache 열기"""
+    conn = sqlite3.connect(db_path)
+    with open(SCHEMA_PATH, 'r', encoding='utf-8') as f:
+        conn.executescript(f.read())
+    conn.executemany('INSERT INTO members (member_id, name) VALUES (?, ?)',
+                     [(f'M{i:03d}', f'회원{i}') for i in range(members)])
+    conn.commit()
+    conn.close()
+    return LocalCache(db_path)
+
+
+def sync(source: LocalCache, replica: LocalCache, page: int = 500) -> int:
+    """LockerReplicator와 같은 순서로 끝까지 당겨옴 (반영한 페이지 수)"""
+    pages = 0
+    while True:
+        result = source.get_locker_changes(replica.get_replication_seq(), page)
+        replica.apply_locker_changes(result['changes'], result['last_seq'], reset=result['reset'])
+        pages += 1
+        if not result['has_more']:
+            return pages
+
+
+def replica_state(replica: LocalCache) -> dict:
+    """{nfc_uid: (member_id, locker_number)} (메모리)"""
+    return {uid: (entry['member_id'], entry['locker_number'])
+            for uid, entry in replica._nfc_member_cache.items()}
+
+
+def replica_db_state(replica: LocalCache) -> dict:
+    """{nfc_uid: (member_id, locker_number)} (DB)"""
+    rows = replica.conn.execute('SELECT nfc_uid, member_id, locker_number FROM nfc_member_map').fetchall()
+    return {row['nfc_uid']: (row['member_id'], row['locker_number']) for row in rows}
+
+
+def source_state(source: LocalCache) -> dict:
+    """원본의 현재 배정 (UID 있는 것만)"""
+    rows = source.conn.execute('SELECT nfc_uid, member_id, locker_number FROM locker_mapping '
+                               'WHERE nfc_uid IS NOT NULL').fetchall()
+    return {row['nfc_uid']: (row['member_id'], row['locker_number']) for row in rows}
+
+
+def verify_empty_log(tmp: str):
+    print("\n[1] 빈 이력")
+    source = create_cache(os.path.join(tmp, 'empty.db'))
+    
+    result = source.get_locker_changes(0)
+    check("since=0 → 변경 없음, reset 아님", result == {'changes': [], 'last_seq': 0, 'has_more': False, 'reset': False},
+          result)
+    
+    result = source.get_locker_changes(5)
+    check("since > max_seq(0) → reset (원본 DB 재생성)", result['reset'] and result['last_seq'] == 0, result)
+
+
+def verify_prune_boundary(tmp: str):
+    print("\n[2] 이력 정리 경계 (LOCKER_CHANGES_KEEP=10)")
+    source = create_cache(os.path.join(tmp, 'prune.db'), members=20)
+    source.LOCKER_CHANGES_KEEP = 10
+    for i in range(15):
+        source.assign_locker(i + 1, f'M{i:03d}', f'UID{i:03d}')
+    
+    min_seq, max_seq = source.conn.execute('SELECT MIN(seq), MAX(seq) FROM locker_changes').fetchone()
+    check("이력 10개만 남음", (min_seq, max_seq) == (6, 15), (min_seq, max_seq))
+    
+    result = source.get_locker_changes(min_seq - 1)
+    check("since = min_seq - 1 → 증분 (reset 아님)",
+          not result['reset'] and [c['seq'] for c in result['changes']] == list(range(min_seq, max_seq + 1)),
+          result['reset'])
+    
+    result = source.get_locker_changes(min_seq - 2)
+    check("since = min_seq - 2 → reset", result['reset'])
+    check("reset은 현재 배정 전체 + last_seq = max_seq",
+          len(result['changes']) == 15 and result['last_seq'] == max_seq and not result['has_more'],
+          (len(result['changes']), result['last_seq']))
+    
+    result = source.get_locker_changes(max_seq)
+    check("since = max_seq → 변경 없음", not result['reset'] and result['changes'] == [] and
+          result['last_seq'] == max_seq, result)
+    
+    result = source.get_locker_changes(max_seq + 1)
+    check("since = max_seq + 1 → reset (원본 DB 재생성)", result['reset'] and result['last_seq'] == max_seq)
+    
+    result = source.get_locker_changes(min_seq - 1, limit=4)
+    check("limit=4 → 4개 + has_more", len(result['changes']) == 4 and result['has_more'] and
+          result['last_seq'] == min_seq + 3, result['last_seq'])
+
+
+def verify_apply(tmp: str):
+    print("\n[3] 복제 반영")
+    source = create_cache(os.path.join(tmp, 'source.db'), members=20)
+    replica = create_cache(os.path.join(tmp, 'replica.db'))
+    
+    for i in range(8):
+        source.assign_locker(i + 1, f'M{i:03d}', f'UID{i:03d}')
+    pages = sync(source, replica, page=3)
+    check("페이지 나눠 전체 반영 (8건 / 3개씩 = 3페이지)", pages == 3, pages)
+    check("복제본 = 원본", replica_state(replica) == source_state(source))
+    
+    source.assign_locker(1, 'M010', 'UID010')  # 같은 락카에 새 UID
+    source.release_locker(2)
+    source.assign_locker(9, 'M011')            # UID 없는 배정
+    touched = set()
+    result = source.get_locker_changes(replica.get_replication_seq())
+    touched |= replica.apply_locker_changes(result['changes'], result['last_seq'], reset=result['reset'])
+    check("재배정/해제 반영", replica_state(replica) == source_state(source),
+          (replica_state(replica), source_state(source)))
+    check("무효화 UID = 이전 UID + 새 UID + 해제 UID", touched == {'UID000', 'UID010', 'UID001'}, touched)
+    check("메모리 = DB", replica_state(replica) == replica_db_state(replica))
+    check("커서 = 원본 max_seq", replica.get_replication_seq() == result['last_seq'])
+    member = replica.get_replicated_member('UID010')
+    check("조회 결과 locker_number는 HTTP 응답처럼 문자열", member and member['locker_number'] == '1', member)
+    
+    # 복제본만 가진 UID는 reset에서 제거
+    replica.apply_locker_changes([{'seq': 999, 'action': 'assign', 'locker_number': 99,
+                                   'member_id': 'GHOST', 'nfc_uid': 'UID-GHOST'}], replica.get_replication_seq())
+    source.LOCKER_CHANGES_KEEP = 2
+    source.assign_locker(10, 'M012', 'UID012')
+    source.assign_locker(11, 'M013', 'UID013')
+    source.assign_locker(12, 'M014', 'UID014')  # 복제본 커서 다음 seq까지 정리됨
+    result = source.get_locker_changes(replica.get_replication_seq())
+    check("정리된 구간 요청 → reset", result['reset'])
+    touched = replica.apply_locker_changes(result['changes'], result['last_seq'], reset=True)
+    check("reset 후 복제본 = 원본 (남은 UID 제거)", replica_state(replica) == source_state(source))
+    check("reset 무효화에 남은 UID 포함", 'UID-GHOST' in touched)
+
+
+def verify_rollback(tmp: str):
+    print("\n[4] 반영 중 오류 → 롤백")
+    source = create_cache(os.path.join(tmp, 'rb_source.db'), members=5)
+    replica = create_cache(os.path.join(tmp, 'rb_replica.db'))
+    for i in range(3):
+        source.assign_locker(i + 1, f'M{i:03d}', f'UID{i:03d}')
+    sync(source, replica)
+    
+    before_memory = replica_state(replica)
+    before_seq = replica.get_replication_seq()
+    
+    # 첫 변경은 정상(락카 1 UID 교체), 두 번째는 바인딩 불가 값 → 중간 실패
+    changes = [
+        {'seq': before_seq + 1, 'action': 'assign', 'locker_number': 1, 'member_id': 'M003', 'nfc_uid': 'UID-NEW'},
+        {'seq': object(), 'action': 'assign', 'locker_number': 2, 'member_id': 'M004', 'nfc_uid': 'UID-BAD'},
+    ]
+    try:
+        replica.apply_locker_changes(changes, before_seq + 2)
+        raised = False
+    except Exception:
+        raised = True
+    check("오류는 호출자에게 전달", raised)
+    check("메모리 복제본 원상태", replica_state(replica) == before_memory, replica_state(replica))
+    check("DB 복제본 원상태", replica_db_state(replica) == before_memory)
+    check("커서 그대로", replica.get_replication_seq() == before_seq)
+    
+    sync(source, replica)
+    check("다음 주기 정상 반영", replica_state(replica) == source_state(source))
+    
+    before_memory = replica_state(replica)
+    try:
+        replica.apply_locker_changes(changes, before_seq + 2, reset=True)
+    except Exception:
+        pass
+    check("reset 중 오류 → 비웠던 메모리 복제본 복구", replica_state(replica) == before_memory)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        verify_empty_log(tmp)
+        verify_prune_boundary(tmp)
+        verify_apply(tmp)
+        verify_rollback(tmp)
+    
+    print()
+    if failures:
+        print(f"[Verify] 실패 {len(failures)}건: {', '.join(failures)}")
+        return 1
+    print("[Verify] 모두 통과")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())